@@ -0,0 +1,63 @@
+"""Hydration throughput benchmark: per-row generic hydration vs generated hydrators.
+
+Run with ``python benchmarks/bench_hydration.py [--rows N] [--cols N]``.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from dataclasses import is_dataclass, make_dataclass
+
+from sqlstratum import Table, col
+from sqlstratum.hydrate import get_hydrator, projection_keys
+
+
+def legacy_hydrate(rows, projections, target):
+    # The pre-codegen hydration path, kept here as the baseline.
+    keys = projection_keys(projections)
+    mapped = [{k: row[k] for k in keys} for row in rows]
+    if target is None or target is dict:
+        return mapped
+    if is_dataclass(target):
+        return [target(**m) for m in mapped]
+    return [target(m) for m in mapped]
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s")
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--cols", type=int, default=20)
+    args = parser.parse_args()
+
+    names = [f"c{i}" for i in range(args.cols)]
+    table = Table("bench", *(col(name, int) for name in names))
+    projections = tuple(table.columns)
+    Record = make_dataclass("Record", names)
+
+    tuples = [tuple(range(i, i + args.cols)) for i in range(args.rows)]
+    mappings = [dict(zip(names, row)) for row in tuples]
+    print(f"{args.rows} rows x {args.cols} columns")
+
+    timed("legacy dict (mapping rows)", lambda: legacy_hydrate(mappings, projections, dict))
+    timed("generated dict (mapping rows)", lambda: get_hydrator(projections, dict)(mappings))
+    timed(
+        "generated dict (tuple rows)",
+        lambda: get_hydrator(projections, dict, by_index=True)(tuples),
+    )
+    timed("legacy dataclass (mapping rows)", lambda: legacy_hydrate(mappings, projections, Record))
+    timed(
+        "generated dataclass (tuple rows)",
+        lambda: get_hydrator(projections, Record, by_index=True)(tuples),
+    )
+
+
+if __name__ == "__main__":
+    main()
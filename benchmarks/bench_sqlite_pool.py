@@ -0,0 +1,75 @@
+"""Threaded SQLite read throughput: one shared connection vs ``SQLiteRunner.pool`` readers.
+
+Run with ``python benchmarks/bench_sqlite_pool.py [--rows N] [--queries N] [--threads 1,2,4,8]``.
+The single-connection baseline serializes reads behind a lock, as a threaded app must; the pool
+gives every thread its own WAL reader, so throughput scales with cores while SQLite runs without
+the GIL.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlstratum import SELECT, SUM, Table, col
+from sqlstratum.runner import SQLiteRunner
+
+items = Table("items", col("id", int), col("bucket", int), col("amount", int))
+
+
+def build(path: str, rows: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, bucket INTEGER, amount INTEGER)")
+    conn.executemany(
+        "INSERT INTO items (bucket, amount) VALUES (?, ?)",
+        ((i % 100, i % 997) for i in range(rows)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def run(label: str, read, threads: int, queries: int) -> None:
+    query = SELECT(SUM(items.c.amount)).FROM(items).WHERE(items.c.bucket == 7)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: read(query), range(queries)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} threads={threads:<3} {queries / elapsed:10.0f} queries/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=400)
+    parser.add_argument("--threads", default="1,2,4,8")
+    args = parser.parse_args()
+    thread_counts = [int(n) for n in args.threads.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "bench.db")
+        build(path, args.rows)
+        print(f"{args.rows} rows, {args.queries} aggregate queries per run")
+
+        single = SQLiteRunner(sqlite3.connect(path, check_same_thread=False))
+        lock = threading.Lock()
+
+        def read_single(query):
+            with lock:
+                return single.scalar(query)
+
+        for threads in thread_counts:
+            run("single connection + lock", read_single, threads, args.queries)
+        single.connection.close()
+
+        for threads in thread_counts:
+            pooled = SQLiteRunner.pool(path, readers=threads)
+            run("pool (WAL readers)", pooled.scalar, threads, args.queries)
+            pooled.close()
+
+
+if __name__ == "__main__":
+    main()
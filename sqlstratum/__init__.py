@@ -1,6 +1,6 @@
 """sqlstratum: minimal SQL AST + compiler + sqlite runner."""
 from .dsl import SELECT, INSERT, UPDATE, DELETE, OR, AND, NOT
-from .expr import COUNT, SUM, AVG, MIN, MAX
+from .expr import COUNT, SUM, AVG, MIN, MAX, EXISTS
 from .meta import Table, Column, col
 from .compile import compile
 from .dialects import list_dialects
@@ -8,7 +8,12 @@ from .errors import SQLStratumError, UnsupportedDialectFeatureError
 from .runner import Runner, SQLiteRunner
 from .runner_mysql import MySQLRunner
 from .runner_mysql_async import AsyncMySQLRunner
+from .runner_sqlite_async import AsyncSQLiteRunner
 from .mysql import using_mysql
+from .cache import ResultCache
+from .metrics import QueryMetrics
+from .slowlog import SlowQueryLog
+from .pagination import Page
 from .sqlite import using_sqlite, TOTAL, GROUP_CONCAT
 from .types import Expression, HydrationTarget, Hydrator, Predicate, Source
 
@@ -25,6 +30,7 @@ __all__ = [
     "AVG",
     "MIN",
     "MAX",
+    "EXISTS",
     "using_mysql",
     "using_sqlite",
     "TOTAL",
@@ -38,6 +44,11 @@ __all__ = [
     "Runner",
     "MySQLRunner",
     "AsyncMySQLRunner",
+    "AsyncSQLiteRunner",
+    "Page",
+    "ResultCache",
+    "QueryMetrics",
+    "SlowQueryLog",
     "SQLStratumError",
     "UnsupportedDialectFeatureError",
     "Expression",
@@ -0,0 +1,192 @@
+"""Optional Apache Arrow / Parquet export helpers (pyarrow optional dependency)."""
+from __future__ import annotations
+
+import datetime
+import importlib
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from .hydrate import projection_keys, projection_types
+
+_INSTALL_MESSAGE = "Install with: pip install sqlstratum[arrow]"
+# Batches ParquetBatchWriter holds back, waiting for a type, while a column has only seen NULLs.
+_MAX_HELD_BATCHES = 16
+
+
+def _import_pyarrow():
+    return importlib.import_module("pyarrow")
+
+
+def _import_parquet():
+    return importlib.import_module("pyarrow.parquet")
+
+
+def is_pyarrow_available() -> bool:
+    try:
+        _import_pyarrow()
+        return True
+    except Exception:
+        return False
+
+
+def _arrow_types(pa: Any) -> Dict[type, Any]:
+    return {
+        bool: pa.bool_(),
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bytes: pa.binary(),
+        datetime.datetime: pa.timestamp("us"),
+        datetime.date: pa.date32(),
+    }
+
+
+class ArrowBatchBuilder:
+    """Turn batches of cursor rows into Arrow record batches with a stable schema.
+
+    Columns declared with a known ``Column.py_type`` get a fixed Arrow type, and values the driver
+    returns in another representation (SQLite's 0/1 booleans and text datetimes) are cast to it.
+    Other columns are inferred from the first batch and pinned for the rest of the result, except
+    that a column with only NULLs so far is promoted to the type of the first values it gets.
+    """
+
+    def __init__(self, projections: Sequence[Any]) -> None:
+        try:
+            self._pa = _import_pyarrow()
+        except Exception as exc:
+            raise RuntimeError(_INSTALL_MESSAGE) from exc
+        known = _arrow_types(self._pa)
+        self.names = projection_keys(projections)
+        self._types: List[Optional[Any]] = [known.get(t) for t in projection_types(projections)]
+        # Columns whose values need inference plus a cast to reach their declared type.
+        self._cast = [False] * len(self._types)
+        self.schema: Optional[Any] = None
+        self.rows_written = 0
+
+    def batch(self, rows: Sequence[Any]) -> Any:
+        pa = self._pa
+        by_key = bool(rows) and isinstance(rows[0], Mapping)
+        arrays = []
+        for index, name in enumerate(self.names):
+            slot = name if by_key else index
+            arrays.append(self._array(index, [row[slot] for row in rows]))
+        if self.schema is None:
+            record_batch = pa.RecordBatch.from_arrays(arrays, names=self.names)
+            self.schema = record_batch.schema
+        else:
+            for index, array in enumerate(arrays):
+                field = self.schema.field(index)
+                if pa.types.is_null(field.type) and not pa.types.is_null(array.type):
+                    self.schema = self.schema.set(index, field.with_type(array.type))
+            record_batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        self._types = list(self.schema.types)
+        self.rows_written += len(rows)
+        return record_batch
+
+    def _array(self, index: int, values: List[Any]) -> Any:
+        pa = self._pa
+        arrow_type = self._types[index]
+        if arrow_type is None or pa.types.is_null(arrow_type):
+            return pa.array(values)
+        if not self._cast[index]:
+            try:
+                return pa.array(values, type=arrow_type)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                self._cast[index] = True
+        return pa.array(values).cast(arrow_type)
+
+    def has_null_fields(self) -> bool:
+        """Whether some column has only seen NULLs, so its final type is not known yet."""
+        return self.schema is not None and any(self._pa.types.is_null(t) for t in self.schema.types)
+
+    def conform(self, record_batch: Any) -> Any:
+        """Cast a batch built before a NULL column was promoted to the current schema."""
+        schema = self.empty_schema()
+        if record_batch.schema.equals(schema):
+            return record_batch
+        arrays = [column.cast(field.type) for column, field in zip(record_batch.columns, schema)]
+        return self._pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def empty_schema(self) -> Any:
+        if self.schema is not None:
+            return self.schema
+        pa = self._pa
+        return pa.schema(
+            [(name, arrow_type or pa.null()) for name, arrow_type in zip(self.names, self._types)]
+        )
+
+    def table(self, batches: Iterable[Any]) -> Any:
+        collected = list(batches)
+        return self._pa.Table.from_batches(
+            [self.conform(batch) for batch in collected], schema=self.empty_schema()
+        )
+
+    def parquet_writer(self, path: Any, **options: Any) -> Any:
+        try:
+            parquet = _import_parquet()
+        except Exception as exc:
+            raise RuntimeError(_INSTALL_MESSAGE) from exc
+        return parquet.ParquetWriter(path, self.empty_schema(), **options)
+
+
+class ParquetBatchWriter:
+    """Write row batches to a Parquet file one record batch at a time.
+
+    The file schema is fixed when the writer opens, so while a column has only seen NULLs the
+    first batches are held back (up to ``_MAX_HELD_BATCHES``) until it gets a type. Call
+    ``finish()`` after the last batch and ``close()`` in every case.
+    """
+
+    def __init__(self, builder: ArrowBatchBuilder, path: Any, **options: Any) -> None:
+        self.builder = builder
+        self._path = path
+        self._options = options
+        self._writer: Any = None
+        self._written_schema: Any = None
+        self._held: List[Any] = []
+
+    def write(self, rows: Sequence[Any]) -> None:
+        record_batch = self.builder.batch(rows)
+        if self._writer is None:
+            self._held.append(record_batch)
+            if self.builder.has_null_fields() and len(self._held) < _MAX_HELD_BATCHES:
+                return
+            self._open()
+            return
+        if not record_batch.schema.equals(self._written_schema):
+            raise ValueError(
+                f"Column types changed after the first {_MAX_HELD_BATCHES} batches, written "
+                f"with schema {self._written_schema}; columns that were NULL so far were written "
+                "as null columns. Select them through a typed Column or use a larger batch_size"
+            )
+        self._writer.write_batch(record_batch)
+
+    def finish(self) -> int:
+        """Flush held batches (creating the file for an empty result); return the row count."""
+        if self._writer is None:
+            self._open()
+        return self.builder.rows_written
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def _open(self) -> None:
+        self._writer = self.builder.parquet_writer(self._path, **self._options)
+        self._written_schema = self.builder.empty_schema()
+        for pending in self._held:
+            self._writer.write_batch(self.builder.conform(pending))
+        self._held = []
+
+
+def write_parquet(
+    builder: ArrowBatchBuilder, batches: Iterable[Sequence[Any]], path: Any, **options: Any
+) -> int:
+    """Write row batches to a Parquet file through ``ParquetBatchWriter``; return the row count."""
+    sink = ParquetBatchWriter(builder, path, **options)
+    try:
+        for rows in batches:
+            sink.write(rows)
+        return sink.finish()
+    finally:
+        sink.close()
@@ -0,0 +1,261 @@
+"""Opt-in query result cache with table-level invalidation."""
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, Mapping, Optional, Sequence, Set, Tuple
+
+from . import ast
+from .expr import (
+    AliasExpr,
+    BinaryPredicate,
+    Exists,
+    Function,
+    InPredicate,
+    LogicalPredicate,
+    NotPredicate,
+    UnaryPredicate,
+)
+from .meta import Table
+
+CacheKey = Tuple[str, Hashable, str, Tuple[Tuple[str, Any], ...]]
+
+_PRIVATE_IDS = itertools.count(1)
+
+
+def private_database_id(dialect: str) -> str:
+    """A database id no other runner shares, for databases that cannot be identified."""
+    return f"{dialect}:private-{next(_PRIVATE_IDS)}"
+
+
+def sqlite_database_id(path: str) -> str:
+    """Identify a SQLite database by its resolved file path; in-memory databases are private."""
+    if not path or path == ":memory:" or path.startswith("file:"):
+        return private_database_id("sqlite")
+    return "sqlite:" + os.path.realpath(path)
+
+
+def mysql_database_id(conn_args: Mapping[str, Any]) -> str:
+    return f"mysql:{conn_args.get('host')}:{conn_args.get('port')}/{conn_args.get('database')}"
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    bytes: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+@dataclass(frozen=True)
+class CachedResult:
+    rows: Sequence[Any]
+    # Result column names (cursor.description) for runners that map columns by name.
+    columns: Tuple[str, ...]
+    tables: FrozenSet[str]
+    size: int
+    expires_at: Optional[float]
+
+
+def tables_read(query: Any) -> FrozenSet[str]:
+    """Return the names of all tables a SELECT reads, including joins and subqueries."""
+    names: Set[str] = set()
+    _collect_tables(query, names)
+    return frozenset(names)
+
+
+def _collect_tables(node: Any, names: Set[str]) -> None:
+    if isinstance(node, ast.SelectQuery):
+        _collect_tables(node.from_, names)
+        for join in node.joins:
+            _collect_tables(join.source, names)
+            _collect_tables(join.on, names)
+        for part in (node.projections, node.where, node.group_by, node.having):
+            for item in part:
+                _collect_tables(item, names)
+        for spec in node.order_by:
+            _collect_tables(spec.expr, names)
+    elif isinstance(node, Table):
+        names.add(node.name)
+    elif isinstance(node, (ast.Subquery, Exists)):
+        _collect_tables(node.query, names)
+    elif isinstance(node, AliasExpr):
+        _collect_tables(node.expr, names)
+    elif isinstance(node, BinaryPredicate):
+        _collect_tables(node.left, names)
+        _collect_tables(node.right, names)
+    elif isinstance(node, UnaryPredicate):
+        _collect_tables(node.expr, names)
+    elif isinstance(node, InPredicate):
+        _collect_tables(node.expr, names)
+        for value in node.values:
+            _collect_tables(value, names)
+    elif isinstance(node, LogicalPredicate):
+        for predicate in node.predicates:
+            _collect_tables(predicate, names)
+    elif isinstance(node, NotPredicate):
+        _collect_tables(node.predicate, names)
+    elif isinstance(node, Function):
+        for arg in node.args:
+            _collect_tables(arg, names)
+
+
+def table_written(query: Any) -> Optional[str]:
+    """Return the table name an INSERT/UPDATE/DELETE writes to, or ``None``."""
+    if isinstance(query, (ast.InsertQuery, ast.UpdateQuery, ast.DeleteQuery)):
+        return query.table.name
+    return None
+
+
+def _estimate_size(rows: Sequence[Any]) -> int:
+    size = sys.getsizeof(rows)
+    for row in rows:
+        size += sys.getsizeof(row)
+        values = row.values() if isinstance(row, Mapping) else row
+        for value in values:
+            size += sys.getsizeof(value)
+    return size
+
+
+class ResultCache:
+    """LRU + TTL cache of raw result rows keyed by dialect, database, compiled SQL and params.
+
+    Rows are stored before hydration, so one entry serves every hydration target. Entries are
+    dropped when a runner executes an INSERT/UPDATE/DELETE against a table they read, and the
+    whole cache is cleared by ``exec_ddl``. Safe to share between runners and threads: each
+    runner keys entries by its ``database_id``, and a result read while one of its tables was
+    invalidated is not stored (see ``generation``).
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: Optional[float] = None,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be a positive integer")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive or None")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, CachedResult]" = OrderedDict()
+        self._by_table: Dict[str, Set[Hashable]] = {}
+        # Bumped per table by invalidate() and for every table by clear().
+        self._generations: Dict[str, int] = {}
+        self._epoch = 0
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(dialect: str, compiled: ast.Compiled, database: Hashable = None) -> Optional[CacheKey]:
+        """Build a cache key, or ``None`` when a parameter value is unhashable."""
+        key = (dialect, database, compiled.sql, tuple(sorted(compiled.params.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def generation(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        """Snapshot the invalidation state of ``tables``; take it before the read ``put`` stores."""
+        with self._lock:
+            return self._generation(tables)
+
+    def get(self, key: Hashable) -> Optional[CachedResult]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry
+
+    def put(
+        self,
+        key: Hashable,
+        rows: Sequence[Any],
+        tables: Iterable[str],
+        columns: Tuple[str, ...] = (),
+        *,
+        generation: Optional[Tuple[int, ...]] = None,
+    ) -> None:
+        """Store ``rows``; with a ``generation`` from before the read, skip them if stale."""
+        size = _estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+        entry = CachedResult(rows, columns, frozenset(tables), size, expires_at)
+        with self._lock:
+            if generation is not None and generation != self._generation(entry.tables):
+                # A write invalidated a table after the read began; the rows may predate it.
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += size
+            for table in entry.tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, tables: Iterable[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._generations[table] = self._generations.get(table, 0) + 1
+                for key in self._by_table.pop(table, ()):
+                    if key in self._entries:
+                        self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+            self._epoch += 1
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                bytes=self._bytes,
+            )
+
+    def _generation(self, tables: Iterable[str]) -> Tuple[int, ...]:
+        return (self._epoch,) + tuple(self._generations.get(table, 0) for table in sorted(tables))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
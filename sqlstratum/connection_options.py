@@ -0,0 +1,269 @@
+"""Validated connection tuning options, performance profiles and effective-settings reports."""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import quote, urlencode
+
+_TRUE = {"1", "true", "yes", "on"}
+_FALSE = {"0", "false", "no", "off"}
+
+
+def _choice(*choices: str) -> Callable[[str, Any], str]:
+    def parse(name: str, value: Any) -> str:
+        text = str(value).lower()
+        if text not in choices:
+            raise ValueError(f"Invalid {name} {value!r}; expected one of: {', '.join(choices)}")
+        return text
+
+    return parse
+
+
+def _integer(minimum: Optional[int] = None) -> Callable[[str, Any], int]:
+    def parse(name: str, value: Any) -> int:
+        if isinstance(value, bool):
+            raise ValueError(f"{name} must be an integer")
+        try:
+            number = int(value)
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"{name} must be an integer") from exc
+        if minimum is not None and number < minimum:
+            raise ValueError(f"{name} must be >= {minimum}")
+        return number
+
+    return parse
+
+
+def _boolean(name: str, value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"{name} must be a boolean (true/false)")
+
+
+@dataclass(frozen=True)
+class SQLiteOptions:
+    """SQLite tuning: PRAGMAs applied after connecting plus ``sqlite3.connect``/URI flags."""
+
+    journal_mode: Optional[str] = None
+    synchronous: Optional[str] = None
+    cache_size: Optional[int] = None
+    mmap_size: Optional[int] = None
+    temp_store: Optional[str] = None
+    busy_timeout: Optional[int] = None
+    cached_statements: Optional[int] = None
+    # URI filename parameters: https://www.sqlite.org/uri.html
+    mode: Optional[str] = None
+    immutable: Optional[bool] = None
+    cache: Optional[str] = None
+
+    @property
+    def uses_uri(self) -> bool:
+        return self.mode is not None or bool(self.immutable) or self.cache is not None
+
+
+_SQLITE_PARSERS: Dict[str, Callable[[str, Any], Any]] = {
+    "journal_mode": _choice("delete", "truncate", "persist", "memory", "wal", "off"),
+    "synchronous": _choice("off", "normal", "full", "extra"),
+    # Negative cache sizes are in KiB, positive ones in pages.
+    "cache_size": _integer(),
+    "mmap_size": _integer(0),
+    "temp_store": _choice("default", "file", "memory"),
+    "busy_timeout": _integer(0),
+    "cached_statements": _integer(0),
+    "mode": _choice("ro", "rw", "rwc", "memory"),
+    "immutable": _boolean,
+    "cache": _choice("shared", "private"),
+}
+
+# Applied in this order: busy_timeout first so a journal_mode change can wait for other
+# connections.
+_SQLITE_PRAGMAS = ("busy_timeout", "journal_mode", "synchronous", "cache_size", "mmap_size", "temp_store")
+
+SQLITE_PROFILES: Dict[str, SQLiteOptions] = {
+    # Many concurrent readers: WAL, a 64 MiB page cache and 256 MiB of memory-mapped I/O.
+    "read_heavy": SQLiteOptions(
+        journal_mode="wal",
+        synchronous="normal",
+        cache_size=-65536,
+        mmap_size=268435456,
+        temp_store="memory",
+        busy_timeout=5000,
+    ),
+    # Large loads: WAL without a sync per commit, a 256 MiB page cache and a long busy wait.
+    "bulk_write": SQLiteOptions(
+        journal_mode="wal",
+        synchronous="normal",
+        cache_size=-262144,
+        temp_store="memory",
+        busy_timeout=30000,
+    ),
+}
+
+
+def sqlite_options(values: Mapping[str, Any]) -> SQLiteOptions:
+    """Validate raw option values (URL query strings or keyword arguments).
+
+    ``profile`` selects a named base from ``SQLITE_PROFILES``; explicit options override it.
+    """
+    parsed: Dict[str, Any] = {}
+    base = SQLiteOptions()
+    for name, value in values.items():
+        if name == "profile":
+            if value not in SQLITE_PROFILES:
+                raise ValueError(
+                    f"Unknown SQLite profile {value!r}; expected one of: {', '.join(SQLITE_PROFILES)}"
+                )
+            base = SQLITE_PROFILES[value]
+            continue
+        parser = _SQLITE_PARSERS.get(name)
+        if parser is None:
+            raise ValueError(f"Unknown SQLite option {name!r}")
+        parsed[name] = parser(name, value)
+    return replace(base, **parsed)
+
+
+def _sqlite_uri(path: str, options: SQLiteOptions) -> str:
+    params = []
+    if options.mode is not None:
+        params.append(("mode", options.mode))
+    if options.immutable:
+        params.append(("immutable", "1"))
+    if options.cache is not None:
+        params.append(("cache", options.cache))
+    location = path if path == ":memory:" else quote(path, safe="/")
+    return f"file:{location}?{urlencode(params)}"
+
+
+def connect_sqlite(path: str, options: SQLiteOptions, **kwargs: Any) -> sqlite3.Connection:
+    """Open ``path`` with ``options``: URI flags and ``cached_statements`` at connect, then PRAGMAs."""
+    target = path
+    if options.cached_statements is not None:
+        kwargs["cached_statements"] = options.cached_statements
+    if options.uses_uri:
+        target = _sqlite_uri(path, options)
+        kwargs["uri"] = True
+    connection = sqlite3.connect(target, **kwargs)
+    try:
+        apply_sqlite_pragmas(connection, options)
+    except Exception:
+        connection.close()
+        raise
+    return connection
+
+
+def apply_sqlite_pragmas(connection: sqlite3.Connection, options: SQLiteOptions) -> None:
+    for name in _SQLITE_PRAGMAS:
+        value = getattr(options, name)
+        if value is not None:
+            # Values were validated against fixed choices or parsed as integers.
+            connection.execute(f"PRAGMA {name}={value}").fetchall()
+
+
+_SYNCHRONOUS_NAMES = {0: "off", 1: "normal", 2: "full", 3: "extra"}
+_TEMP_STORE_NAMES = {0: "default", 1: "file", 2: "memory"}
+
+
+def sqlite_settings(connection: sqlite3.Connection) -> Dict[str, Any]:
+    """Read back the effective values of the tunable PRAGMAs on ``connection``."""
+    settings: Dict[str, Any] = {}
+    for name in _SQLITE_PRAGMAS:
+        row = connection.execute(f"PRAGMA {name}").fetchone()
+        settings[name] = None if row is None else row[0]
+    settings["synchronous"] = _SYNCHRONOUS_NAMES.get(settings["synchronous"], settings["synchronous"])
+    settings["temp_store"] = _TEMP_STORE_NAMES.get(settings["temp_store"], settings["temp_store"])
+    return settings
+
+
+@dataclass(frozen=True)
+class MySQLOptions:
+    """MySQL URL options, mapped onto PyMySQL/asyncmy connect keyword arguments."""
+
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+    write_timeout: Optional[float] = None
+    init_command: Optional[str] = None
+    charset: Optional[str] = None
+    # buffered (driver default), ss (unbuffered), dict or ssdict.
+    cursor: Optional[str] = None
+
+
+def _positive_number(name: str, value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError(f"{name} must be a positive number of seconds")
+    try:
+        number = float(value)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"{name} must be a positive number of seconds") from exc
+    if not number > 0:
+        raise ValueError(f"{name} must be a positive number of seconds")
+    return int(number) if number.is_integer() else number
+
+
+def _text(name: str, value: Any) -> str:
+    text = str(value)
+    if not text.strip():
+        raise ValueError(f"{name} must not be empty")
+    return text
+
+
+def _charset(name: str, value: Any) -> str:
+    text = str(value)
+    if not text or not all(ch.isalnum() or ch == "_" for ch in text):
+        raise ValueError(f"Invalid {name} {value!r}")
+    return text
+
+
+_MYSQL_PARSERS: Dict[str, Callable[[str, Any], Any]] = {
+    "connect_timeout": _positive_number,
+    "read_timeout": _positive_number,
+    "write_timeout": _positive_number,
+    "init_command": _text,
+    "charset": _charset,
+    "cursor": _choice("buffered", "ss", "dict", "ssdict"),
+}
+
+_MYSQL_CURSORS = {"buffered": "Cursor", "ss": "SSCursor", "dict": "DictCursor", "ssdict": "SSDictCursor"}
+
+
+def mysql_options(values: Mapping[str, Any]) -> MySQLOptions:
+    """Validate raw MySQL URL option values."""
+    parsed: Dict[str, Any] = {}
+    for name, value in values.items():
+        if name == "compress":
+            # Accepted so shared config can spell it out, but only compress=false can be honoured.
+            if _boolean(name, value):
+                raise ValueError(
+                    "compress=true is not supported: PyMySQL and asyncmy do not implement "
+                    "protocol compression"
+                )
+            continue
+        parser = _MYSQL_PARSERS.get(name)
+        if parser is None:
+            raise ValueError(f"Unknown MySQL option {name!r}")
+        parsed[name] = parser(name, value)
+    return MySQLOptions(**parsed)
+
+
+def mysql_connect_kwargs(
+    options: Optional[MySQLOptions], driver: Any, *, async_mode: bool
+) -> Dict[str, Any]:
+    """Translate ``options`` into connect kwargs for ``driver`` (the pymysql or asyncmy module)."""
+    if options is None:
+        return {}
+    if async_mode and options.write_timeout is not None:
+        raise ValueError("write_timeout is not supported by asyncmy")
+    kwargs: Dict[str, Any] = {}
+    for name in ("connect_timeout", "read_timeout", "write_timeout", "init_command", "charset"):
+        value = getattr(options, name)
+        if value is not None:
+            kwargs[name] = value
+    if options.cursor is not None:
+        cursor_class = getattr(driver.cursors, _MYSQL_CURSORS[options.cursor])
+        kwargs["cursor_cls" if async_mode else "cursorclass"] = cursor_class
+    return kwargs
@@ -1,11 +1,21 @@
 """Connection URL parsing helpers for optional runner constructors."""
 from __future__ import annotations
 
-from typing import Dict
-from urllib.parse import unquote, urlparse
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlparse
+
+from .connection_options import MySQLOptions, mysql_options, sqlite_options
 
 
 def parse_sqlite_url(url: str) -> str:
+    return split_sqlite_url(url)[0]
+
+
+def split_sqlite_url(url: str) -> Tuple[str, Dict[str, str]]:
+    """Return the database path and the query options of a SQLite URL.
+
+    Option names and values are validated (see ``connection_options.sqlite_options``).
+    """
     if not url:
         raise ValueError("SQLite URL must be a non-empty string")
     parsed = urlparse(url)
@@ -13,24 +23,44 @@ def parse_sqlite_url(url: str) -> str:
         raise ValueError("Invalid SQLite URL scheme. Expected sqlite://")
     if parsed.netloc:
         raise ValueError("SQLite URL must not include a hostname")
-    if parsed.query or parsed.fragment:
-        raise ValueError("SQLite URL query parameters and fragments are not supported")
+    if parsed.fragment:
+        raise ValueError("SQLite URL fragments are not supported")
     if not parsed.path:
         raise ValueError("SQLite URL must include a database path")
+    options = _query_options(parsed.query, "SQLite")
+    sqlite_options(options)
+    return _sqlite_path(url.split("?", 1)[0], parsed.path), options
+
 
-    if url == "sqlite:///:memory:":
+def _query_options(query: str, label: str) -> Dict[str, str]:
+    if not query:
+        return {}
+    try:
+        pairs = parse_qsl(query, keep_blank_values=True, strict_parsing=True)
+    except ValueError as exc:
+        raise ValueError(f"{label} URL has a malformed query string") from exc
+    options: Dict[str, str] = {}
+    for name, value in pairs:
+        if name in options:
+            raise ValueError(f"{label} URL option {name!r} is given more than once")
+        options[name] = value
+    return options
+
+
+def _sqlite_path(base: str, raw_path: str) -> str:
+    if base == "sqlite:///:memory:":
         return ":memory:"
 
-    if url.startswith("sqlite:////"):
-        path = unquote(parsed.path)
+    if base.startswith("sqlite:////"):
+        path = unquote(raw_path)
         if path.startswith("//"):
             path = path[1:]
         if path in {"", "/"}:
             raise ValueError("SQLite URL must include a database path")
         return path
 
-    if url.startswith("sqlite:///"):
-        path = unquote(parsed.path.lstrip("/"))
+    if base.startswith("sqlite:///"):
+        path = unquote(raw_path.lstrip("/"))
         if not path:
             raise ValueError("SQLite URL must include a database path")
         return path
@@ -39,6 +69,11 @@ def parse_sqlite_url(url: str) -> str:
 
 
 def parse_mysql_url(url: str, *, async_mode: bool) -> Dict[str, object]:
+    return split_mysql_url(url, async_mode=async_mode)[0]
+
+
+def split_mysql_url(url: str, *, async_mode: bool) -> Tuple[Dict[str, object], Optional[MySQLOptions]]:
+    """Return the connection arguments and the validated query options (``None`` if absent)."""
     if not url:
         raise ValueError("MySQL URL must be a non-empty string")
     parsed = urlparse(url)
@@ -47,8 +82,10 @@ def parse_mysql_url(url: str, *, async_mode: bool) -> Dict[str, object]:
     if scheme not in allowed:
         expected = "mysql or mysql+asyncmy" if async_mode else "mysql or mysql+pymysql"
         raise ValueError(f"Invalid MySQL URL scheme. Expected {expected}")
-    if parsed.query or parsed.fragment:
-        raise ValueError("MySQL URL query parameters and fragments are not supported")
+    if parsed.fragment:
+        raise ValueError("MySQL URL fragments are not supported")
+    query = _query_options(parsed.query, "MySQL")
+    options = mysql_options(query) if query else None
 
     if not parsed.hostname:
         raise ValueError("MySQL URL must include a host")
@@ -68,10 +105,11 @@ def parse_mysql_url(url: str, *, async_mode: bool) -> Dict[str, object]:
     if "/" in database:
         raise ValueError("MySQL URL must include a single database path segment")
 
-    return {
+    args: Dict[str, object] = {
         "host": parsed.hostname,
         "port": port,
         "user": unquote(parsed.username),
         "password": unquote(parsed.password),
         "database": unquote(database),
     }
+    return args, options
@@ -8,11 +8,14 @@ from ... import ast
 from ...expr import (
     AliasExpr,
     BinaryPredicate,
+    Exists,
     Function,
+    InPredicate,
     Literal,
     LogicalPredicate,
     NotPredicate,
     OrderSpec,
+    Star,
     UnaryPredicate,
 )
 from ...meta import Column, Table
@@ -116,8 +119,12 @@ class _Compiler:
             return self._compile_order(expr)
         if isinstance(expr, Literal):
             return self._bind(expr.value)
+        if isinstance(expr, Star):
+            return "*"
         if isinstance(expr, ast.Subquery):
             return f"({self._compile_select(expr.query)})"
+        if isinstance(expr, Exists):
+            return f"EXISTS ({self._compile_select(expr.query)})"
         return self._compile_predicate(expr)
 
     def _compile_predicate(self, pred: Predicate) -> str:
@@ -125,11 +132,19 @@ class _Compiler:
             return f"{self._compile_expr(pred.left)} {pred.op} {self._compile_expr(pred.right)}"
         if isinstance(pred, UnaryPredicate):
             return f"{self._compile_expr(pred.expr)} {pred.op}"
+        if isinstance(pred, InPredicate):
+            if not pred.values:
+                # An empty IN list matches nothing; "IN ()" is not valid SQL.
+                return "1 = 0"
+            values = ", ".join(self._compile_expr(v) for v in pred.values)
+            return f"{self._compile_expr(pred.expr)} IN ({values})"
         if isinstance(pred, LogicalPredicate):
             inner = f" {pred.op} ".join(self._compile_predicate(p) for p in pred.predicates)
             return f"({inner})"
         if isinstance(pred, NotPredicate):
             return f"NOT ({self._compile_predicate(pred.predicate)})"
+        if isinstance(pred, Exists):
+            return self._compile_expr(pred)
         raise TypeError(f"Unsupported predicate type: {type(pred)}")
 
     def _compile_and_list(self, preds: Iterable[Predicate]) -> str:
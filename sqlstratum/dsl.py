@@ -7,6 +7,7 @@ from typing import Any, Tuple
 from .ast import DeleteQuery, InsertQuery, Join, SelectQuery, Subquery, UpdateQuery, tupled
 from .expr import LogicalPredicate, NotPredicate, OrderSpec
 from .meta import Table
+from .pagination import page_after
 from .types import Expression, HydrationTarget, Predicate, Source
 
 
@@ -95,6 +96,10 @@ def _distinct(self: SelectQuery) -> SelectQuery:
     return replace(self, distinct=True)
 
 
+def _page_after(self: SelectQuery, cursor: Any) -> SelectQuery:
+    return page_after(self, cursor)
+
+
 def _as(self: SelectQuery, alias: str) -> Subquery:
     return Subquery(self, alias)
 
@@ -113,6 +118,7 @@ SelectQuery.ORDER_BY = _order_by  # type: ignore[attr-defined]
 SelectQuery.LIMIT = _limit  # type: ignore[attr-defined]
 SelectQuery.OFFSET = _offset  # type: ignore[attr-defined]
 SelectQuery.DISTINCT = _distinct  # type: ignore[attr-defined]
+SelectQuery.PAGE_AFTER = _page_after  # type: ignore[attr-defined]
 SelectQuery.AS = _as  # type: ignore[attr-defined]
 SelectQuery.hydrate = _hydrate  # type: ignore[attr-defined]
 
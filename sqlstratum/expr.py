@@ -58,6 +58,12 @@ class UnaryPredicate:
     op: str
 
 
+@dataclass(frozen=True)
+class InPredicate:
+    expr: Expr
+    values: Tuple[Expr, ...]
+
+
 @dataclass(frozen=True)
 class LogicalPredicate:
     op: str  # "AND" or "OR"
@@ -75,6 +81,16 @@ class Function(Expr):
     args: tuple
 
 
+@dataclass(frozen=True)
+class Star(Expr):
+    """A literal ``*`` argument, as in ``COUNT(*)``."""
+
+
+@dataclass(frozen=True)
+class Exists(Expr):
+    query: Any
+
+
 @dataclass(frozen=True)
 class OrderSpec:
     expr: Expr
@@ -112,6 +128,10 @@ def MAX(expr: Expr) -> Function:
     return Function("MAX", (ensure_expr(expr),))
 
 
+def EXISTS(query: Any) -> Exists:
+    return Exists(query)
+
+
 def TOTAL(expr: Expr) -> Function:
     return Function("TOTAL", (ensure_expr(expr),))
 
@@ -0,0 +1,26 @@
+"""Query fingerprints: compiled SQL with placeholders and IN-list lengths normalized away."""
+from __future__ import annotations
+
+import functools
+import hashlib
+import re
+
+# sqlite (:p0) and mysql (%(p0)s) named placeholders.
+_PLACEHOLDER = re.compile(r":p\d+\b|%\(p\d+\)s")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)")
+
+
+@functools.lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Replace placeholders with ``?`` and collapse ``IN (?, ?, ...)`` lists to ``IN (?...)``.
+
+    The compiler numbers placeholders in order, so a longer IN list renumbers every placeholder
+    after it; normalizing both gives one fingerprint per query shape.
+    """
+    return _IN_LIST.sub("IN (?...)", _PLACEHOLDER.sub("?", sql))
+
+
+@functools.lru_cache(maxsize=1024)
+def fingerprint(sql: str) -> str:
+    """Return a short stable id (16 hex digits) for the shape of ``sql``."""
+    return hashlib.sha1(normalize_sql(sql).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,241 @@
+"""Instrumentation hooks around query compilation, execution, fetching and hydration."""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import ast
+
+BEFORE_COMPILE = "before_compile"
+AFTER_COMPILE = "after_compile"
+BEFORE_EXECUTE = "before_execute"
+AFTER_EXECUTE = "after_execute"
+AFTER_FETCH = "after_fetch"
+AFTER_HYDRATE = "after_hydrate"
+EVENTS = (BEFORE_COMPILE, AFTER_COMPILE, BEFORE_EXECUTE, AFTER_EXECUTE, AFTER_FETCH, AFTER_HYDRATE)
+
+Hook = Callable[["QueryEvent"], None]
+
+_LOGGER = logging.getLogger("sqlstratum")
+_DEBUG_TRUE = {"1", "true", "yes"}
+_MAX_PARAM_REPR_LEN = 200
+_MAX_BLOB_PREVIEW = 64
+
+
+class QueryEvent:
+    """One statement's trip through a runner; the same object is passed to each of its hooks.
+
+    Phase durations are in seconds and stay ``None`` until the phase has run: ``fetch_time`` runs
+    from ``after_execute`` to ``after_fetch`` and ``hydrate_time`` from ``after_fetch`` to
+    ``after_hydrate``. Hooks may store their own state in ``extra``.
+    """
+
+    __slots__ = (
+        "dialect",
+        "operation",
+        "query",
+        "compiled",
+        "started",
+        "compile_time",
+        "execute_time",
+        "fetch_time",
+        "hydrate_time",
+        "rows",
+        "rowcount",
+        "extra",
+        "_hooks",
+        "_mark",
+    )
+
+    def __init__(self, hooks: "Hooks", dialect: str, operation: str, query: Any) -> None:
+        self.dialect = dialect
+        self.operation = operation
+        self.query = query
+        self.compiled: Optional[ast.Compiled] = None
+        self.started = time.perf_counter()
+        self.compile_time: Optional[float] = None
+        self.execute_time: Optional[float] = None
+        self.fetch_time: Optional[float] = None
+        self.hydrate_time: Optional[float] = None
+        # Rows fetched by a read and rows affected by a write (the cursor's rowcount).
+        self.rows: Optional[int] = None
+        self.rowcount: Optional[int] = None
+        self.extra: Dict[str, Any] = {}
+        self._hooks = hooks
+        self._mark = self.started
+
+    @property
+    def sql(self) -> Optional[str]:
+        return None if self.compiled is None else self.compiled.sql
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {} if self.compiled is None else self.compiled.params
+
+    def _lap(self) -> float:
+        now = time.perf_counter()
+        elapsed, self._mark = now - self._mark, now
+        return elapsed
+
+    def before_compile(self) -> None:
+        self._lap()
+        self._hooks.emit(BEFORE_COMPILE, self)
+
+    def after_compile(self, compiled: ast.Compiled) -> None:
+        self.compile_time = self._lap()
+        self.compiled = compiled
+        self._hooks.emit(AFTER_COMPILE, self)
+
+    def before_execute(self) -> None:
+        self._lap()
+        self._hooks.emit(BEFORE_EXECUTE, self)
+
+    def after_execute(self, rowcount: int = -1) -> None:
+        self.execute_time = self._lap()
+        self.rowcount = rowcount
+        self._hooks.emit(AFTER_EXECUTE, self)
+
+    def after_fetch(self, rows: int) -> None:
+        self.fetch_time = self._lap()
+        self.rows = rows
+        self._hooks.emit(AFTER_FETCH, self)
+
+    def after_hydrate(self) -> None:
+        self.hydrate_time = self._lap()
+        self._hooks.emit(AFTER_HYDRATE, self)
+
+
+class Hooks:
+    """A registry of hooks, chained to a parent whose hooks run first.
+
+    Each runner owns a registry chained to ``GLOBAL_HOOKS``. ``active`` is kept up to date on
+    registration so runners test one attribute per statement and skip instrumentation entirely
+    while no hook is registered.
+    """
+
+    def __init__(self, parent: Optional["Hooks"] = None) -> None:
+        self.parent = parent
+        self.active = False
+        self._hooks: Dict[str, Tuple[Hook, ...]] = {name: () for name in EVENTS}
+        # Copy-on-write tuples let emit() iterate without locking.
+        self._dispatch: Dict[str, Tuple[Hook, ...]] = dict(self._hooks)
+        self._children: "weakref.WeakSet[Hooks]" = weakref.WeakSet()
+        self._lock = threading.RLock()
+        if parent is not None:
+            with parent._root_lock():
+                parent._children.add(self)
+                self._refresh()
+
+    def register(self, event: str, hook: Hook) -> Hook:
+        """Call ``hook(event)`` on ``event``; returns ``hook`` so it can be used as a decorator."""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown hook event {event!r}; expected one of: {', '.join(EVENTS)}")
+        with self._root_lock():
+            self._hooks[event] = self._hooks[event] + (hook,)
+            self._refresh()
+        return hook
+
+    def unregister(self, event: str, hook: Hook) -> None:
+        with self._root_lock():
+            hooks = list(self._hooks.get(event, ()))
+            if hook in hooks:
+                hooks.remove(hook)
+                self._hooks[event] = tuple(hooks)
+                self._refresh()
+
+    def add(self, listener: Any) -> Any:
+        """Register every method of ``listener`` named after an event (e.g. ``after_execute``)."""
+        methods = [(name, getattr(listener, name, None)) for name in EVENTS]
+        if not any(callable(method) for _, method in methods):
+            raise ValueError(f"{listener!r} defines none of the hook events: {', '.join(EVENTS)}")
+        for name, method in methods:
+            if callable(method):
+                self.register(name, method)
+        return listener
+
+    def remove(self, listener: Any) -> None:
+        for name in EVENTS:
+            method = getattr(listener, name, None)
+            if callable(method):
+                self.unregister(name, method)
+
+    def event(self, dialect: str, operation: str, query: Any) -> QueryEvent:
+        return QueryEvent(self, dialect, operation, query)
+
+    def emit(self, event: str, payload: QueryEvent) -> None:
+        for hook in self._dispatch[event]:
+            hook(payload)
+
+    def _root_lock(self) -> threading.RLock:
+        # Registration anywhere in a chain refreshes its descendants, so lock at the root.
+        root = self
+        while root.parent is not None:
+            root = root.parent
+        return root._lock
+
+    def _refresh(self) -> None:
+        inherited = self.parent._dispatch if self.parent is not None else None
+        for name in EVENTS:
+            own = self._hooks[name]
+            self._dispatch[name] = own if inherited is None else inherited[name] + own
+        self.active = any(self._dispatch.values())
+        for child in list(self._children):
+            child._refresh()
+
+
+GLOBAL_HOOKS = Hooks()
+
+
+def _safe_param_repr(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # Slice before converting so only the preview is copied, never the whole blob.
+        size = value.nbytes if isinstance(value, memoryview) else len(value)
+        rep = repr(bytes(value[:_MAX_BLOB_PREVIEW])[:_MAX_BLOB_PREVIEW])
+        if size > _MAX_BLOB_PREVIEW:
+            rep = f"{rep}...<{size - _MAX_BLOB_PREVIEW} more bytes>"
+        return rep
+    rep = repr(value)
+    if len(rep) <= _MAX_PARAM_REPR_LEN:
+        return rep
+    return f"{rep[:_MAX_PARAM_REPR_LEN]}...<{len(rep) - _MAX_PARAM_REPR_LEN} more>"
+
+
+def render_params(params: Dict[str, Any]) -> str:
+    """Render params for logs: sorted keys, long reprs truncated, BLOBs previewed."""
+    if not params:
+        return "{}"
+    items = ", ".join(f"{key}={_safe_param_repr(params[key])}" for key in sorted(params))
+    return "{" + items + "}"
+
+
+class DebugLogHook:
+    """Log each statement's SQL, params and execution time to the ``sqlstratum`` logger at DEBUG."""
+
+    def __init__(self, logger: Optional[logging.Logger] = None) -> None:
+        self.logger = logger or _LOGGER
+
+    def after_execute(self, event: QueryEvent) -> None:
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        self.logger.debug(
+            "SQL: %s | params=%s | duration_ms=%.3f",
+            event.sql,
+            render_params(event.params),
+            (event.execute_time or 0.0) * 1000,
+        )
+
+
+def _debug_hook_from_env() -> Optional[DebugLogHook]:
+    if os.getenv("SQLSTRATUM_DEBUG", "").lower() in _DEBUG_TRUE:
+        return DebugLogHook()
+    return None
+
+
+# SQLSTRATUM_DEBUG is read once, at import.
+_ENV_DEBUG_HOOK = _debug_hook_from_env()
+if _ENV_DEBUG_HOOK is not None:
+    GLOBAL_HOOKS.add(_ENV_DEBUG_HOOK)
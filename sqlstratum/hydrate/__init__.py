@@ -1,8 +1,10 @@
 """Hydration utilities."""
 from __future__ import annotations
 
+import keyword
 from dataclasses import is_dataclass
-from typing import Any, Dict, Iterable, List, Mapping, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from ..expr import AliasExpr, Function
 from ..meta import Column
@@ -13,12 +15,19 @@ class HydrationError(ValueError):
     pass
 
 
+RowsHydrator = Callable[[Iterable[Any]], List[Any]]
+
+_HYDRATOR_CACHE_SIZE = 512
+
+
 def projection_keys(projections: Sequence[Any]) -> List[str]:
     keys: List[str] = []
+    seen = set()
     for proj in projections:
         key = _projection_key(proj)
-        if key in keys:
+        if key in seen:
             raise HydrationError(f"Duplicate projection key '{key}'. Use AS() to disambiguate.")
+        seen.add(key)
         keys.append(key)
     return keys
 
@@ -33,23 +42,162 @@ def _projection_key(proj: Any) -> str:
     raise HydrationError("Projection requires AS('alias') for hydration")
 
 
-def hydrate_rows(
-    rows: Iterable[Mapping[str, Any]],
+def projection_types(projections: Sequence[Any]) -> List[type]:
+    types: List[type] = []
+    for proj in projections:
+        if isinstance(proj, AliasExpr):
+            proj = proj.expr
+        types.append(proj.py_type if isinstance(proj, Column) else object)
+    return types
+
+
+class Record:
+    """Base class for generated slotted record types.
+
+    ``query.hydrate(Record)`` hydrates each row into a ``__slots__`` class generated from the
+    projection keys (annotated with ``Column.py_type``), one class per projection shape.
+    """
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    def _asdict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+
+def record_type(projections: Sequence[Any]) -> type:
+    """Return the generated ``Record`` subclass for a projection shape."""
+    return _record_type(tuple(projection_keys(projections)), tuple(projection_types(projections)))
+
+
+@lru_cache(maxsize=_HYDRATOR_CACHE_SIZE)
+def _record_type(keys: Tuple[str, ...], types: Tuple[type, ...]) -> type:
+    for key in keys:
+        if not key.isidentifier() or keyword.iskeyword(key) or key.startswith("_"):
+            raise HydrationError(f"Projection key '{key}' cannot be used as a Record field")
+    source = f"def __init__(self, {', '.join(keys)}):\n"
+    source += "".join(f"    self.{key} = {key}\n" for key in keys) or "    pass\n"
+    namespace: dict = {}
+    exec(compile(source, "<sqlstratum-record>", "exec"), namespace)
+    return type(
+        "Record",
+        (Record,),
+        {
+            "__slots__": keys,
+            "__annotations__": dict(zip(keys, types)),
+            "__init__": namespace["__init__"],
+            "_fields": keys,
+        },
+    )
+
+
+def is_namedtuple_type(target: Any) -> bool:
+    return isinstance(target, type) and issubclass(target, tuple) and hasattr(target, "_fields")
+
+
+def is_positional_target(target: Any) -> bool:
+    """True for targets built positionally from a row (no per-row mapping needed)."""
+    return target is tuple or target is Record or is_namedtuple_type(target)
+
+
+def get_hydrator(
     projections: Sequence[Any],
     target: HydrationTarget,
-) -> List[Any]:
+    *,
+    by_index: bool = False,
+    indexes: Optional[Sequence[int]] = None,
+) -> RowsHydrator:
+    """Return a hydrator specialized for one (projection shape, target) pair.
+
+    ``by_index=True`` reads values by position (cursor tuples, ``sqlite3.Row``) and ``indexes``
+    maps each projection to its row position; otherwise rows are mappings keyed by projection
+    key. Hydrators are generated once and cached.
+    """
+    projections = tuple(projections)
+    positions: Optional[Tuple[int, ...]] = None
+    if indexes is not None:
+        positions = tuple(indexes)
+    elif by_index:
+        positions = tuple(range(len(projections)))
+    key = (projections, target, positions)
+    try:
+        hash(key)
+    except TypeError:
+        return _build_hydrator(*key)
+    return _cached_hydrator(*key)
+
+
+@lru_cache(maxsize=_HYDRATOR_CACHE_SIZE)
+def _cached_hydrator(
+    projections: Tuple[Any, ...], target: HydrationTarget, positions: Optional[Tuple[int, ...]]
+) -> RowsHydrator:
+    return _build_hydrator(projections, target, positions)
+
+
+def _build_hydrator(
+    projections: Tuple[Any, ...], target: HydrationTarget, positions: Optional[Tuple[int, ...]]
+) -> RowsHydrator:
     keys = projection_keys(projections)
-    mapped: List[Dict[str, Any]] = []
-    for row in rows:
-        mapped.append({k: row[k] for k in keys})
+    if positions is not None:
+        if len(positions) != len(keys):
+            raise HydrationError("Hydration indexes must match the projection count")
+        values = [f"row[{index}]" for index in positions]
+    else:
+        values = [f"row[{key!r}]" for key in keys]
+    # Whole rows can be reused as-is when they hold exactly the projections, in order.
+    whole_row = positions is not None and positions == tuple(range(len(keys)))
+    mapping = "{" + ", ".join(f"{key!r}: {value}" for key, value in zip(keys, values)) + "}"
 
+    namespace: dict = {"target": target}
     if target is None or target is dict:
-        return mapped
+        item = mapping
+    elif target is tuple:
+        # Rows that already are tuples pass through without a per-row allocation.
+        item = "row if row.__class__ is tuple else tuple(row)" if whole_row else f"({', '.join(values)},)"
+    elif is_namedtuple_type(target):
+        if tuple(target._fields) != tuple(keys):
+            raise HydrationError(
+                f"Namedtuple fields {tuple(target._fields)} do not match projection keys {tuple(keys)}"
+            )
+        namespace["new"] = tuple.__new__
+        item = "new(target, row)" if whole_row else f"new(target, ({', '.join(values)},))"
+    elif target is Record:
+        namespace["target"] = record_type(projections)
+        item = "target(" + ", ".join(values) + ")"
+    elif isinstance(target, type) and is_dataclass(target):
+        if all(key.isidentifier() and not keyword.iskeyword(key) for key in keys):
+            item = "target(" + ", ".join(f"{key}={value}" for key, value in zip(keys, values)) + ")"
+        else:
+            item = f"target(**{mapping})"
+    elif callable(getattr(target, "hydrate_batch", None)):
+        # Batch targets (e.g. Pydantic) receive all mapped rows of a result at once.
+        namespace["batch"] = target.hydrate_batch
+        item = mapping
+    elif callable(target):
+        item = f"target({mapping})"
+    else:
+        raise HydrationError("Unsupported hydration target")
 
-    if is_dataclass(target):
-        return [target(**m) for m in mapped]
+    body = f"[{item} for row in rows]"
+    if "batch" in namespace:
+        body = f"batch({body})"
+    source = f"def hydrate(rows):\n    return {body}\n"
+    exec(compile(source, "<sqlstratum-hydrator>", "exec"), namespace)
+    return namespace["hydrate"]
 
-    if callable(target):
-        return [target(m) for m in mapped]
 
-    raise HydrationError("Unsupported hydration target")
+def hydrate_rows(
+    rows: Iterable[Mapping[str, Any]],
+    projections: Sequence[Any],
+    target: HydrationTarget,
+) -> List[Any]:
+    return get_hydrator(projections, target)(rows)
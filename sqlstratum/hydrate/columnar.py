@@ -0,0 +1,35 @@
+"""Columnar result building straight from cursor rows."""
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, List, Mapping, Sequence, Union
+
+from . import projection_keys, projection_types
+
+ColumnValues = Union["array[Any]", List[Any]]
+
+# Column.py_type -> array typecode for compact numeric columns.
+_TYPECODES = {int: "q", float: "d"}
+
+
+def build_columns(rows: Sequence[Any], projections: Sequence[Any]) -> Dict[str, ColumnValues]:
+    """Transpose cursor rows into one column per projection key.
+
+    ``int`` and ``float`` columns become ``array.array`` instances; everything else (and any
+    numeric column containing NULLs or out-of-range values) stays a plain list.
+    """
+    keys = projection_keys(projections)
+    by_key = bool(rows) and isinstance(rows[0], Mapping)
+    columns: Dict[str, ColumnValues] = {}
+    for index, (key, py_type) in enumerate(zip(keys, projection_types(projections))):
+        slot = key if by_key else index
+        values = [row[slot] for row in rows]
+        typecode = _TYPECODES.get(py_type)
+        if typecode is not None:
+            try:
+                columns[key] = array(typecode, values)
+                continue
+            except (TypeError, OverflowError):
+                pass
+        columns[key] = values
+    return columns
@@ -1,10 +1,38 @@
 """Optional Pydantic v2 hydration adapters."""
 from __future__ import annotations
 
+import datetime
 import importlib
-from typing import Any, Mapping, Protocol, TypeVar
+import sys
+from functools import lru_cache
+from typing import (
+    Any,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    get_args,
+    get_origin,
+)
+
+from . import projection_keys, projection_types
 
 _INSTALL_MESSAGE = "Install with: pip install sqlstratum[pydantic]"
+_ADAPTER_CACHE_SIZE = 256
+# Drivers return these in other forms (SQLite: 0/1 and ISO text; MySQL: TINYINT as int), so trusted
+# mode still validates them.
+_DRIVER_DEPENDENT_TYPES = (bool, datetime.date, datetime.datetime, datetime.time)
+
+if sys.version_info >= (3, 10):
+    from types import UnionType
+
+    _UNION_ORIGINS: Tuple[Any, ...] = (Union, UnionType)
+else:  # pragma: no cover - Python < 3.10
+    _UNION_ORIGINS = (Union,)
 
 
 class _PydanticModel(Protocol):
@@ -20,6 +48,15 @@ def _import_pydantic():
     return importlib.import_module("pydantic")
 
 
+@lru_cache(maxsize=1)
+def _require_pydantic():
+    # Cached so per-row hydration skips the import machinery; failures are not cached.
+    try:
+        return _import_pydantic()
+    except Exception as exc:
+        raise RuntimeError(_INSTALL_MESSAGE) from exc
+
+
 def is_pydantic_available() -> bool:
     try:
         _import_pydantic()
@@ -29,23 +66,101 @@ def is_pydantic_available() -> bool:
 
 
 def hydrate_model(model_cls: type[TModel], data: Mapping[str, Any]) -> TModel:
-    try:
-        _import_pydantic()
-    except Exception as exc:
-        raise RuntimeError(_INSTALL_MESSAGE) from exc
-    return model_cls.model_validate(dict(data))
+    _require_pydantic()
+    return model_cls.model_validate(data if isinstance(data, dict) else dict(data))
+
+
+def hydrate_models(model_cls: type[TModel], rows: Sequence[Mapping[str, Any]]) -> list[TModel]:
+    """Validate a whole batch of rows in one call through a cached ``TypeAdapter``."""
+    return _list_adapter(model_cls).validate_python(rows if isinstance(rows, list) else list(rows))
+
+
+@lru_cache(maxsize=_ADAPTER_CACHE_SIZE)
+def _list_adapter(model_cls: type) -> Any:
+    return _require_pydantic().TypeAdapter(List[model_cls])  # type: ignore[valid-type]
 
 
-def hydrate_models(model_cls: type[TModel], rows: list[Mapping[str, Any]]) -> list[TModel]:
-    return [hydrate_model(model_cls, row) for row in rows]
+@lru_cache(maxsize=_ADAPTER_CACHE_SIZE)
+def _field_adapter(annotation: Any) -> Any:
+    return _require_pydantic().TypeAdapter(annotation)
+
+
+def _is_guaranteed(annotation: Any, py_type: type) -> bool:
+    if py_type in _DRIVER_DEPENDENT_TYPES:
+        return False
+    if annotation is Any or annotation is py_type:
+        return True
+    if get_origin(annotation) in _UNION_ORIGINS:
+        # Optional[T] also accepts the NULLs a T column can return.
+        return {arg for arg in get_args(annotation) if arg is not type(None)} == {py_type}
+    return False
+
+
+class PydanticTarget:
+    """Hydration target that validates rows into ``model_cls``, a whole batch at a time.
+
+    In trusted mode rows are built with ``model_construct``; only columns whose
+    ``Column.py_type`` does not already match the field annotation are validated, plus
+    bool/date/datetime/time columns, which drivers do not return as those types.
+    """
+
+    def __init__(
+        self,
+        model_cls: type[TModel],
+        *,
+        trusted: bool = False,
+        projections: Optional[Sequence[Any]] = None,
+    ) -> None:
+        self.model_cls = model_cls
+        self.trusted = trusted
+        self._checked: Tuple[Tuple[str, Any], ...] = ()
+        if trusted:
+            if projections is None:
+                raise ValueError("Trusted Pydantic hydration requires the query projections")
+            _require_pydantic()
+            fields = model_cls.model_fields  # type: ignore[attr-defined]
+            checked = []
+            for key, py_type in zip(projection_keys(projections), projection_types(projections)):
+                field = fields.get(key)
+                if field is not None and not _is_guaranteed(field.annotation, py_type):
+                    checked.append((key, _field_adapter(field.annotation)))
+            self._checked = tuple(checked)
+
+    def _identity(self) -> Tuple[Any, ...]:
+        return (self.model_cls, self.trusted, tuple(key for key, _ in self._checked))
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PydanticTarget):
+            return NotImplemented
+        return self._identity() == other._identity()
+
+    def __hash__(self) -> int:
+        # Equal targets share one cached hydrator even when queries are rebuilt per request.
+        return hash(self._identity())
+
+    def __call__(self, data: Mapping[str, Any]) -> TModel:
+        if self.trusted:
+            return self._construct(dict(data))
+        return hydrate_model(self.model_cls, data)
+
+    def hydrate_batch(self, rows: List[dict]) -> List[TModel]:
+        if self.trusted:
+            return [self._construct(row) for row in rows]
+        return hydrate_models(self.model_cls, rows)
+
+    def _construct(self, data: dict) -> TModel:
+        for key, adapter in self._checked:
+            data[key] = adapter.validate_python(data[key])
+        return self.model_cls.model_construct(**data)  # type: ignore[attr-defined]
 
 
 class _PydanticHydrateWrapper:
     def __init__(self, query: Any) -> None:
         self._query = query
 
-    def hydrate(self, model_cls: type[TModel]) -> Any:
-        return self._query.hydrate(lambda m: hydrate_model(model_cls, m))
+    def hydrate(self, model_cls: type[TModel], *, trusted: bool = False) -> Any:
+        projections = self._query.projections if trusted else None
+        return self._query.hydrate(PydanticTarget(model_cls, trusted=trusted, projections=projections))
 
 
 def using_pydantic(query: Any) -> _PydanticHydrateWrapper:
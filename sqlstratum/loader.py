@@ -0,0 +1,206 @@
+"""Batched related-row loading: async request coalescing and sync prefetch via ``IN`` queries."""
+from __future__ import annotations
+
+import asyncio
+import functools
+from dataclasses import replace
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Set,
+)
+
+from . import ast
+from .expr import AliasExpr
+from .hydrate import get_hydrator
+from .meta import Column, Table
+
+
+def _key_position(projections: Iterable[Any], key_column: Column) -> int:
+    for index, proj in enumerate(projections):
+        expr = proj.expr if isinstance(proj, AliasExpr) else proj
+        if expr is key_column:
+            return index
+    raise ValueError("The key column must be projected by the query it keys")
+
+
+def _check_unpaged(query: ast.SelectQuery) -> None:
+    if query.limit is not None or query.offset is not None:
+        raise ValueError("Batched loading queries cannot use LIMIT or OFFSET")
+
+
+class AsyncLoader:
+    """Collect keys requested within one event-loop tick and load them with a single query.
+
+    ``load(key)`` returns the hydrated row whose ``key_column`` equals ``key`` (or ``None``).
+    Results are memoized per loader, so create one loader per request.
+    """
+
+    def __init__(
+        self,
+        runner: Any,
+        key_column: Column,
+        base_query: ast.SelectQuery,
+        *,
+        max_batch_size: int = 1000,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be a positive integer")
+        _check_unpaged(base_query)
+        self._runner = runner
+        self._key_column = key_column
+        self._base_query = base_query
+        self._key_index = _key_position(base_query.projections, key_column)
+        self._max_batch_size = max_batch_size
+        self._futures: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._pending: List[Hashable] = []
+        # The event loop keeps only weak references to tasks; hold batch tasks until they finish.
+        self._tasks: Set["asyncio.Future[None]"] = set()
+
+    async def load(self, key: Hashable) -> Optional[Any]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            future.add_done_callback(functools.partial(self._settled, key))
+            self._futures[key] = future
+            if not self._pending:
+                # First key of this tick: dispatch once the current callbacks have run.
+                loop.call_soon(self._dispatch)
+            self._pending.append(key)
+        # Other callers wait on the same future, so cancelling this one must not cancel it.
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Optional[Any]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """Forget memoized results: one key, or all of them."""
+        if key is None:
+            self._futures = {k: f for k, f in self._futures.items() if not f.done()}
+        else:
+            future = self._futures.get(key)
+            if future is not None and future.done():
+                del self._futures[key]
+
+    def _settled(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        # Only results are memoized; a later load() retries failed or cancelled keys.
+        if future.cancelled() or future.exception() is not None:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+
+    def _dispatch(self) -> None:
+        keys, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._load_batches(keys))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _load_batches(self, keys: List[Hashable]) -> None:
+        # One connection runs one statement at a time, so batches are loaded sequentially.
+        for start in range(0, len(keys), self._max_batch_size):
+            batch = keys[start : start + self._max_batch_size]
+            try:
+                found = await self._fetch(batch)
+            except asyncio.CancelledError:
+                for key in keys[start:]:
+                    self._futures[key].cancel()
+                raise
+            except Exception as exc:
+                for key in batch:
+                    future = self._futures[key]
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            for key in batch:
+                future = self._futures[key]
+                if not future.done():
+                    future.set_result(found.get(key))
+
+    async def _fetch(self, keys: List[Hashable]) -> Dict[Hashable, Any]:
+        query = self._base_query
+        batch_query = replace(
+            query.WHERE(self._key_column.in_(keys)),  # type: ignore[attr-defined]
+            hydration=tuple,
+        )
+        rows = await self._runner.fetch_all(batch_query)
+        hydrated = get_hydrator(query.projections, query.hydration, by_index=True)(rows)
+        found: Dict[Hashable, Any] = {}
+        for row, item in zip(rows, hydrated):
+            found.setdefault(row[self._key_index], item)
+        return found
+
+
+class PrefetchPlan:
+    """Load the children of already fetched parents with chunked ``IN`` queries.
+
+    Child rows are grouped by ``child_fk`` (a hash join in Python) and attached to each parent
+    under ``attach``, as a dict key for mapping rows or an attribute otherwise.
+    """
+
+    def __init__(
+        self,
+        child_query: ast.SelectQuery,
+        child_fk: Column,
+        *,
+        parent_key: str,
+        attach: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+        _check_unpaged(child_query)
+        if attach is None:
+            if not isinstance(child_query.from_, Table):
+                raise ValueError("prefetch() needs attach= when the child query does not select FROM a table")
+            attach = child_query.from_.name
+        self.child_query = child_query
+        self.child_fk = child_fk
+        self.parent_key = parent_key
+        self.attach = attach
+        self.chunk_size = chunk_size
+        self._key_index = _key_position(child_query.projections, child_fk)
+        self._hydrator = get_hydrator(child_query.projections, child_query.hydration, by_index=True)
+        self._groups: Dict[Hashable, List[Any]] = {}
+
+    def queries(self, parents: Sequence[Any]) -> Iterator[ast.SelectQuery]:
+        values = (_read(parent, self.parent_key) for parent in parents)
+        keys = list(dict.fromkeys(key for key in values if key is not None))
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start : start + self.chunk_size]
+            yield replace(
+                self.child_query.WHERE(self.child_fk.in_(chunk)),  # type: ignore[attr-defined]
+                hydration=tuple,
+            )
+
+    def add_rows(self, rows: Sequence[Any]) -> None:
+        for row, child in zip(rows, self._hydrator(rows)):
+            self._groups.setdefault(row[self._key_index], []).append(child)
+
+    def attach_to(self, parents: Sequence[Any]) -> Sequence[Any]:
+        for parent in parents:
+            children = self._groups.get(_read(parent, self.parent_key), [])
+            if isinstance(parent, MutableMapping):
+                parent[self.attach] = list(children)
+                continue
+            try:
+                setattr(parent, self.attach, list(children))
+            except (AttributeError, TypeError) as exc:
+                raise ValueError(
+                    f"Cannot attach {self.attach!r} to {type(parent).__name__} rows; "
+                    "hydrate parents as dicts or a mutable class"
+                ) from exc
+        return parents
+
+
+def _read(row: Any, name: str) -> Any:
+    if isinstance(row, Mapping):
+        return row[name]
+    return getattr(row, name)
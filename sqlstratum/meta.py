@@ -48,6 +48,10 @@ class Column(Expr):
         from .expr import UnaryPredicate
         return UnaryPredicate(self, "IS NOT NULL")
 
+    def in_(self, values: Iterable[Any]) -> "InPredicate":
+        from .expr import InPredicate, ensure_expr
+        return InPredicate(self, tuple(ensure_expr(v) for v in values))
+
     def contains(self, text: str) -> "BinaryPredicate":
         from .expr import BinaryPredicate, Literal
         return BinaryPredicate(self, "LIKE", Literal(f"%{text}%"))
@@ -0,0 +1,274 @@
+"""Opt-in per-fingerprint query metrics, collected through runner hooks."""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .fingerprint import fingerprint, normalize_sql
+from .hooks import QueryEvent
+
+# Upper bounds in seconds, from 100us to 10s.
+DEFAULT_BUCKETS = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PHASES = ("compile", "execute", "fetch", "hydrate")
+
+_SeriesKey = Tuple[str, str]
+_SERIES = "metrics.series"
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    # counts[i] is the number of observations <= buckets[i] and above the previous bound; the
+    # extra last count is for observations above every bound.
+    buckets: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    sum: float
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def cumulative(self) -> List[int]:
+        total, out = 0, []
+        for value in self.counts:
+            total += value
+            out.append(total)
+        return out
+
+
+@dataclass(frozen=True)
+class QueryStats:
+    dialect: str
+    fingerprint: str
+    # Normalized SQL of the fingerprint (placeholders shown as ``?``).
+    sql: str
+    calls: int
+    rows_returned: int
+    rows_affected: int
+    compile: HistogramSnapshot
+    execute: HistogramSnapshot
+    fetch: HistogramSnapshot
+    hydrate: HistogramSnapshot
+
+
+class _Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self, size: int) -> None:
+        self.counts = [0] * size
+        self.count = 0
+        self.sum = 0.0
+
+
+class _Series:
+    __slots__ = ("sql", "calls", "rows_returned", "rows_affected", "histograms")
+
+    def __init__(self, sql: str, buckets: int) -> None:
+        self.sql = sql
+        self.calls = 0
+        self.rows_returned = 0
+        self.rows_affected = 0
+        self.histograms = {phase: _Histogram(buckets + 1) for phase in PHASES}
+
+
+class _Shard:
+    """The series recorded by one thread; only that thread writes to it."""
+
+    __slots__ = ("thread", "series")
+
+    def __init__(self) -> None:
+        self.thread = threading.current_thread()
+        self.series: Dict[_SeriesKey, _Series] = {}
+
+
+class QueryMetrics:
+    """Count calls, rows and per-phase latency histograms per (dialect, query fingerprint).
+
+    Register it as a hook on a runner (``runner.hooks.add(metrics)``) or on every runner
+    (``GLOBAL_HOOKS.add(metrics)``). Each thread records into its own shard, so recording takes no
+    lock; ``snapshot()`` merges the shards, and counters read mid-update may be off by the
+    statement in flight.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        bounds = tuple(float(bound) for bound in buckets)
+        if not bounds or list(bounds) != sorted(set(bounds)) or bounds[0] <= 0:
+            raise ValueError("buckets must be increasing positive bounds")
+        self.buckets = bounds
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        # Shards of finished threads are merged into _retired at snapshot time.
+        self._retired = _Shard()
+        self._lock = threading.Lock()
+
+    def _series(self, event: QueryEvent) -> _Series:
+        shard = getattr(self._local, "shard", None)
+        cached = event.extra.get(_SERIES)
+        if cached is not None and cached[0] is shard:
+            return cached[1]
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+        sql = event.sql or ""
+        key = (event.dialect, fingerprint(sql))
+        series = shard.series.get(key)
+        if series is None:
+            series = shard.series[key] = _Series(normalize_sql(sql), len(self.buckets))
+        # Later phases usually run on the same thread; AsyncSQLiteRunner moves them to a worker.
+        event.extra[_SERIES] = (shard, series)
+        return series
+
+    def _observe(self, series: _Series, phase: str, seconds: Optional[float]) -> None:
+        if seconds is None:
+            return
+        histogram = series.histograms[phase]
+        histogram.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        histogram.count += 1
+        histogram.sum += seconds
+
+    def after_compile(self, event: QueryEvent) -> None:
+        series = self._series(event)
+        series.calls += 1
+        self._observe(series, "compile", event.compile_time)
+
+    def after_execute(self, event: QueryEvent) -> None:
+        series = self._series(event)
+        self._observe(series, "execute", event.execute_time)
+        if event.operation == "execute" and event.rowcount is not None and event.rowcount > 0:
+            series.rows_affected += event.rowcount
+
+    def after_fetch(self, event: QueryEvent) -> None:
+        series = self._series(event)
+        self._observe(series, "fetch", event.fetch_time)
+        series.rows_returned += event.rows or 0
+
+    def after_hydrate(self, event: QueryEvent) -> None:
+        self._observe(self._series(event), "hydrate", event.hydrate_time)
+
+    def snapshot(self) -> List[QueryStats]:
+        """Merged statistics, one entry per (dialect, fingerprint), sorted by call count."""
+        merged: Dict[_SeriesKey, _Series] = {}
+        with self._lock:
+            live = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    # The thread is gone, so nothing writes to its shard any more.
+                    _merge_into(self._retired.series, shard.series.copy(), len(self.buckets))
+            self._shards = live
+            shards = [self._retired] + live
+        for shard in shards:
+            _merge_into(merged, shard.series.copy(), len(self.buckets))
+        stats = [self._stats(key, series) for key, series in merged.items()]
+        stats.sort(key=lambda item: (-item.calls, item.dialect, item.fingerprint))
+        return stats
+
+    def _stats(self, key: _SeriesKey, series: _Series) -> QueryStats:
+        histograms = {
+            phase: HistogramSnapshot(self.buckets, tuple(hist.counts), hist.count, hist.sum)
+            for phase, hist in series.histograms.items()
+        }
+        return QueryStats(
+            dialect=key[0],
+            fingerprint=key[1],
+            sql=series.sql,
+            calls=series.calls,
+            rows_returned=series.rows_returned,
+            rows_affected=series.rows_affected,
+            **histograms,
+        )
+
+    def reset(self) -> None:
+        with self._lock:
+            self._retired.series.clear()
+            for shard in self._shards:
+                shard.series.clear()
+
+    def render_prometheus(self, *, prefix: str = "sqlstratum") -> str:
+        return render_prometheus(self.snapshot(), prefix=prefix)
+
+
+def _merge_into(target: Dict[_SeriesKey, _Series], source: Dict[_SeriesKey, _Series], buckets: int) -> None:
+    for key, series in source.items():
+        total = target.get(key)
+        if total is None:
+            total = target[key] = _Series(series.sql, buckets)
+        total.calls += series.calls
+        total.rows_returned += series.rows_returned
+        total.rows_affected += series.rows_affected
+        for phase, hist in series.histograms.items():
+            into = total.histograms[phase]
+            into.counts = [a + b for a, b in zip(into.counts, list(hist.counts))]
+            into.count += hist.count
+            into.sum += hist.sum
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus(stats: Iterable[QueryStats], *, prefix: str = "sqlstratum") -> str:
+    """Render ``stats`` (from ``QueryMetrics.snapshot()``) in the Prometheus text format."""
+    stats = list(stats)
+    lines: List[str] = []
+
+    def family(name: str, kind: str, help_text: str) -> str:
+        metric = f"{prefix}_{name}"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {kind}")
+        return metric
+
+    def labels(item: QueryStats, **extra: Any) -> str:
+        pairs = [("dialect", item.dialect), ("fingerprint", item.fingerprint)] + list(extra.items())
+        return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in pairs) + "}"
+
+    metric = family("query_info", "gauge", "Normalized SQL of each query fingerprint.")
+    for item in stats:
+        lines.append(f"{metric}{labels(item, sql=item.sql)} 1")
+    for name, attr, help_text in (
+        ("queries_total", "calls", "Statements run per query fingerprint."),
+        ("rows_returned_total", "rows_returned", "Rows fetched per query fingerprint."),
+        ("rows_affected_total", "rows_affected", "Rows changed by writes per query fingerprint."),
+    ):
+        metric = family(name, "counter", help_text)
+        for item in stats:
+            lines.append(f"{metric}{labels(item)} {getattr(item, attr)}")
+    metric = family("query_duration_seconds", "histogram", "Time spent per query phase.")
+    for item in stats:
+        for phase in PHASES:
+            hist: HistogramSnapshot = getattr(item, phase)
+            if not hist.count:
+                continue
+            bounds = list(hist.buckets) + [math.inf]
+            for bound, total in zip(bounds, hist.cumulative()):
+                lines.append(f"{metric}_bucket{labels(item, phase=phase, le=_number(bound))} {total}")
+            lines.append(f"{metric}_sum{labels(item, phase=phase)} {_number(hist.sum)}")
+            lines.append(f"{metric}_count{labels(item, phase=phase)} {hist.count}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,164 @@
+"""Keyset (seek) pagination derived from a query's ORDER BY."""
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from dataclasses import dataclass, replace
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from .ast import SelectQuery
+from .expr import AliasExpr, BinaryPredicate, LogicalPredicate, OrderSpec, ensure_expr
+from .hydrate import get_hydrator, projection_keys
+
+
+class PaginationError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class Page:
+    rows: List[Any]
+    next_token: Optional[str]
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_token is not None
+
+
+# Key types JSON cannot carry are encoded as {"t": tag, "v": text} and restored on decode.
+# datetime precedes date because it is a date subclass.
+_TYPED_VALUES: Tuple[Tuple[str, type, Any, Any], ...] = (
+    ("datetime", datetime.datetime, datetime.datetime.isoformat, datetime.datetime.fromisoformat),
+    ("date", datetime.date, datetime.date.isoformat, datetime.date.fromisoformat),
+    ("time", datetime.time, datetime.time.isoformat, datetime.time.fromisoformat),
+    ("decimal", decimal.Decimal, str, decimal.Decimal),
+    ("bytes", bytes, bytes.hex, bytes.fromhex),
+)
+
+
+def _encode_value(value: Any) -> Any:
+    for tag, py_type, dump, _ in _TYPED_VALUES:
+        if isinstance(value, py_type):
+            return {"t": tag, "v": dump(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    for tag, _, _, load in _TYPED_VALUES:
+        if value.get("t") == tag and isinstance(value.get("v"), str):
+            try:
+                return load(value["v"])
+            except (ValueError, decimal.InvalidOperation) as exc:
+                raise PaginationError("Invalid pagination token") from exc
+    raise PaginationError("Invalid pagination token")
+
+
+def encode_token(values: Sequence[Any]) -> str:
+    try:
+        payload = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    except TypeError as exc:
+        raise PaginationError(
+            "Keyset values must be JSON-serializable, datetime, date, time, Decimal or bytes"
+        ) from exc
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_token(token: str) -> List[Any]:
+    padded = token + "=" * (-len(token) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, binascii.Error, UnicodeError) as exc:
+        raise PaginationError("Invalid pagination token") from exc
+    if not isinstance(values, list):
+        raise PaginationError("Invalid pagination token")
+    return [_decode_value(value) for value in values]
+
+
+def seek_predicate(order_by: Sequence[OrderSpec], values: Sequence[Any]) -> Any:
+    """Build the lexicographic "row comes after ``values``" predicate for ``order_by``.
+
+    For ``ORDER BY a ASC, b DESC`` this is ``(a > :a) OR (a = :a AND b < :b)``.
+    """
+    if not order_by:
+        raise PaginationError("Keyset pagination requires ORDER_BY(...)")
+    if len(values) != len(order_by):
+        raise PaginationError(
+            f"Expected {len(order_by)} keyset values for ORDER BY, got {len(values)}"
+        )
+    exprs = [_order_expr(spec) for spec in order_by]
+    branches = []
+    for i, spec in enumerate(order_by):
+        op = ">" if spec.direction.upper() == "ASC" else "<"
+        terms = [BinaryPredicate(exprs[j], "=", ensure_expr(values[j])) for j in range(i)]
+        terms.append(BinaryPredicate(exprs[i], op, ensure_expr(values[i])))
+        branches.append(terms[0] if len(terms) == 1 else LogicalPredicate("AND", tuple(terms)))
+    if len(branches) == 1:
+        return branches[0]
+    return LogicalPredicate("OR", tuple(branches))
+
+
+def page_after(query: SelectQuery, cursor: Union[str, Sequence[Any]]) -> SelectQuery:
+    values = decode_token(cursor) if isinstance(cursor, str) else list(cursor)
+    return replace(query, where=query.where + (seek_predicate(query.order_by, values),))
+
+
+def order_keys(query: SelectQuery) -> Tuple[str, ...]:
+    """Return the projection key holding each ORDER BY expression's value."""
+    keys = projection_keys(query.projections)
+    return tuple(keys[index] for index in order_positions(query))
+
+
+def order_positions(query: SelectQuery) -> Tuple[int, ...]:
+    """Return the projection position holding each ORDER BY expression's value."""
+    resolved: List[int] = []
+    for spec in query.order_by:
+        target = _order_expr(spec)
+        for index, proj in enumerate(query.projections):
+            if proj is target or (isinstance(proj, AliasExpr) and proj.expr is target):
+                resolved.append(index)
+                break
+        else:
+            raise PaginationError("Each ORDER BY expression must be projected for keyset pagination")
+    return tuple(resolved)
+
+
+def prepare_page_query(query: SelectQuery, page_size: int, after: Optional[str]) -> SelectQuery:
+    if page_size < 1:
+        raise PaginationError("page_size must be a positive integer")
+    order_positions(query)
+    if query.offset is not None:
+        raise PaginationError("Keyset pagination cannot be combined with OFFSET")
+    if after is not None:
+        query = page_after(query, after)
+    # Fetch one extra row to learn whether another page exists. Rows come back as plain tuples;
+    # build_page() reads the keys from them and hydrates each row once.
+    return replace(query, limit=page_size + 1, hydration=tuple)
+
+
+def build_page(query: SelectQuery, rows: Sequence[Sequence[Any]], page_size: int) -> Page:
+    """Build the page from the tuple rows of ``prepare_page_query``, hydrated to ``query``'s target.
+
+    Raises ``PaginationError`` when a key of the last row is NULL: the seek predicate cannot
+    compare against NULL, so the rows after it would be skipped.
+    """
+    page_rows = list(rows[:page_size])
+    next_token = None
+    if len(rows) > page_size:
+        last = page_rows[-1]
+        values = [last[index] for index in order_positions(query)]
+        if any(value is None for value in values):
+            raise PaginationError("Keyset pagination cannot continue past a NULL ORDER BY value")
+        next_token = encode_token(values)
+    hydrator = get_hydrator(query.projections, query.hydration, by_index=True)
+    return Page(rows=hydrator(page_rows), next_token=next_token)
+
+
+def _order_expr(spec: OrderSpec) -> Any:
+    if isinstance(spec.expr, AliasExpr):
+        return spec.expr.expr
+    return spec.expr
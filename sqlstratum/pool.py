@@ -0,0 +1,497 @@
+"""Connection pooling for runners."""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, Generator, Iterator, Optional
+
+from .errors import SQLStratumError
+
+
+class PoolTimeout(SQLStratumError):
+    """Raised when no pooled connection becomes available within the acquire timeout."""
+
+
+class PoolClosed(SQLStratumError):
+    """Raised when acquiring from a closed pool."""
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    size: int
+    in_use: int
+    idle: int
+    waiting: int
+    checkouts: int
+    timeouts: int
+    created: int
+    discarded: int
+    wait_time_total: float
+    wait_time_max: float
+
+    @property
+    def wait_time_avg(self) -> float:
+        return self.wait_time_total / self.checkouts if self.checkouts else 0.0
+
+
+def _default_ping(connection: Any) -> None:
+    ping = getattr(connection, "ping", None)
+    if ping is not None:
+        ping(reconnect=False)
+
+
+def _close_quietly(connection: Any) -> None:
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+async def _maybe_await(result: Any) -> Any:
+    if inspect.isawaitable(result):
+        return await result
+    return result
+
+
+async def _default_async_ping(connection: Any) -> None:
+    ping = getattr(connection, "ping", None)
+    if ping is not None:
+        await _maybe_await(ping(reconnect=False))
+
+
+async def _aclose_quietly(connection: Any) -> None:
+    # asyncmy's close() is synchronous; ensure_closed() is the awaitable variant.
+    closer = getattr(connection, "ensure_closed", None) or getattr(connection, "close", None)
+    try:
+        if closer is not None:
+            await _maybe_await(closer())
+    except Exception:
+        pass
+
+
+class _Pooled:
+    __slots__ = ("connection", "created_at", "returned_at")
+
+    def __init__(self, connection: Any, now: float) -> None:
+        self.connection = connection
+        self.created_at = now
+        self.returned_at = now
+
+
+_POOLS: "weakref.WeakSet[ConnectionPool]" = weakref.WeakSet()
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in list(_POOLS):
+        pool._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections created by ``connect``.
+
+    Connections are pinged on checkout and replaced when the ping fails, when they have been idle
+    longer than ``max_idle`` seconds or alive longer than ``max_lifetime`` seconds. Returned
+    connections are rolled back (``reset_on_return``) so no open transaction or stale read
+    snapshot leaks to the next borrower. After a fork the child starts with an empty pool instead
+    of sharing the parent's sockets.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Any],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: Optional[float] = 300.0,
+        max_lifetime: Optional[float] = 3600.0,
+        timeout: Optional[float] = 30.0,
+        ping: Optional[Callable[[Any], None]] = _default_ping,
+        reset_on_return: bool = True,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self._ping = ping
+        self.reset_on_return = reset_on_return
+        self._init_state()
+        _POOLS.add(self)
+        for _ in range(min_size):
+            self._idle.append(self._open())
+
+    def _init_state(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: Deque[_Pooled] = deque()
+        self._in_use: Dict[int, _Pooled] = {}
+        # Slots reserved by acquire() while a connection is opened or health-checked.
+        self._pending = 0
+        self._waiting = 0
+        self._closed = False
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def _reset_after_fork(self) -> None:
+        # The parent still owns these sockets; drop them without sending anything.
+        self._init_state()
+
+    def _open(self) -> _Pooled:
+        pooled = _Pooled(self._connect(), time.monotonic())
+        with self._lock:
+            self._created += 1
+        return pooled
+
+    def _expired(self, pooled: _Pooled, now: float) -> bool:
+        if self.max_lifetime is not None and now - pooled.created_at > self.max_lifetime:
+            return True
+        return self.max_idle is not None and now - pooled.returned_at > self.max_idle
+
+    def _healthy(self, pooled: _Pooled) -> bool:
+        if self._ping is None:
+            return True
+        try:
+            self._ping(pooled.connection)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            pooled = self._reserve(deadline, timeout)
+            try:
+                if pooled is None:
+                    pooled = self._open()
+                elif self._expired(pooled, time.monotonic()) or not self._healthy(pooled):
+                    self._discard(pooled)
+                    pooled = None
+            except BaseException:
+                self._unreserve()
+                raise
+            if pooled is None:
+                self._unreserve()
+                continue
+            waited = time.monotonic() - start
+            with self._lock:
+                self._pending -= 1
+                self._in_use[id(pooled.connection)] = pooled
+                self._checkouts += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            return pooled.connection
+
+    def _reserve(self, deadline: Optional[float], timeout: Optional[float]) -> Optional[_Pooled]:
+        """Reserve a slot: return an idle connection to check, or ``None`` to open a new one."""
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise PoolClosed("Connection pool is closed")
+                if self._idle:
+                    self._pending += 1
+                    return self._idle.pop()
+                if len(self._in_use) + self._pending < self.max_size:
+                    self._pending += 1
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(f"No connection available within {timeout}s")
+                self._waiting += 1
+                try:
+                    self._available.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+    def _unreserve(self) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._available.notify()
+
+    def release(self, connection: Any, *, discard: bool = False) -> None:
+        with self._lock:
+            pooled = self._in_use.pop(id(connection), None)
+        if pooled is None:
+            # Checked out before a fork, or already released.
+            return
+        now = time.monotonic()
+        if not discard and self.reset_on_return:
+            try:
+                connection.rollback()
+            except Exception:
+                discard = True
+        if discard or self._closed or self._expired(pooled, now):
+            self._discard(pooled)
+            return
+        pooled.returned_at = now
+        with self._lock:
+            self._idle.append(pooled)
+            self._available.notify()
+
+    def _discard(self, pooled: _Pooled) -> None:
+        _close_quietly(pooled.connection)
+        with self._lock:
+            self._discarded += 1
+            self._available.notify()
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self) -> None:
+        """Close idle connections now and in-use connections as they are released."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, deque()
+            self._available.notify_all()
+        for pooled in idle:
+            _close_quietly(pooled.connection)
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                size=len(self._idle) + len(self._in_use) + self._pending,
+                in_use=len(self._in_use),
+                idle=len(self._idle),
+                waiting=self._waiting,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                created=self._created,
+                discarded=self._discarded,
+                wait_time_total=self._wait_total,
+                wait_time_max=self._wait_max,
+            )
+
+
+class AsyncConnectionPool:
+    """asyncio counterpart of ``ConnectionPool`` for connections created by an async ``connect``.
+
+    ``async with pool.acquire() as conn`` borrows a connection; ``await pool.acquire()`` returns
+    one that must be given back with ``await pool.release(conn)``.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[Any]],
+        *,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: Optional[float] = 300.0,
+        max_lifetime: Optional[float] = 3600.0,
+        timeout: Optional[float] = 30.0,
+        ping: Optional[Callable[[Any], Awaitable[None]]] = _default_async_ping,
+        reset_on_return: bool = True,
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be a positive integer")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self._ping = ping
+        self.reset_on_return = reset_on_return
+        self._available: Optional[asyncio.Condition] = None
+        self._idle: Deque[_Pooled] = deque()
+        self._in_use: Dict[int, _Pooled] = {}
+        self._pending = 0
+        self._waiting = 0
+        self._closed = False
+        self._checkouts = 0
+        self._timeouts = 0
+        self._created = 0
+        self._discarded = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def open(self) -> "AsyncConnectionPool":
+        """Open ``min_size`` connections up front."""
+        opened = await asyncio.gather(*(self._open() for _ in range(self.min_size - len(self._idle))))
+        self._idle.extend(opened)
+        return self
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so the condition binds to the running loop.
+        if self._available is None:
+            self._available = asyncio.Condition()
+        return self._available
+
+    async def _open(self) -> _Pooled:
+        pooled = _Pooled(await self._connect(), time.monotonic())
+        self._created += 1
+        return pooled
+
+    def _expired(self, pooled: _Pooled, now: float) -> bool:
+        if self.max_lifetime is not None and now - pooled.created_at > self.max_lifetime:
+            return True
+        return self.max_idle is not None and now - pooled.returned_at > self.max_idle
+
+    async def _healthy(self, pooled: _Pooled) -> bool:
+        if self._ping is None:
+            return True
+        try:
+            await self._ping(pooled.connection)
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> "_AsyncAcquire":
+        return _AsyncAcquire(self, timeout)
+
+    async def _acquire(self, timeout: Optional[float]) -> Any:
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            pooled = await self._reserve(deadline, timeout)
+            try:
+                if pooled is None:
+                    pooled = await self._open()
+                elif self._expired(pooled, time.monotonic()) or not await self._healthy(pooled):
+                    await self._discard(pooled)
+                    pooled = None
+            except BaseException:
+                await self._unreserve()
+                raise
+            if pooled is None:
+                await self._unreserve()
+                continue
+            waited = time.monotonic() - start
+            self._pending -= 1
+            self._in_use[id(pooled.connection)] = pooled
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+            return pooled.connection
+
+    async def _reserve(self, deadline: Optional[float], timeout: Optional[float]) -> Optional[_Pooled]:
+        available = self._condition()
+        async with available:
+            while True:
+                if self._closed:
+                    raise PoolClosed("Connection pool is closed")
+                if self._idle:
+                    self._pending += 1
+                    return self._idle.pop()
+                if len(self._in_use) + self._pending < self.max_size:
+                    self._pending += 1
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(f"No connection available within {timeout}s")
+                self._waiting += 1
+                try:
+                    await asyncio.wait_for(available.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+                finally:
+                    self._waiting -= 1
+
+    async def _unreserve(self) -> None:
+        self._pending -= 1
+        await self._notify()
+
+    async def _notify(self) -> None:
+        available = self._condition()
+        async with available:
+            available.notify()
+
+    async def release(self, connection: Any, *, discard: bool = False) -> None:
+        pooled = self._in_use.pop(id(connection), None)
+        if pooled is None:
+            return
+        if not discard and self.reset_on_return:
+            try:
+                await connection.rollback()
+            except Exception:
+                discard = True
+        now = time.monotonic()
+        if discard or self._closed or self._expired(pooled, now):
+            await self._discard(pooled)
+            return
+        pooled.returned_at = now
+        self._idle.append(pooled)
+        await self._notify()
+
+    async def _discard(self, pooled: _Pooled) -> None:
+        await _aclose_quietly(pooled.connection)
+        self._discarded += 1
+        await self._notify()
+
+    async def close(self) -> None:
+        """Close idle connections now and in-use connections as they are released."""
+        self._closed = True
+        idle, self._idle = list(self._idle), deque()
+        for pooled in idle:
+            await _aclose_quietly(pooled.connection)
+        available = self._condition()
+        async with available:
+            available.notify_all()
+
+    def stats(self) -> PoolStats:
+        return PoolStats(
+            size=len(self._idle) + len(self._in_use) + self._pending,
+            in_use=len(self._in_use),
+            idle=len(self._idle),
+            waiting=self._waiting,
+            checkouts=self._checkouts,
+            timeouts=self._timeouts,
+            created=self._created,
+            discarded=self._discarded,
+            wait_time_total=self._wait_total,
+            wait_time_max=self._wait_max,
+        )
+
+
+class _AsyncAcquire:
+    """Result of ``AsyncConnectionPool.acquire()``: usable with ``async with`` or ``await``."""
+
+    def __init__(self, pool: AsyncConnectionPool, timeout: Optional[float]) -> None:
+        self._pool = pool
+        self._timeout = timeout
+        self._connection: Any = None
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self._pool._acquire(self._timeout).__await__()
+
+    async def __aenter__(self) -> Any:
+        self._connection = await self._pool._acquire(self._timeout)
+        return self._connection
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        # A connection interrupted by cancellation may be mid-protocol; do not reuse it.
+        discard = exc_type is not None and issubclass(exc_type, asyncio.CancelledError)
+        await self._pool.release(self._connection, discard=discard)
@@ -0,0 +1,44 @@
+"""Query rewrites used by runner helpers (fetch_one, exists, count)."""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any
+
+from .ast import SelectQuery
+from .dsl import SELECT
+from .expr import EXISTS, Function, Literal, Star
+
+
+def limit_one(query: Any) -> Any:
+    """Add ``LIMIT 1`` to a SELECT that has no explicit limit."""
+    if isinstance(query, SelectQuery) and query.limit is None:
+        return replace(query, limit=1)
+    return query
+
+
+def exists_query(query: SelectQuery) -> SelectQuery:
+    """Rewrite ``query`` to ``SELECT EXISTS (SELECT 1 FROM ... WHERE ...)``.
+
+    Projections, DISTINCT and ORDER BY cannot change whether a row exists, so they are dropped;
+    GROUP BY/HAVING and LIMIT/OFFSET can, so they are kept.
+    """
+    probe = replace(query, projections=(Literal(1),), distinct=False, order_by=(), hydration=None)
+    return SELECT(EXISTS(probe).AS("exists"))
+
+
+def count_query(query: SelectQuery) -> SelectQuery:
+    """Rewrite ``query`` to count the rows it matches, ignoring ORDER BY, LIMIT and OFFSET.
+
+    Plain queries become ``SELECT COUNT(*) FROM ... WHERE ...``. DISTINCT and GROUP BY change
+    what a row is, so those queries are counted through a derived table instead.
+    """
+    # A literal COUNT(*), not COUNT() and its bound 1: SQLite only uses its row-count fast path
+    # for a bare COUNT(*).
+    count = Function("COUNT", (Star(),)).AS("n")
+    base = replace(query, order_by=(), limit=None, offset=None, hydration=None)
+    if query.distinct:
+        return SELECT(count).FROM(base.AS("counted"))
+    if query.group_by:
+        grouped = replace(base, projections=(Literal(1),))
+        return SELECT(count).FROM(grouped.AS("counted"))
+    return replace(base, projections=(count,))
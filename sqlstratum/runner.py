@@ -1,155 +1,505 @@
 """SQLite execution runner."""
 from __future__ import annotations
 
-import logging
-import os
 import sqlite3
-import time
+import threading
 from contextlib import contextmanager
-from typing import Any, Dict, Optional
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
 
 from . import ast
+from .arrow import ArrowBatchBuilder, write_parquet
+from .cache import ResultCache, sqlite_database_id, table_written, tables_read
 from .compile import compile
-from .connection_url import parse_sqlite_url
+from .connection_options import SQLiteOptions, connect_sqlite, sqlite_options, sqlite_settings
+from .connection_url import split_sqlite_url
 from .dialect_binding import unwrap_query
-from .hydrate import hydrate_rows
+from .hooks import GLOBAL_HOOKS, Hooks, QueryEvent
+from .hydrate import get_hydrator
+from .hydrate.columnar import ColumnValues, build_columns
+from .loader import PrefetchPlan
+from .pagination import Page, build_page, prepare_page_query
+from .pool import ConnectionPool
+from .rewrite import count_query, exists_query, limit_one
+from .statements import StatementStats, StatementTracker
 
 
-_LOGGER = logging.getLogger("sqlstratum")
-_DEBUG_TRUE = {"1", "true", "yes"}
-_MAX_PARAM_REPR_LEN = 200
-_MAX_BLOB_PREVIEW = 64
+# Default sqlite3 statement cache for connections this module opens: sized like the hydrator cache,
+# since both hold one entry per distinct query shape.
+_STATEMENT_CACHE_SIZE = 512
 
 
-def _env_debug_enabled() -> bool:
-    value = os.getenv("SQLSTRATUM_DEBUG", "")
-    return value.lower() in _DEBUG_TRUE
+def _check_batch_size(batch_size: int) -> None:
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
 
 
-def _debug_enabled() -> bool:
-    return _env_debug_enabled() and _LOGGER.isEnabledFor(logging.DEBUG)
+def _new_tuple_cursor(connection: sqlite3.Connection) -> sqlite3.Cursor:
+    # Hydrators read rows by position, so skip the connection's sqlite3.Row factory.
+    cur = connection.cursor()
+    cur.row_factory = None
+    return cur
 
 
-def _truncate(value: str, limit: int) -> str:
-    if len(value) <= limit:
-        return value
-    return f"{value[:limit]}...<{len(value) - limit} more>"
+class _TxState:
+    def __init__(self) -> None:
+        # Writer pinned by transaction() and reader pinned by snapshot() on pooled runners.
+        self.connection: Optional[sqlite3.Connection] = None
+        self.snapshot: Optional[sqlite3.Connection] = None
+        self.depth = 0
+        self.written: Set[str] = set()
 
 
-def _safe_param_repr(value: Any) -> str:
-    if isinstance(value, (bytes, bytearray, memoryview)):
-        data = bytes(value)
-        preview = data[:_MAX_BLOB_PREVIEW]
-        rep = repr(preview)
-        if len(data) > _MAX_BLOB_PREVIEW:
-            rep = f"{rep}...<{len(data) - _MAX_BLOB_PREVIEW} more bytes>"
-        return rep
-    rep = repr(value)
-    return _truncate(rep, _MAX_PARAM_REPR_LEN)
+class _ThreadTxState(_TxState, threading.local):
+    pass
 
 
-def _render_params(params: Dict[str, Any]) -> str:
-    if not params:
-        return "{}"
-    items = ", ".join(f"{key}={_safe_param_repr(params[key])}" for key in sorted(params))
-    return "{" + items + "}"
+def _database_target(
+    path: Optional[str], url: Optional[str], options: Dict[str, Any]
+) -> Tuple[str, Optional[SQLiteOptions]]:
+    """Resolve the database path and the merged URL/keyword tuning options (``None`` if none)."""
+    if path and url:
+        raise ValueError("Provide either 'path' or 'url', not both")
+    if not path and not url:
+        raise ValueError("Provide one connection target: either 'path' or 'url'")
+    values: Dict[str, Any] = {}
+    if url:
+        path, values = split_sqlite_url(url)
+    values.update(options)
+    return path, (sqlite_options(values) if values else None)  # type: ignore[return-value]
 
 
-def _debug_log(compiled: ast.Compiled, duration_ms: float) -> None:
-    _LOGGER.debug(
-        "SQL: %s | params=%s | duration_ms=%.3f",
-        compiled.sql,
-        _render_params(compiled.params),
-        duration_ms,
+def _pool_options(path: str, options: Optional[SQLiteOptions]) -> SQLiteOptions:
+    if path == ":memory:":
+        raise ValueError("SQLite pools need a database file; ':memory:' is private to one connection")
+    options = options or SQLiteOptions()
+    if options.journal_mode not in (None, "wal"):
+        raise ValueError("SQLite pools always use journal_mode=wal")
+    if options.uses_uri:
+        raise ValueError("SQLite pools do not support the mode, immutable or cache options")
+    return replace(options, journal_mode="wal", cached_statements=_statement_cache_size(options))
+
+
+def _statement_cache_size(options: Optional[SQLiteOptions]) -> int:
+    if options is None or options.cached_statements is None:
+        return _STATEMENT_CACHE_SIZE
+    return options.cached_statements
+
+
+def _open_writer(path: str, timeout: float, options: SQLiteOptions) -> sqlite3.Connection:
+    connection = connect_sqlite(path, options, timeout=timeout, check_same_thread=False)
+    mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+    if str(mode).lower() != "wal":
+        connection.close()
+        raise ValueError(f"Could not enable WAL mode for {path!r} (journal_mode={mode})")
+    return connection
+
+
+def _open_reader(path: str, timeout: float, options: SQLiteOptions) -> sqlite3.Connection:
+    # Autocommit, so each statement reads the latest commit and snapshot() controls BEGIN itself.
+    return connect_sqlite(
+        str(Path(path).resolve()),
+        replace(options, journal_mode=None, mode="ro"),
+        timeout=timeout,
+        check_same_thread=False,
+        isolation_level=None,
     )
 
 
+def _database_id(connection: sqlite3.Connection) -> str:
+    rows = connection.execute("PRAGMA database_list").fetchall()
+    main = next((row[2] for row in rows if row[1] == "main"), "")
+    return sqlite_database_id(main)
+
+
 class SQLiteRunner:
-    def __init__(self, connection: sqlite3.Connection):
+    def __init__(
+        self,
+        connection: sqlite3.Connection,
+        *,
+        result_cache: Optional[ResultCache] = None,
+        readers: Optional[ConnectionPool] = None,
+        statement_cache_size: int = 128,
+    ):
+        """Wrap ``connection``; ``statement_cache_size`` is its ``cached_statements`` (hit accounting)."""
         self.connection = connection
         self.connection.row_factory = sqlite3.Row
-        self._tx_depth = 0
+        self.result_cache = result_cache
+        self._database_id: Optional[str] = None
+        if result_cache is not None:
+            self._database_id = _database_id(connection)
+        self._readers = readers
+        self._statements = StatementTracker(statement_cache_size)
+        self.hooks = Hooks(GLOBAL_HOOKS)
+        # Pooled runners are shared between threads: writes are serialized on the one writer
+        # connection and transaction state is per thread.
+        self._write_lock = threading.RLock()
+        self._tx = _ThreadTxState() if readers is not None else _TxState()
+
+    @property
+    def database_id(self) -> str:
+        """Keys result cache entries, so runners sharing a cache only share rows of one database."""
+        if self._database_id is None:
+            # A cache attached after construction: look the database up on first use.
+            with self._write_lock:
+                self._database_id = _database_id(self.connection)
+        return self._database_id
+
+    @classmethod
+    def connect(
+        cls,
+        path: Optional[str] = None,
+        *,
+        url: Optional[str] = None,
+        result_cache: Optional[ResultCache] = None,
+        **options: Any,
+    ) -> "SQLiteRunner":
+        """Open ``path`` (or a ``sqlite://`` URL) with optional tuning ``options``.
+
+        Options may also be given as URL query parameters; keyword options win. ``profile=``
+        selects a named base from ``SQLITE_PROFILES``.
+        """
+        db_path, sqlite_opts = _database_target(path, url, options)
+        cache_size = _statement_cache_size(sqlite_opts)
+        if sqlite_opts is None:
+            connection = sqlite3.connect(db_path, cached_statements=cache_size)
+        else:
+            connection = connect_sqlite(db_path, replace(sqlite_opts, cached_statements=cache_size))
+        return cls(connection, result_cache=result_cache, statement_cache_size=cache_size)
 
     @classmethod
-    def connect(cls, path: Optional[str] = None, *, url: Optional[str] = None) -> "SQLiteRunner":
-        if path and url:
-            raise ValueError("Provide either 'path' or 'url', not both")
-        if not path and not url:
-            raise ValueError("Provide one connection target: either 'path' or 'url'")
-        db_path = parse_sqlite_url(url) if url else path
-        return cls(sqlite3.connect(db_path))
+    def pool(
+        cls,
+        path: Optional[str] = None,
+        *,
+        url: Optional[str] = None,
+        readers: int = 4,
+        timeout: float = 30.0,
+        result_cache: Optional[ResultCache] = None,
+        **options: Any,
+    ) -> "SQLiteRunner":
+        """Return a thread-safe runner over a WAL database: one writer and ``readers`` readers.
+
+        SELECTs run on read-only reader connections; ``execute``, ``exec_ddl`` and everything
+        inside ``transaction()`` run on the writer, one thread at a time. ``timeout`` bounds both
+        the wait for a free reader and SQLite's busy wait for locks. Tuning ``options`` are
+        applied to every connection, as in ``connect()``.
+        """
+        db_path, sqlite_opts = _database_target(path, url, options)
+        pool_opts = _pool_options(db_path, sqlite_opts)
+        if readers < 1:
+            raise ValueError("readers must be a positive integer")
+        writer = _open_writer(db_path, timeout, pool_opts)
+        reader_pool = ConnectionPool(
+            lambda: _open_reader(db_path, timeout, pool_opts),
+            min_size=readers,
+            max_size=readers,
+            max_idle=None,
+            max_lifetime=None,
+            timeout=timeout,
+            ping=None,
+        )
+        return cls(
+            writer,
+            result_cache=result_cache,
+            readers=reader_pool,
+            statement_cache_size=_statement_cache_size(pool_opts),
+        )
+
+    @property
+    def connection_pool(self) -> Optional[ConnectionPool]:
+        """The reader pool of a runner built with ``pool()``, else ``None``."""
+        return self._readers
+
+    @property
+    def _tx_depth(self) -> int:
+        return self._tx.depth
+
+    @property
+    def _tx_written(self) -> Set[str]:
+        return self._tx.written
+
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        with self._write_lock:
+            yield self.connection
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        tx = self._tx
+        # Inside transaction() reads go to the writer so they see the uncommitted writes.
+        pinned = tx.connection or tx.snapshot
+        if pinned is not None:
+            yield pinned
+        elif self._readers is None:
+            yield self.connection
+        else:
+            with self._readers.connection() as connection:
+                yield connection
+
+    def _compile(self, query: Any, operation: str) -> Tuple[ast.Compiled, Optional[QueryEvent]]:
+        # The event is None while no hook is registered; call sites check it before reporting.
+        if not self.hooks.active:
+            return compile(query, dialect="sqlite"), None
+        event = self.hooks.event("sqlite", operation, query)
+        event.before_compile()
+        compiled = compile(query, dialect="sqlite")
+        event.after_compile(compiled)
+        return compiled, event
+
+    def _run(
+        self,
+        connection: sqlite3.Connection,
+        sql: str,
+        params: Any = (),
+        event: Optional[QueryEvent] = None,
+    ) -> sqlite3.Cursor:
+        # One reusable cursor per connection; executing on it also resets its previous statement.
+        cur = self._statements.cursor(connection, _new_tuple_cursor)
+        self._statements.record(connection, sql)
+        if event is None:
+            return cur.execute(sql, params)
+        event.before_execute()
+        cur.execute(sql, params)
+        event.after_execute(cur.rowcount)
+        return cur
+
+    def _first_row(self, connection: sqlite3.Connection, cur: sqlite3.Cursor) -> Optional[Any]:
+        row = cur.fetchone()
+        # An unfinished statement keeps its read lock (blocking writers and WAL checkpoints) until
+        # it is reset. Reaching the end resets it; otherwise close the cursor instead of reusing it.
+        if row is not None and cur.fetchone() is not None:
+            self._statements.discard(connection)
+        return row
+
+    def statement_stats(self) -> StatementStats:
+        """Cursor reuse and statement-cache hit counters for this runner."""
+        return self._statements.stats()
+
+    def settings(self) -> Dict[str, Any]:
+        """Report the effective tuning PRAGMAs (journal_mode, synchronous, cache_size, ...)."""
+        with self._writer() as conn:
+            return sqlite_settings(conn)
+
+    def close(self) -> None:
+        """Close the connection, and the reader pool of a runner built with ``pool()``."""
+        self._statements.clear()
+        if self._readers is not None:
+            self._readers.close()
+        self.connection.close()
 
     def exec_ddl(self, sql: str) -> None:
-        cur = self.connection.cursor()
-        cur.execute(sql)
-        if self._tx_depth == 0:
-            self.connection.commit()
+        with self._writer() as conn:
+            self._run(conn, sql)
+            if self._tx_depth == 0:
+                conn.commit()
+        if self.result_cache is not None:
+            self.result_cache.clear()
 
     def fetch_all(self, query: Any) -> list[Any]:
         unwrapped_query, _ = unwrap_query(query, "sqlite")
-        compiled = compile(unwrapped_query, dialect="sqlite")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        rows = cur.fetchall()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
-        return hydrate_rows(rows, unwrapped_query.projections, unwrapped_query.hydration or dict)
+        compiled, event = self._compile(unwrapped_query, "fetch_all")
+        # Reads inside a transaction may see uncommitted writes, so they bypass the cache.
+        cache_key = None
+        if self.result_cache is not None and self._tx_depth == 0:
+            cache_key = self.result_cache.key("sqlite", compiled, self.database_id)
+        cached = None if cache_key is None else self.result_cache.get(cache_key)
+        if cached is not None:
+            rows = cached.rows
+        else:
+            if cache_key is not None:
+                tables = tables_read(unwrapped_query)
+                generation = self.result_cache.generation(tables)
+            with self._reader() as conn:
+                rows = self._run(conn, compiled.sql, compiled.params, event).fetchall()
+            if event is not None:
+                event.after_fetch(len(rows))
+            if cache_key is not None:
+                self.result_cache.put(cache_key, rows, tables, generation=generation)
+        hydrator = get_hydrator(unwrapped_query.projections, unwrapped_query.hydration, by_index=True)
+        result = hydrator(rows)
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    def fetch_columns(self, query: Any) -> Dict[str, ColumnValues]:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "fetch_columns")
+        with self._reader() as conn:
+            rows = self._run(conn, compiled.sql, compiled.params, event).fetchall()
+        if event is not None:
+            event.after_fetch(len(rows))
+        columns = build_columns(rows, unwrapped_query.projections)
+        if event is not None:
+            event.after_hydrate()
+        return columns
+
+    def fetch_arrow(self, query: Any, *, batch_size: int = 65536) -> Any:
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "fetch_arrow")
+        builder = ArrowBatchBuilder(unwrapped_query.projections)
+        return builder.table(
+            builder.batch(rows) for rows in self._fetch_batches(compiled, batch_size, event)
+        )
+
+    def export_parquet(self, query: Any, path: Any, *, batch_size: int = 65536, **options: Any) -> int:
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "export_parquet")
+        builder = ArrowBatchBuilder(unwrapped_query.projections)
+        return write_parquet(
+            builder, self._fetch_batches(compiled, batch_size, event), path, **options
+        )
+
+    def _fetch_batches(
+        self, compiled: ast.Compiled, batch_size: int, event: Optional[QueryEvent]
+    ) -> Iterator[List[Any]]:
+        with self._reader() as conn:
+            # Batches interleave with other calls, so the stream gets a cursor of its own.
+            cur = _new_tuple_cursor(conn)
+            try:
+                if event is not None:
+                    event.before_execute()
+                cur.execute(compiled.sql, compiled.params)
+                if event is not None:
+                    event.after_execute(cur.rowcount)
+                while True:
+                    rows = cur.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield rows
+            finally:
+                cur.close()
 
     def fetch_one(self, query: Any) -> Optional[Any]:
         unwrapped_query, _ = unwrap_query(query, "sqlite")
-        compiled = compile(unwrapped_query, dialect="sqlite")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        row = cur.fetchone()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        unwrapped_query = limit_one(unwrapped_query)
+        compiled, event = self._compile(unwrapped_query, "fetch_one")
+        with self._reader() as conn:
+            row = self._first_row(conn, self._run(conn, compiled.sql, compiled.params, event))
+        if event is not None:
+            event.after_fetch(0 if row is None else 1)
         if row is None:
             return None
-        return hydrate_rows([row], unwrapped_query.projections, unwrapped_query.hydration or dict)[0]
+        hydrator = get_hydrator(unwrapped_query.projections, unwrapped_query.hydration, by_index=True)
+        result = hydrator([row])[0]
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    def prefetch(
+        self,
+        parents: Sequence[Any],
+        child_query: Any,
+        *,
+        parent_key: str,
+        child_fk: Any,
+        attach: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> Sequence[Any]:
+        """Attach the rows of ``child_query`` whose ``child_fk`` matches each parent's ``parent_key``.
+
+        Children are loaded with one ``IN`` query per ``chunk_size`` parent keys and attached under
+        ``attach`` (default: the child table name); ``parents`` is returned.
+        """
+        unwrapped_query, _ = unwrap_query(child_query, "sqlite")
+        plan = PrefetchPlan(
+            unwrapped_query, child_fk, parent_key=parent_key, attach=attach, chunk_size=chunk_size
+        )
+        for batch_query in plan.queries(parents):
+            plan.add_rows(self.fetch_all(batch_query))
+        return plan.attach_to(parents)
+
+    def paginate(self, query: Any, page_size: int, *, after: Optional[str] = None) -> Page:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        page_query = prepare_page_query(unwrapped_query, page_size, after)
+        rows = self.fetch_all(page_query)
+        return build_page(unwrapped_query, rows, page_size)
 
     def scalar(self, query: Any) -> Optional[Any]:
         unwrapped_query, _ = unwrap_query(query, "sqlite")
-        compiled = compile(unwrapped_query, dialect="sqlite")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        row = cur.fetchone()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        compiled, event = self._compile(unwrapped_query, "scalar")
+        with self._reader() as conn:
+            row = self._first_row(conn, self._run(conn, compiled.sql, compiled.params, event))
+        if event is not None:
+            event.after_fetch(0 if row is None else 1)
         if row is None:
             return None
         return row[0]
 
+    def exists(self, query: Any) -> bool:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        return bool(self.scalar(exists_query(unwrapped_query)))
+
+    def count(self, query: Any) -> int:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        return int(self.scalar(count_query(unwrapped_query)) or 0)
+
     def execute(self, query: Any) -> ast.ExecutionResult:
         unwrapped_query, _ = unwrap_query(query, "sqlite")
-        compiled = compile(unwrapped_query, dialect="sqlite")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        if self._tx_depth == 0:
-            self.connection.commit()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
-        return ast.ExecutionResult(rowcount=cur.rowcount, lastrowid=cur.lastrowid)
+        compiled, event = self._compile(unwrapped_query, "execute")
+        with self._writer() as conn:
+            cur = self._run(conn, compiled.sql, compiled.params, event)
+            # The cursor is shared, so read the result before another writer reuses it.
+            result = ast.ExecutionResult(rowcount=cur.rowcount, lastrowid=cur.lastrowid)
+            if self._tx_depth == 0:
+                conn.commit()
+        self._invalidate_written(unwrapped_query)
+        return result
+
+    def _invalidate_written(self, query: Any) -> None:
+        table = table_written(query)
+        if self.result_cache is None or table is None:
+            return
+        self.result_cache.invalidate((table,))
+        if self._tx_depth:
+            # Invalidated again at commit, in case another runner sharing the cache re-read the
+            # old rows in between.
+            self._tx_written.add(table)
 
     @contextmanager
     def transaction(self):
-        self._tx_depth += 1
-        try:
+        with self._writer() as conn:
+            tx = self._tx
+            tx.connection = conn if self._readers is not None else None
+            tx.depth += 1
+            try:
+                yield
+            except Exception:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                tx.depth -= 1
+                if tx.written and self.result_cache is not None:
+                    self.result_cache.invalidate(tx.written)
+                if tx.depth == 0:
+                    tx.written.clear()
+                    tx.connection = None
+
+    @contextmanager
+    def snapshot(self):
+        """Pin one reader to this thread inside ``BEGIN``: every read in the block sees one snapshot.
+
+        Only available on runners built with ``pool()``. Nested calls reuse the outer snapshot.
+        """
+        if self._readers is None:
+            raise ValueError("snapshot() requires a runner built with SQLiteRunner.pool()")
+        tx = self._tx
+        if tx.snapshot is not None:
             yield
-        except Exception:
-            self.connection.rollback()
-            raise
-        else:
-            self.connection.commit()
-        finally:
-            self._tx_depth -= 1
+            return
+        with self._readers.connection() as conn:
+            conn.execute("BEGIN")
+            tx.snapshot = conn
+            try:
+                yield
+            finally:
+                tx.snapshot = None
+                conn.execute("COMMIT")
 
 
 Runner = SQLiteRunner
@@ -1,24 +1,35 @@
 """MySQL synchronous execution runner (PyMySQL optional dependency)."""
 from __future__ import annotations
 
+import functools
 import importlib
-import logging
-import os
-import time
+import threading
 from contextlib import contextmanager
-from typing import Any, Dict, Mapping, Optional, Sequence
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Set, Tuple
 
 from . import ast
+from .arrow import ArrowBatchBuilder, write_parquet
+from .cache import (
+    ResultCache,
+    mysql_database_id,
+    private_database_id,
+    table_written,
+    tables_read,
+)
 from .compile import compile
-from .connection_url import parse_mysql_url
+from .connection_options import MySQLOptions, mysql_connect_kwargs
+from .connection_url import split_mysql_url
 from .dialect_binding import unwrap_query
-from .hydrate import hydrate_rows
+from .hooks import GLOBAL_HOOKS, Hooks, QueryEvent
+from .hydrate import HydrationError, RowsHydrator, get_hydrator, projection_keys
+from .hydrate.columnar import ColumnValues, build_columns
+from .loader import PrefetchPlan
+from .pagination import Page, build_page, prepare_page_query
+from .pool import ConnectionPool
+from .rewrite import count_query, exists_query, limit_one
+from .statements import StatementStats, StatementTracker
 
 
-_LOGGER = logging.getLogger("sqlstratum")
-_DEBUG_TRUE = {"1", "true", "yes"}
-_MAX_PARAM_REPR_LEN = 200
-_MAX_BLOB_PREVIEW = 64
 _INSTALL_MESSAGE = "Install with: pip install sqlstratum[pymysql]"
 
 
@@ -26,72 +37,123 @@ def _import_pymysql():
     return importlib.import_module("pymysql")
 
 
-def _env_debug_enabled() -> bool:
-    value = os.getenv("SQLSTRATUM_DEBUG", "")
-    return value.lower() in _DEBUG_TRUE
+def _result_columns(cursor: Any) -> Tuple[str, ...]:
+    return tuple(desc[0] for desc in cursor.description or ())
 
 
-def _debug_enabled() -> bool:
-    return _env_debug_enabled() and _LOGGER.isEnabledFor(logging.DEBUG)
+def _column_indexes(columns: Sequence[str], projections: Sequence[Any]) -> Tuple[int, ...]:
+    positions = {name: index for index, name in enumerate(columns)}
+    try:
+        return tuple(positions[key] for key in projection_keys(projections))
+    except KeyError as exc:
+        raise HydrationError(f"Result set has no column for projection key {exc.args[0]!r}") from exc
 
 
-def _truncate(value: str, limit: int) -> str:
-    if len(value) <= limit:
-        return value
-    return f"{value[:limit]}...<{len(value) - limit} more>"
+def _result_hydrator(columns: Sequence[str], query: ast.SelectQuery, first_row: Any) -> RowsHydrator:
+    # Resolved once per result: tuple rows are hydrated through a column-index map built from
+    # the cursor.description column names, so no intermediate mapping is created per row.
+    if isinstance(first_row, Mapping):
+        return get_hydrator(query.projections, query.hydration)
+    return get_hydrator(
+        query.projections, query.hydration, indexes=_column_indexes(columns, query.projections)
+    )
 
 
-def _safe_param_repr(value: Any) -> str:
-    if isinstance(value, (bytes, bytearray, memoryview)):
-        data = bytes(value)
-        preview = data[:_MAX_BLOB_PREVIEW]
-        rep = repr(preview)
-        if len(data) > _MAX_BLOB_PREVIEW:
-            rep = f"{rep}...<{len(data) - _MAX_BLOB_PREVIEW} more bytes>"
-        return rep
-    rep = repr(value)
-    return _truncate(rep, _MAX_PARAM_REPR_LEN)
+def _hydrate_result(columns: Sequence[str], rows: Sequence[Any], query: ast.SelectQuery) -> list[Any]:
+    if not rows:
+        return []
+    return _result_hydrator(columns, query, rows[0])(rows)
 
 
-def _render_params(params: Dict[str, Any]) -> str:
-    if not params:
-        return "{}"
-    items = ", ".join(f"{key}={_safe_param_repr(params[key])}" for key in sorted(params))
-    return "{" + items + "}"
+def _new_cursor(connection: Any) -> Any:
+    return connection.cursor()
 
 
-def _debug_log(compiled: ast.Compiled, duration_ms: float) -> None:
-    _LOGGER.debug(
-        "SQL: %s | params=%s | duration_ms=%.3f",
-        compiled.sql,
-        _render_params(compiled.params),
-        duration_ms,
-    )
+def _execute(cursor: Any, compiled: ast.Compiled, event: Optional[QueryEvent]) -> None:
+    if event is None:
+        cursor.execute(compiled.sql, compiled.params)
+        return
+    event.before_execute()
+    cursor.execute(compiled.sql, compiled.params)
+    event.after_execute(cursor.rowcount)
 
 
-def _normalize_rows(cursor: Any, rows: Sequence[Any]) -> list[Mapping[str, Any]]:
-    if not rows:
-        return []
-    first = rows[0]
-    if isinstance(first, Mapping):
-        return list(rows)  # type: ignore[return-value]
-    columns = [desc[0] for desc in (cursor.description or [])]
-    return [dict(zip(columns, row)) for row in rows]
+def _check_batch_size(batch_size: int) -> None:
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+
+def _iter_batches(cursor: Any, batch_size: int) -> Iterator[Sequence[Any]]:
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
 
 
-def _normalize_one_row(cursor: Any, row: Any) -> Optional[Mapping[str, Any]]:
-    if row is None:
-        return None
-    if isinstance(row, Mapping):
-        return row
-    columns = [desc[0] for desc in (cursor.description or [])]
-    return dict(zip(columns, row))
+class _TxState:
+    def __init__(self) -> None:
+        # Connection pinned by transaction() on pooled runners.
+        self.connection: Any = None
+        self.depth = 0
+        self.written: Set[str] = set()
+
+
+class _ThreadTxState(_TxState, threading.local):
+    pass
+
+
+def _connect_args(
+    url: Optional[str],
+    host: Optional[str],
+    user: Optional[str],
+    password: Optional[str],
+    database: Optional[str],
+    port: Optional[int],
+) -> Tuple[Dict[str, Any], Optional[MySQLOptions]]:
+    if url and any(v is not None for v in (host, user, password, database, port)):
+        raise ValueError("Provide either 'url' or individual connection parameters, not both")
+    if not url and any(v is None for v in (host, user, password, database)):
+        raise ValueError("Missing required connection parameters: host, user, password, database")
+    if url:
+        return split_mysql_url(url, async_mode=False)
+    args = {
+        "host": host,
+        "user": user,
+        "password": password,
+        "database": database,
+        "port": 3306 if port is None else port,
+    }
+    return args, None
+
+
+def _require_pymysql() -> Any:
+    try:
+        return _import_pymysql()
+    except Exception as exc:
+        raise RuntimeError(_INSTALL_MESSAGE) from exc
 
 
 class MySQLRunner:
-    def __init__(self, connection: Any):
+    def __init__(
+        self,
+        connection: Any = None,
+        *,
+        result_cache: Optional[ResultCache] = None,
+        pool: Optional[ConnectionPool] = None,
+        database_id: Optional[str] = None,
+    ):
+        if (connection is None) == (pool is None):
+            raise ValueError("Provide either a connection or a pool")
         self.connection = connection
-        self._tx_depth = 0
+        self.result_cache = result_cache
+        # Keys result cache entries, so runners sharing a cache only share rows of one database.
+        self.database_id = database_id or private_database_id("mysql")
+        self._pool = pool
+        self._statements = StatementTracker()
+        self.hooks = Hooks(GLOBAL_HOOKS)
+        # Pooled runners are shared between threads, so transaction state is per thread.
+        self._tx = _ThreadTxState() if pool is not None else _TxState()
 
     @classmethod
     def connect(
@@ -103,105 +165,320 @@ class MySQLRunner:
         password: Optional[str] = None,
         database: Optional[str] = None,
         port: Optional[int] = None,
+        result_cache: Optional[ResultCache] = None,
+        **kwargs: Any,
+    ) -> "MySQLRunner":
+        conn_args, url_options = _connect_args(url, host, user, password, database, port)
+        pymysql = _require_pymysql()
+        # Explicit keyword arguments win over URL options.
+        kwargs = {**mysql_connect_kwargs(url_options, pymysql, async_mode=False), **kwargs}
+        kwargs.setdefault("autocommit", False)
+        connection = pymysql.connect(**conn_args, **kwargs)
+        return cls(connection, result_cache=result_cache, database_id=mysql_database_id(conn_args))
+
+    @classmethod
+    def pool(
+        cls,
+        *,
+        url: Optional[str] = None,
+        host: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        database: Optional[str] = None,
+        port: Optional[int] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: Optional[float] = 300.0,
+        max_lifetime: Optional[float] = 3600.0,
+        timeout: Optional[float] = 30.0,
+        result_cache: Optional[ResultCache] = None,
         **kwargs: Any,
     ) -> "MySQLRunner":
-        if url and any(v is not None for v in (host, user, password, database, port)):
-            raise ValueError("Provide either 'url' or individual connection parameters, not both")
-        if not url and any(v is None for v in (host, user, password, database)):
-            raise ValueError("Missing required connection parameters: host, user, password, database")
-        if url:
-            conn_args = parse_mysql_url(url, async_mode=False)
+        """Return a thread-safe runner that borrows a pooled connection per call.
+
+        ``transaction()`` pins one connection to the calling thread until it exits.
+        """
+        conn_args, url_options = _connect_args(url, host, user, password, database, port)
+        pymysql = _require_pymysql()
+        # Explicit keyword arguments win over URL options.
+        kwargs = {**mysql_connect_kwargs(url_options, pymysql, async_mode=False), **kwargs}
+        kwargs.setdefault("autocommit", False)
+        connection_pool = ConnectionPool(
+            functools.partial(pymysql.connect, **conn_args, **kwargs),
+            min_size=min_size,
+            max_size=max_size,
+            max_idle=max_idle,
+            max_lifetime=max_lifetime,
+            timeout=timeout,
+        )
+        return cls(
+            pool=connection_pool, result_cache=result_cache, database_id=mysql_database_id(conn_args)
+        )
+
+    @property
+    def connection_pool(self) -> Optional[ConnectionPool]:
+        return self._pool
+
+    @property
+    def _tx_depth(self) -> int:
+        return self._tx.depth
+
+    @property
+    def _tx_written(self) -> Set[str]:
+        return self._tx.written
+
+    @contextmanager
+    def _checkout(self) -> Iterator[Any]:
+        pinned = self._tx.connection
+        if pinned is not None:
+            yield pinned
+        elif self._pool is None:
+            yield self.connection
         else:
-            conn_args = {
-                "host": host,
-                "user": user,
-                "password": password,
-                "database": database,
-                "port": 3306 if port is None else port,
-            }
+            with self._pool.connection() as connection:
+                yield connection
 
+    @contextmanager
+    def _cursor(self, connection: Any) -> Iterator[Any]:
+        # The dedicated connection keeps one reusable cursor. Pooled connections come and go, so
+        # their cursors are closed after each call instead of being cached.
+        if connection is self.connection:
+            yield self._statements.cursor(connection, _new_cursor)
+            return
+        cur = self._statements.cursor(connection, _new_cursor, reuse=False)
         try:
-            pymysql = _import_pymysql()
-        except Exception as exc:
-            raise RuntimeError(_INSTALL_MESSAGE) from exc
-
-        kwargs.setdefault("autocommit", False)
-        connection = pymysql.connect(**conn_args, **kwargs)
-        return cls(connection)
+            yield cur
+        finally:
+            cur.close()
+
+    def _compile(self, query: Any, operation: str) -> Tuple[ast.Compiled, Optional[QueryEvent]]:
+        # The event is None while no hook is registered; call sites check it before reporting.
+        if not self.hooks.active:
+            return compile(query, dialect="mysql"), None
+        event = self.hooks.event("mysql", operation, query)
+        event.before_compile()
+        compiled = compile(query, dialect="mysql")
+        event.after_compile(compiled)
+        return compiled, event
+
+    def statement_stats(self) -> StatementStats:
+        """Cursor reuse counters for this runner (PyMySQL has no client statement cache)."""
+        return self._statements.stats()
+
+    def close(self) -> None:
+        """Close the connection, or every pooled connection."""
+        self._statements.clear()
+        if self._pool is not None:
+            self._pool.close()
+        else:
+            self.connection.close()
 
     def exec_ddl(self, sql: str) -> None:
-        cur = self.connection.cursor()
-        cur.execute(sql)
-        if self._tx_depth == 0:
-            self.connection.commit()
+        with self._checkout() as conn, self._cursor(conn) as cur:
+            cur.execute(sql)
+            if self._tx_depth == 0:
+                conn.commit()
+        if self.result_cache is not None:
+            self.result_cache.clear()
 
     def fetch_all(self, query: Any) -> list[Any]:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        rows = _normalize_rows(cur, cur.fetchall())
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
-        return hydrate_rows(rows, unwrapped_query.projections, unwrapped_query.hydration or dict)
+        compiled, event = self._compile(unwrapped_query, "fetch_all")
+        # Reads inside a transaction may see uncommitted writes, so they bypass the cache.
+        cache_key = None
+        if self.result_cache is not None and self._tx_depth == 0:
+            cache_key = self.result_cache.key("mysql", compiled, self.database_id)
+        cached = None if cache_key is None else self.result_cache.get(cache_key)
+        if cached is not None:
+            columns, rows = cached.columns, cached.rows
+        else:
+            if cache_key is not None:
+                tables = tables_read(unwrapped_query)
+                generation = self.result_cache.generation(tables)
+            with self._checkout() as conn, self._cursor(conn) as cur:
+                _execute(cur, compiled, event)
+                rows = cur.fetchall()
+                columns = _result_columns(cur)
+            if event is not None:
+                event.after_fetch(len(rows))
+            if cache_key is not None:
+                self.result_cache.put(cache_key, rows, tables, columns, generation=generation)
+        result = _hydrate_result(columns, rows, unwrapped_query)
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    def fetch_columns(self, query: Any) -> Dict[str, ColumnValues]:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "fetch_columns")
+        with self._checkout() as conn, self._cursor(conn) as cur:
+            _execute(cur, compiled, event)
+            rows = cur.fetchall()
+        if event is not None:
+            event.after_fetch(len(rows))
+        columns = build_columns(rows, unwrapped_query.projections)
+        if event is not None:
+            event.after_hydrate()
+        return columns
+
+    def stream(self, query: Any, *, batch_size: int = 1000) -> Iterator[Any]:
+        """Yield hydrated rows from an unbuffered (server-side) cursor, batch by batch."""
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "stream")
+        return self._stream(unwrapped_query, compiled, batch_size, event)
+
+    def _stream(
+        self,
+        query: ast.SelectQuery,
+        compiled: ast.Compiled,
+        batch_size: int,
+        event: Optional[QueryEvent],
+    ) -> Iterator[Any]:
+        with self._open_stream(compiled, event) as cur:
+            hydrator = None
+            for rows in _iter_batches(cur, batch_size):
+                if hydrator is None:
+                    hydrator = _result_hydrator(_result_columns(cur), query, rows[0])
+                yield from hydrator(rows)
+
+    @contextmanager
+    def _open_stream(self, compiled: ast.Compiled, event: Optional[QueryEvent]) -> Iterator[Any]:
+        # The connection stays checked out (and busy) until the unbuffered cursor is closed.
+        pymysql = _require_pymysql()
+        with self._checkout() as conn:
+            cur = conn.cursor(pymysql.cursors.SSCursor)
+            try:
+                _execute(cur, compiled, event)
+                yield cur
+            finally:
+                cur.close()
+
+    def fetch_arrow(self, query: Any, *, batch_size: int = 65536) -> Any:
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "fetch_arrow")
+        builder = ArrowBatchBuilder(unwrapped_query.projections)
+        with self._open_stream(compiled, event) as cur:
+            return builder.table(builder.batch(rows) for rows in _iter_batches(cur, batch_size))
+
+    def export_parquet(self, query: Any, path: Any, *, batch_size: int = 65536, **options: Any) -> int:
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "export_parquet")
+        builder = ArrowBatchBuilder(unwrapped_query.projections)
+        with self._open_stream(compiled, event) as cur:
+            return write_parquet(builder, _iter_batches(cur, batch_size), path, **options)
 
     def fetch_one(self, query: Any) -> Optional[Any]:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        row = _normalize_one_row(cur, cur.fetchone())
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        unwrapped_query = limit_one(unwrapped_query)
+        compiled, event = self._compile(unwrapped_query, "fetch_one")
+        with self._checkout() as conn, self._cursor(conn) as cur:
+            _execute(cur, compiled, event)
+            row = cur.fetchone()
+            columns = _result_columns(cur)
+        if event is not None:
+            event.after_fetch(0 if row is None else 1)
         if row is None:
             return None
-        return hydrate_rows([row], unwrapped_query.projections, unwrapped_query.hydration or dict)[0]
+        result = _hydrate_result(columns, [row], unwrapped_query)[0]
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    def prefetch(
+        self,
+        parents: Sequence[Any],
+        child_query: Any,
+        *,
+        parent_key: str,
+        child_fk: Any,
+        attach: Optional[str] = None,
+        chunk_size: int = 500,
+    ) -> Sequence[Any]:
+        """Attach the rows of ``child_query`` whose ``child_fk`` matches each parent's ``parent_key``.
+
+        Children are loaded with one ``IN`` query per ``chunk_size`` parent keys and attached under
+        ``attach`` (default: the child table name); ``parents`` is returned.
+        """
+        unwrapped_query, _ = unwrap_query(child_query, "mysql")
+        plan = PrefetchPlan(
+            unwrapped_query, child_fk, parent_key=parent_key, attach=attach, chunk_size=chunk_size
+        )
+        for batch_query in plan.queries(parents):
+            plan.add_rows(self.fetch_all(batch_query))
+        return plan.attach_to(parents)
+
+    def paginate(self, query: Any, page_size: int, *, after: Optional[str] = None) -> Page:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        page_query = prepare_page_query(unwrapped_query, page_size, after)
+        rows = self.fetch_all(page_query)
+        return build_page(unwrapped_query, rows, page_size)
 
     def scalar(self, query: Any) -> Optional[Any]:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        row = cur.fetchone()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        compiled, event = self._compile(unwrapped_query, "scalar")
+        with self._checkout() as conn, self._cursor(conn) as cur:
+            _execute(cur, compiled, event)
+            row = cur.fetchone()
+        if event is not None:
+            event.after_fetch(0 if row is None else 1)
         if row is None:
             return None
         if isinstance(row, Mapping):
             return next(iter(row.values()), None)
         return row[0]
 
+    def exists(self, query: Any) -> bool:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        return bool(self.scalar(exists_query(unwrapped_query)))
+
+    def count(self, query: Any) -> int:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        return int(self.scalar(count_query(unwrapped_query)) or 0)
+
     def execute(self, query: Any) -> ast.ExecutionResult:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        cur = self.connection.cursor()
-        cur.execute(compiled.sql, compiled.params)
-        if self._tx_depth == 0:
-            self.connection.commit()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
-        return ast.ExecutionResult(
-            rowcount=cur.rowcount,
-            lastrowid=getattr(cur, "lastrowid", None),
-        )
+        compiled, event = self._compile(unwrapped_query, "execute")
+        with self._checkout() as conn, self._cursor(conn) as cur:
+            _execute(cur, compiled, event)
+            result = ast.ExecutionResult(
+                rowcount=cur.rowcount,
+                lastrowid=getattr(cur, "lastrowid", None),
+            )
+            if self._tx_depth == 0:
+                conn.commit()
+        self._invalidate_written(unwrapped_query)
+        return result
+
+    def _invalidate_written(self, query: Any) -> None:
+        table = table_written(query)
+        if self.result_cache is None or table is None:
+            return
+        self.result_cache.invalidate((table,))
+        if self._tx_depth:
+            # Invalidated again at commit, in case another runner sharing the cache re-read the
+            # old rows in between.
+            self._tx_written.add(table)
 
     @contextmanager
     def transaction(self):
-        self._tx_depth += 1
-        try:
-            yield
-        except Exception:
-            self.connection.rollback()
-            raise
-        else:
-            self.connection.commit()
-        finally:
-            self._tx_depth -= 1
+        with self._checkout() as conn:
+            tx = self._tx
+            tx.connection = conn if self._pool is not None else None
+            tx.depth += 1
+            try:
+                yield
+            except Exception:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+            finally:
+                tx.depth -= 1
+                if tx.written and self.result_cache is not None:
+                    self.result_cache.invalidate(tx.written)
+                if tx.depth == 0:
+                    tx.written.clear()
+                    tx.connection = None
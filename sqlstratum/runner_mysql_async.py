@@ -1,24 +1,49 @@
 """MySQL asynchronous execution runner (asyncmy optional dependency)."""
 from __future__ import annotations
 
+import asyncio
+import functools
 import importlib
-import logging
-import os
+import inspect
 import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Mapping, Optional, Sequence
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 from . import ast
+from .arrow import ArrowBatchBuilder, ParquetBatchWriter
+from .cache import (
+    ResultCache,
+    mysql_database_id,
+    private_database_id,
+    table_written,
+    tables_read,
+)
 from .compile import compile
-from .connection_url import parse_mysql_url
+from .connection_options import MySQLOptions, mysql_connect_kwargs
+from .connection_url import split_mysql_url
 from .dialect_binding import unwrap_query
-from .hydrate import hydrate_rows
+from .hooks import GLOBAL_HOOKS, Hooks, QueryEvent
+from .hydrate import HydrationError, RowsHydrator, get_hydrator, projection_keys
+from .hydrate.columnar import ColumnValues, build_columns
+from .loader import AsyncLoader
+from .pagination import Page, build_page, prepare_page_query
+from .pool import AsyncConnectionPool, _default_async_ping
+from .rewrite import count_query, exists_query, limit_one
 
 
-_LOGGER = logging.getLogger("sqlstratum")
-_DEBUG_TRUE = {"1", "true", "yes"}
-_MAX_PARAM_REPR_LEN = 200
-_MAX_BLOB_PREVIEW = 64
 _INSTALL_MESSAGE = "Install with: pip install sqlstratum[asyncmy]"
 
 
@@ -26,72 +51,153 @@ def _import_asyncmy():
     return importlib.import_module("asyncmy")
 
 
-def _env_debug_enabled() -> bool:
-    value = os.getenv("SQLSTRATUM_DEBUG", "")
-    return value.lower() in _DEBUG_TRUE
+def _result_columns(cursor: Any) -> Tuple[str, ...]:
+    return tuple(desc[0] for desc in cursor.description or ())
 
 
-def _debug_enabled() -> bool:
-    return _env_debug_enabled() and _LOGGER.isEnabledFor(logging.DEBUG)
+def _column_indexes(columns: Sequence[str], projections: Sequence[Any]) -> Tuple[int, ...]:
+    positions = {name: index for index, name in enumerate(columns)}
+    try:
+        return tuple(positions[key] for key in projection_keys(projections))
+    except KeyError as exc:
+        raise HydrationError(f"Result set has no column for projection key {exc.args[0]!r}") from exc
 
 
-def _truncate(value: str, limit: int) -> str:
-    if len(value) <= limit:
-        return value
-    return f"{value[:limit]}...<{len(value) - limit} more>"
-
-
-def _safe_param_repr(value: Any) -> str:
-    if isinstance(value, (bytes, bytearray, memoryview)):
-        data = bytes(value)
-        preview = data[:_MAX_BLOB_PREVIEW]
-        rep = repr(preview)
-        if len(data) > _MAX_BLOB_PREVIEW:
-            rep = f"{rep}...<{len(data) - _MAX_BLOB_PREVIEW} more bytes>"
-        return rep
-    rep = repr(value)
-    return _truncate(rep, _MAX_PARAM_REPR_LEN)
-
-
-def _render_params(params: Dict[str, Any]) -> str:
-    if not params:
-        return "{}"
-    items = ", ".join(f"{key}={_safe_param_repr(params[key])}" for key in sorted(params))
-    return "{" + items + "}"
-
-
-def _debug_log(compiled: ast.Compiled, duration_ms: float) -> None:
-    _LOGGER.debug(
-        "SQL: %s | params=%s | duration_ms=%.3f",
-        compiled.sql,
-        _render_params(compiled.params),
-        duration_ms,
+def _result_hydrator(columns: Sequence[str], query: ast.SelectQuery, first_row: Any) -> RowsHydrator:
+    # Resolved once per result: tuple rows are hydrated through a column-index map built from
+    # the cursor.description column names, so no intermediate mapping is created per row.
+    if isinstance(first_row, Mapping):
+        return get_hydrator(query.projections, query.hydration)
+    return get_hydrator(
+        query.projections, query.hydration, indexes=_column_indexes(columns, query.projections)
     )
 
 
-def _normalize_rows(cursor: Any, rows: Sequence[Any]) -> list[Mapping[str, Any]]:
+def _hydrate_result(columns: Sequence[str], rows: Sequence[Any], query: ast.SelectQuery) -> list[Any]:
     if not rows:
         return []
-    first = rows[0]
-    if isinstance(first, Mapping):
-        return list(rows)  # type: ignore[return-value]
-    columns = [desc[0] for desc in (cursor.description or [])]
-    return [dict(zip(columns, row)) for row in rows]
-
-
-def _normalize_one_row(cursor: Any, row: Any) -> Optional[Mapping[str, Any]]:
-    if row is None:
-        return None
-    if isinstance(row, Mapping):
-        return row
-    columns = [desc[0] for desc in (cursor.description or [])]
-    return dict(zip(columns, row))
+    return _result_hydrator(columns, query, rows[0])(rows)
+
+
+async def _execute(cursor: Any, compiled: ast.Compiled, event: Optional[QueryEvent]) -> None:
+    if event is None:
+        await cursor.execute(compiled.sql, compiled.params)
+        return
+    event.before_execute()
+    await cursor.execute(compiled.sql, compiled.params)
+    event.after_execute(cursor.rowcount)
+
+
+def _check_batch_size(batch_size: int) -> None:
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+
+
+async def _iter_batches(cursor: Any, batch_size: int) -> AsyncIterator[Sequence[Any]]:
+    while True:
+        rows = await cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+        # Hand control back to the event loop between batches.
+        await asyncio.sleep(0)
+
+
+async def _close_connection(connection: Any) -> None:
+    # asyncmy's close() is synchronous; ensure_closed() is the awaitable variant.
+    closer = getattr(connection, "ensure_closed", None) or getattr(connection, "close", None)
+    if closer is None:
+        return
+    result = closer()
+    if inspect.isawaitable(result):
+        await result
+
+
+async def _close_quietly(connection: Any) -> None:
+    try:
+        await _close_connection(connection)
+    except Exception:
+        pass
+
+
+async def _alive(connection: Any) -> bool:
+    try:
+        await _default_async_ping(connection)
+        return True
+    except Exception:
+        return False
+
+
+# Spares idle longer than this are closed instead of reused, like AsyncConnectionPool's max_idle.
+_SPARE_MAX_IDLE = 300.0
+
+
+class _TxState:
+    def __init__(self) -> None:
+        # Connection pinned by transaction() on pooled runners.
+        self.connection: Any = None
+        self.depth = 0
+        self.written: Set[str] = set()
+
+
+def _connect_args(
+    url: Optional[str],
+    host: Optional[str],
+    user: Optional[str],
+    password: Optional[str],
+    database: Optional[str],
+    port: Optional[int],
+) -> Tuple[Dict[str, Any], Optional[MySQLOptions]]:
+    if url and any(v is not None for v in (host, user, password, database, port)):
+        raise ValueError("Provide either 'url' or individual connection parameters, not both")
+    if not url and any(v is None for v in (host, user, password, database)):
+        raise ValueError("Missing required connection parameters: host, user, password, database")
+    if url:
+        return split_mysql_url(url, async_mode=True)
+    args = {
+        "host": host,
+        "user": user,
+        "password": password,
+        "database": database,
+        "port": 3306 if port is None else port,
+    }
+    return args, None
+
+
+def _require_asyncmy() -> Any:
+    try:
+        return _import_asyncmy()
+    except Exception as exc:
+        raise RuntimeError(_INSTALL_MESSAGE) from exc
 
 
 class AsyncMySQLRunner:
-    def __init__(self, connection: Any):
+    def __init__(
+        self,
+        connection: Any = None,
+        *,
+        result_cache: Optional[ResultCache] = None,
+        connection_factory: Optional[Callable[[], Awaitable[Any]]] = None,
+        pool: Optional[AsyncConnectionPool] = None,
+        database_id: Optional[str] = None,
+    ):
+        if (connection is None) == (pool is None):
+            raise ValueError("Provide either a connection or a pool")
         self.connection = connection
-        self._tx_depth = 0
+        self.result_cache = result_cache
+        # Keys result cache entries, so runners sharing a cache only share rows of one database.
+        self.database_id = database_id or private_database_id("mysql")
+        self.hooks = Hooks(GLOBAL_HOOKS)
+        # Opens extra connections for gather(); set by connect().
+        self.connection_factory = connection_factory
+        # (connection, returned_at) pairs kept by gather() for later calls.
+        self._spare_connections: List[Tuple[Any, float]] = []
+        self._pool = pool
+        self._tx = _TxState()
+        # Pooled runners are shared between tasks, so transaction state follows the task context.
+        self._tx_var: ContextVar[Optional[_TxState]] = ContextVar(
+            f"sqlstratum_tx_{id(self)}", default=None
+        )
 
     @classmethod
     async def connect(
@@ -103,104 +209,414 @@ class AsyncMySQLRunner:
         password: Optional[str] = None,
         database: Optional[str] = None,
         port: Optional[int] = None,
+        result_cache: Optional[ResultCache] = None,
         **kwargs: Any,
     ) -> "AsyncMySQLRunner":
-        if url and any(v is not None for v in (host, user, password, database, port)):
-            raise ValueError("Provide either 'url' or individual connection parameters, not both")
-        if not url and any(v is None for v in (host, user, password, database)):
-            raise ValueError("Missing required connection parameters: host, user, password, database")
-        if url:
-            conn_args = parse_mysql_url(url, async_mode=True)
-        else:
-            conn_args = {
-                "host": host,
-                "user": user,
-                "password": password,
-                "database": database,
-                "port": 3306 if port is None else port,
-            }
-
-        try:
-            asyncmy = _import_asyncmy()
-        except Exception as exc:
-            raise RuntimeError(_INSTALL_MESSAGE) from exc
-
+        conn_args, url_options = _connect_args(url, host, user, password, database, port)
+        asyncmy = _require_asyncmy()
+        # Explicit keyword arguments win over URL options.
+        kwargs = {**mysql_connect_kwargs(url_options, asyncmy, async_mode=True), **kwargs}
         kwargs.setdefault("autocommit", False)
         connection = await asyncmy.connect(**conn_args, **kwargs)
-        return cls(connection)
+        return cls(
+            connection,
+            result_cache=result_cache,
+            connection_factory=functools.partial(asyncmy.connect, **conn_args, **kwargs),
+            database_id=mysql_database_id(conn_args),
+        )
+
+    @classmethod
+    async def create_pool(
+        cls,
+        *,
+        url: Optional[str] = None,
+        host: Optional[str] = None,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        database: Optional[str] = None,
+        port: Optional[int] = None,
+        min_size: int = 1,
+        max_size: int = 10,
+        max_idle: Optional[float] = 300.0,
+        max_lifetime: Optional[float] = 3600.0,
+        timeout: Optional[float] = 30.0,
+        result_cache: Optional[ResultCache] = None,
+        **kwargs: Any,
+    ) -> "AsyncMySQLRunner":
+        """Return a runner that borrows a pooled connection per call.
+
+        ``transaction()`` pins one connection to the current task until it exits.
+        """
+        conn_args, url_options = _connect_args(url, host, user, password, database, port)
+        asyncmy = _require_asyncmy()
+        # Explicit keyword arguments win over URL options.
+        kwargs = {**mysql_connect_kwargs(url_options, asyncmy, async_mode=True), **kwargs}
+        kwargs.setdefault("autocommit", False)
+        connection_pool = AsyncConnectionPool(
+            functools.partial(asyncmy.connect, **conn_args, **kwargs),
+            min_size=min_size,
+            max_size=max_size,
+            max_idle=max_idle,
+            max_lifetime=max_lifetime,
+            timeout=timeout,
+        )
+        await connection_pool.open()
+        return cls(
+            pool=connection_pool, result_cache=result_cache, database_id=mysql_database_id(conn_args)
+        )
+
+    @property
+    def connection_pool(self) -> Optional[AsyncConnectionPool]:
+        return self._pool
+
+    def _current_tx(self) -> _TxState:
+        if self._pool is None:
+            return self._tx
+        return self._tx_var.get() or _TxState()
+
+    @property
+    def _tx_depth(self) -> int:
+        return self._current_tx().depth
+
+    @property
+    def _tx_written(self) -> Set[str]:
+        return self._current_tx().written
+
+    @asynccontextmanager
+    async def _checkout(self) -> AsyncIterator[Any]:
+        pinned = self._current_tx().connection
+        if pinned is not None:
+            yield pinned
+        elif self._pool is None:
+            yield self.connection
+        else:
+            async with self._pool.acquire() as connection:
+                yield connection
+
+    def _compile(self, query: Any, operation: str) -> Tuple[ast.Compiled, Optional[QueryEvent]]:
+        # The event is None while no hook is registered; call sites check it before reporting.
+        if not self.hooks.active:
+            return compile(query, dialect="mysql"), None
+        event = self.hooks.event("mysql", operation, query)
+        event.before_compile()
+        compiled = compile(query, dialect="mysql")
+        event.after_compile(compiled)
+        return compiled, event
 
     async def exec_ddl(self, sql: str) -> None:
-        async with self.connection.cursor() as cur:
-            await cur.execute(sql)
-        if self._tx_depth == 0:
-            await self.connection.commit()
+        async with self._checkout() as conn:
+            async with conn.cursor() as cur:
+                await cur.execute(sql)
+            if self._tx_depth == 0:
+                await conn.commit()
+        if self.result_cache is not None:
+            self.result_cache.clear()
 
     async def fetch_all(self, query: Any) -> list[Any]:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        async with self.connection.cursor() as cur:
-            await cur.execute(compiled.sql, compiled.params)
-            rows = _normalize_rows(cur, await cur.fetchall())
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
-        return hydrate_rows(rows, unwrapped_query.projections, unwrapped_query.hydration or dict)
+        compiled, event = self._compile(unwrapped_query, "fetch_all")
+        # Reads inside a transaction may see uncommitted writes, so they bypass the cache.
+        cache_key = None
+        if self.result_cache is not None and self._tx_depth == 0:
+            cache_key = self.result_cache.key("mysql", compiled, self.database_id)
+        cached = None if cache_key is None else self.result_cache.get(cache_key)
+        if cached is not None:
+            columns, rows = cached.columns, cached.rows
+        else:
+            if cache_key is not None:
+                tables = tables_read(unwrapped_query)
+                generation = self.result_cache.generation(tables)
+            async with self._checkout() as conn:
+                async with conn.cursor() as cur:
+                    await _execute(cur, compiled, event)
+                    rows = await cur.fetchall()
+                    columns = _result_columns(cur)
+            if event is not None:
+                event.after_fetch(len(rows))
+            if cache_key is not None:
+                self.result_cache.put(cache_key, rows, tables, columns, generation=generation)
+        result = _hydrate_result(columns, rows, unwrapped_query)
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    async def gather(self, *queries: Any, concurrency: int = 4) -> List[List[Any]]:
+        """Run independent SELECTs concurrently and return their hydrated rows in input order.
+
+        Up to ``concurrency`` connections are used: borrowed from the pool for pooled runners,
+        otherwise spares opened through ``connection_factory``. This runner's own connection is
+        left alone, so a failed gather never cancels a query on it. Spares are rolled back and kept
+        for later calls, pinged before reuse and closed after a failure or when idle too long.
+        Without a pool or factory, or inside a transaction, the queries run one after another.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer")
+        workers = min(concurrency, len(queries))
+        if workers < 2 or self._tx_depth:
+            return [await self.fetch_all(query) for query in queries]
+        if self._pool is not None:
+            limit = asyncio.Semaphore(workers)
+
+            async def fetch(query: Any) -> List[Any]:
+                async with limit:
+                    return await self.fetch_all(query)
+
+            fetches = [asyncio.ensure_future(fetch(query)) for query in queries]
+            try:
+                return list(await asyncio.gather(*fetches))
+            except BaseException:
+                # Stop the other fetches so their connections go back to the pool.
+                for task in fetches:
+                    task.cancel()
+                await asyncio.gather(*fetches, return_exceptions=True)
+                raise
+        if self.connection_factory is None:
+            return [await self.fetch_all(query) for query in queries]
+
+        results: List[List[Any]] = [[] for _ in queries]
+        pending = iter(enumerate(queries))
+
+        async def work(runner: "AsyncMySQLRunner") -> None:
+            # Workers share one iterator, so each takes the next query as soon as it is free.
+            for index, query in pending:
+                results[index] = await runner.fetch_all(query)
+
+        spares = await self._checkout_spares(self.connection_factory, workers)
+        runners = []
+        for conn in spares:
+            runner = AsyncMySQLRunner(conn, result_cache=self.result_cache, database_id=self.database_id)
+            runner.hooks = self.hooks
+            runners.append(runner)
+        tasks = [asyncio.ensure_future(work(runner)) for runner in runners]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            # A connection interrupted mid-query is not safe to reuse.
+            for conn in spares:
+                await _close_quietly(conn)
+            raise
+        await self._return_spares(spares, rollback=True)
+        return results
+
+    async def _checkout_spares(self, factory: Callable[[], Awaitable[Any]], count: int) -> List[Any]:
+        spares: List[Any] = []
+        now = time.monotonic()
+        while self._spare_connections and len(spares) < count:
+            conn, returned_at = self._spare_connections.pop()
+            if now - returned_at <= _SPARE_MAX_IDLE and await _alive(conn):
+                spares.append(conn)
+            else:
+                await _close_quietly(conn)
+        opened = await asyncio.gather(
+            *(factory() for _ in range(count - len(spares))), return_exceptions=True
+        )
+        errors = [conn for conn in opened if isinstance(conn, BaseException)]
+        spares.extend(conn for conn in opened if not isinstance(conn, BaseException))
+        if errors:
+            await self._return_spares(spares, rollback=False)
+            raise errors[0]
+        return spares
+
+    async def _return_spares(self, spares: List[Any], *, rollback: bool) -> None:
+        for conn in spares:
+            if rollback:
+                try:
+                    # End the read snapshot the SELECTs opened, as pools do on return.
+                    await conn.rollback()
+                except Exception:
+                    await _close_quietly(conn)
+                    continue
+            self._spare_connections.append((conn, time.monotonic()))
+
+    async def close(self) -> None:
+        """Close this runner's connection (or pool) and any spares opened by ``gather()``."""
+        if self._pool is not None:
+            await self._pool.close()
+            return
+        spares, self._spare_connections = self._spare_connections, []
+        for conn, _ in spares:
+            await _close_quietly(conn)
+        await _close_connection(self.connection)
+
+    async def fetch_columns(self, query: Any) -> Dict[str, ColumnValues]:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "fetch_columns")
+        async with self._checkout() as conn:
+            async with conn.cursor() as cur:
+                await _execute(cur, compiled, event)
+                rows = await cur.fetchall()
+        if event is not None:
+            event.after_fetch(len(rows))
+        columns = build_columns(rows, unwrapped_query.projections)
+        if event is not None:
+            event.after_hydrate()
+        return columns
+
+    def stream(self, query: Any, *, batch_size: int = 1000) -> AsyncIterator[Any]:
+        """Asynchronously yield hydrated rows from an unbuffered cursor, batch by batch."""
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "stream")
+        return self._stream(unwrapped_query, compiled, batch_size, event)
+
+    async def _stream(
+        self,
+        query: ast.SelectQuery,
+        compiled: ast.Compiled,
+        batch_size: int,
+        event: Optional[QueryEvent],
+    ) -> AsyncIterator[Any]:
+        async with self._open_stream(compiled, event) as cur:
+            hydrator = None
+            async for rows in _iter_batches(cur, batch_size):
+                if hydrator is None:
+                    hydrator = _result_hydrator(_result_columns(cur), query, rows[0])
+                for row in hydrator(rows):
+                    yield row
+
+    @asynccontextmanager
+    async def _open_stream(
+        self, compiled: ast.Compiled, event: Optional[QueryEvent]
+    ) -> AsyncIterator[Any]:
+        # The connection stays checked out (and busy) until the unbuffered cursor is closed.
+        asyncmy = _require_asyncmy()
+        async with self._checkout() as conn:
+            cur = conn.cursor(asyncmy.cursors.SSCursor)
+            try:
+                await _execute(cur, compiled, event)
+                yield cur
+            finally:
+                await cur.close()
+
+    async def fetch_arrow(self, query: Any, *, batch_size: int = 65536) -> Any:
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "fetch_arrow")
+        builder = ArrowBatchBuilder(unwrapped_query.projections)
+        async with self._open_stream(compiled, event) as cur:
+            batches = [builder.batch(rows) async for rows in _iter_batches(cur, batch_size)]
+        return builder.table(batches)
+
+    async def export_parquet(
+        self, query: Any, path: Any, *, batch_size: int = 65536, **options: Any
+    ) -> int:
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        compiled, event = self._compile(unwrapped_query, "export_parquet")
+        sink = ParquetBatchWriter(ArrowBatchBuilder(unwrapped_query.projections), path, **options)
+        async with self._open_stream(compiled, event) as cur:
+            try:
+                async for rows in _iter_batches(cur, batch_size):
+                    sink.write(rows)
+                return sink.finish()
+            finally:
+                sink.close()
 
     async def fetch_one(self, query: Any) -> Optional[Any]:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        async with self.connection.cursor() as cur:
-            await cur.execute(compiled.sql, compiled.params)
-            row = _normalize_one_row(cur, await cur.fetchone())
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        unwrapped_query = limit_one(unwrapped_query)
+        compiled, event = self._compile(unwrapped_query, "fetch_one")
+        async with self._checkout() as conn:
+            async with conn.cursor() as cur:
+                await _execute(cur, compiled, event)
+                row = await cur.fetchone()
+                # Read while the cursor is open; a closed cursor has no result description.
+                columns = _result_columns(cur)
+        if event is not None:
+            event.after_fetch(0 if row is None else 1)
         if row is None:
             return None
-        return hydrate_rows([row], unwrapped_query.projections, unwrapped_query.hydration or dict)[0]
+        result = _hydrate_result(columns, [row], unwrapped_query)[0]
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    async def paginate(self, query: Any, page_size: int, *, after: Optional[str] = None) -> Page:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        page_query = prepare_page_query(unwrapped_query, page_size, after)
+        rows = await self.fetch_all(page_query)
+        return build_page(unwrapped_query, rows, page_size)
 
     async def scalar(self, query: Any) -> Optional[Any]:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        async with self.connection.cursor() as cur:
-            await cur.execute(compiled.sql, compiled.params)
-            row = await cur.fetchone()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        compiled, event = self._compile(unwrapped_query, "scalar")
+        async with self._checkout() as conn:
+            async with conn.cursor() as cur:
+                await _execute(cur, compiled, event)
+                row = await cur.fetchone()
+        if event is not None:
+            event.after_fetch(0 if row is None else 1)
         if row is None:
             return None
         if isinstance(row, Mapping):
             return next(iter(row.values()), None)
         return row[0]
 
+    async def exists(self, query: Any) -> bool:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        return bool(await self.scalar(exists_query(unwrapped_query)))
+
+    async def count(self, query: Any) -> int:
+        unwrapped_query, _ = unwrap_query(query, "mysql")
+        return int(await self.scalar(count_query(unwrapped_query)) or 0)
+
+    def loader(self, key_column: Any, base_query: Any, *, max_batch_size: int = 1000) -> AsyncLoader:
+        """Return a loader that coalesces concurrent ``key_column == key`` lookups.
+
+        Keys requested within one event-loop tick are fetched with a single
+        ``base_query.WHERE(key_column.in_(keys))``; create one loader per request.
+        """
+        unwrapped_query, _ = unwrap_query(base_query, "mysql")
+        return AsyncLoader(self, key_column, unwrapped_query, max_batch_size=max_batch_size)
+
     async def execute(self, query: Any) -> ast.ExecutionResult:
         unwrapped_query, _ = unwrap_query(query, "mysql")
-        compiled = compile(unwrapped_query, dialect="mysql")
-        log_enabled = _debug_enabled()
-        start = time.perf_counter() if log_enabled else 0.0
-        async with self.connection.cursor() as cur:
-            await cur.execute(compiled.sql, compiled.params)
-            rowcount = cur.rowcount
-            lastrowid = getattr(cur, "lastrowid", None)
-        if self._tx_depth == 0:
-            await self.connection.commit()
-        if log_enabled:
-            _debug_log(compiled, (time.perf_counter() - start) * 1000)
+        compiled, event = self._compile(unwrapped_query, "execute")
+        async with self._checkout() as conn:
+            async with conn.cursor() as cur:
+                await _execute(cur, compiled, event)
+                rowcount = cur.rowcount
+                lastrowid = getattr(cur, "lastrowid", None)
+            if self._tx_depth == 0:
+                await conn.commit()
+        self._invalidate_written(unwrapped_query)
         return ast.ExecutionResult(rowcount=rowcount, lastrowid=lastrowid)
 
+    def _invalidate_written(self, query: Any) -> None:
+        table = table_written(query)
+        if self.result_cache is None or table is None:
+            return
+        self.result_cache.invalidate((table,))
+        if self._tx_depth:
+            # Invalidated again at commit, in case another runner sharing the cache re-read the
+            # old rows in between.
+            self._tx_written.add(table)
+
     @asynccontextmanager
     async def transaction(self):
-        self._tx_depth += 1
-        try:
-            yield
-        except Exception:
-            await self.connection.rollback()
-            raise
-        else:
-            await self.connection.commit()
-        finally:
-            self._tx_depth -= 1
+        async with self._checkout() as conn:
+            tx = self._current_tx()
+            token = None
+            if self._pool is not None and tx.depth == 0:
+                tx = _TxState()
+                tx.connection = conn
+                token = self._tx_var.set(tx)
+            tx.depth += 1
+            try:
+                yield
+            except Exception:
+                await conn.rollback()
+                raise
+            else:
+                await conn.commit()
+            finally:
+                tx.depth -= 1
+                if tx.written and self.result_cache is not None:
+                    self.result_cache.invalidate(tx.written)
+                if tx.depth == 0:
+                    tx.written.clear()
+                if token is not None:
+                    self._tx_var.reset(token)
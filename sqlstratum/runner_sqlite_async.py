@@ -0,0 +1,529 @@
+"""SQLite asynchronous execution runner (stdlib only: sqlite3 on dedicated worker threads)."""
+from __future__ import annotations
+
+import asyncio
+import queue
+import sqlite3
+import threading
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from . import ast
+from .cache import ResultCache, sqlite_database_id, table_written, tables_read
+from .compile import compile
+from .connection_options import SQLiteOptions, connect_sqlite, sqlite_settings
+from .dialect_binding import unwrap_query
+from .hooks import GLOBAL_HOOKS, Hooks, QueryEvent
+from .hydrate import get_hydrator
+from .hydrate.columnar import ColumnValues, build_columns
+from .loader import AsyncLoader
+from .pagination import Page, build_page, prepare_page_query
+from .rewrite import count_query, exists_query, limit_one
+from .runner import (
+    _check_batch_size,
+    _database_target,
+    _open_reader,
+    _open_writer,
+    _pool_options,
+)
+
+
+class _Job:
+    __slots__ = ("fn", "future", "cancelled")
+
+    def __init__(self, fn: Callable[[sqlite3.Connection], Any], future: "asyncio.Future[Any]") -> None:
+        self.fn = fn
+        self.future = future
+        self.cancelled = False
+
+
+def _resolve(future: "asyncio.Future[Any]", ok: bool, value: Any) -> None:
+    if future.done():
+        return
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+class _Worker:
+    """A thread that owns one sqlite3 connection and runs jobs against it in submission order."""
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection]) -> None:
+        self.connection: Optional[sqlite3.Connection] = None
+        # Set once the connection attempt has finished, successfully or not.
+        self.ready = threading.Event()
+        # The job the thread is running; guarded by _lock so cancellation interrupts only it.
+        self._current: Optional[_Job] = None
+        self._lock = threading.Lock()
+        self._jobs: "queue.SimpleQueue[Optional[_Job]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, args=(connect,), name="sqlstratum-sqlite", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self, connect: Callable[[], sqlite3.Connection]) -> None:
+        failure: Optional[BaseException] = None
+        try:
+            self.connection = connect()
+        except BaseException as exc:
+            failure = exc
+        self.ready.set()
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            loop = job.future.get_loop()
+            with self._lock:
+                cancelled = job.cancelled
+                if not cancelled:
+                    self._current = job
+            if cancelled:
+                outcome: Any = (True, None)
+            elif failure is not None:
+                outcome = (False, failure)
+            else:
+                try:
+                    outcome = (True, job.fn(self.connection))  # type: ignore[arg-type]
+                except BaseException as exc:
+                    outcome = (False, exc)
+            with self._lock:
+                self._current = None
+            try:
+                loop.call_soon_threadsafe(_resolve, job.future, *outcome)
+            except RuntimeError:
+                # The event loop was closed while the job ran; nobody is waiting for it.
+                pass
+
+    async def run(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        job = _Job(fn, asyncio.get_running_loop().create_future())
+        self._jobs.put(job)
+        try:
+            return await asyncio.shield(job.future)
+        except asyncio.CancelledError:
+            with self._lock:
+                job.cancelled = True
+                # A queued job is just skipped; interrupting would stop another caller's statement.
+                if self._current is job and self.connection is not None:
+                    self.connection.interrupt()
+            # The next job reuses this connection, so wait until the worker has let go of it.
+            await asyncio.wait((job.future,))
+            if not job.future.cancelled():
+                job.future.exception()
+            raise
+
+    async def stop(self) -> None:
+        try:
+            await self.run(lambda conn: conn.close())
+        except sqlite3.Error:
+            pass
+        finally:
+            self._jobs.put(None)
+
+
+def _fetch_all(cursor: sqlite3.Cursor) -> List[Any]:
+    return cursor.fetchall()
+
+
+def _fetch_first(cursor: sqlite3.Cursor) -> List[Any]:
+    return cursor.fetchmany(1)
+
+
+def _commit(connection: sqlite3.Connection) -> None:
+    connection.commit()
+
+
+def _rollback(connection: sqlite3.Connection) -> None:
+    connection.rollback()
+
+
+class _TxState:
+    def __init__(self) -> None:
+        self.depth = 0
+        self.written: Set[str] = set()
+
+
+class AsyncSQLiteRunner:
+    """Asyncio runner that executes sqlite3 work, hydration included, on worker threads.
+
+    Every worker thread owns its connection. With ``readers=0`` one worker serves everything;
+    otherwise the database is opened in WAL mode with one writer worker and ``readers`` read-only
+    reader workers, as in ``SQLiteRunner.pool()``. Cancelling a call interrupts its statement with
+    ``Connection.interrupt()``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        readers: int = 0,
+        timeout: float = 30.0,
+        result_cache: Optional[ResultCache] = None,
+        options: Optional[SQLiteOptions] = None,
+    ):
+        if readers < 0:
+            raise ValueError("readers must be zero or a positive integer")
+        self.path = path
+        self.result_cache = result_cache
+        self.database_id = sqlite_database_id(path)
+        self.hooks = Hooks(GLOBAL_HOOKS)
+        if readers:
+            pool_opts = _pool_options(path, options)
+
+            def open_reader() -> sqlite3.Connection:
+                # Read-only connections cannot create the file, so let the writer open it first.
+                self._writer.ready.wait()
+                return _open_reader(path, timeout, pool_opts)
+
+            self._writer = _Worker(lambda: _open_writer(path, timeout, pool_opts))
+            self._readers = [_Worker(open_reader) for _ in range(readers)]
+        else:
+            self._writer = _Worker(
+                lambda: connect_sqlite(path, options or SQLiteOptions(), timeout=timeout)
+            )
+            self._readers = []
+        # asyncio primitives are created on first use, inside the running event loop.
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_owner: Optional["asyncio.Task[Any]"] = None
+        self._idle: Optional["asyncio.Queue[_Worker]"] = None
+        self._tx_var: ContextVar[Optional[_TxState]] = ContextVar(
+            f"sqlstratum_sqlite_tx_{id(self)}", default=None
+        )
+
+    @classmethod
+    async def connect(
+        cls,
+        path: Optional[str] = None,
+        *,
+        url: Optional[str] = None,
+        readers: int = 0,
+        timeout: float = 30.0,
+        result_cache: Optional[ResultCache] = None,
+        **options: Any,
+    ) -> "AsyncSQLiteRunner":
+        """Open ``path`` (or a ``sqlite://`` URL); tuning ``options`` work as in ``SQLiteRunner.connect``."""
+        db_path, sqlite_opts = _database_target(path, url, options)
+        runner = cls(
+            db_path, readers=readers, timeout=timeout, result_cache=result_cache, options=sqlite_opts
+        )
+        try:
+            # Surface connection errors here rather than on the first query.
+            await runner._writer.run(lambda conn: None)
+            await asyncio.gather(*(reader.run(lambda conn: None) for reader in runner._readers))
+        except BaseException:
+            await runner.close()
+            raise
+        return runner
+
+    @property
+    def _tx_depth(self) -> int:
+        tx = self._tx_var.get()
+        return 0 if tx is None else tx.depth
+
+    @property
+    def _tx_written(self) -> Set[str]:
+        tx = self._tx_var.get()
+        return set() if tx is None else tx.written
+
+    def _write_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _acquire_writer(self) -> bool:
+        """Take the write lock for the current task; False if the task already holds it."""
+        task = asyncio.current_task()
+        if self._lock_owner is task:
+            # E.g. a write issued while iterating a stream that reads from the writer.
+            return False
+        await self._write_lock().acquire()
+        self._lock_owner = task
+        return True
+
+    def _release_writer(self) -> None:
+        self._lock_owner = None
+        self._write_lock().release()
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[_Worker]:
+        # Inside transaction() reads go to the writer so they see the uncommitted writes.
+        if self._tx_depth:
+            yield self._writer
+            return
+        if not self._readers:
+            # Wait out other tasks' transactions so their uncommitted rows are never read.
+            held = await self._acquire_writer()
+            try:
+                yield self._writer
+            finally:
+                if held:
+                    self._release_writer()
+            return
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for reader in self._readers:
+                self._idle.put_nowait(reader)
+        worker = await self._idle.get()
+        try:
+            yield worker
+        finally:
+            self._idle.put_nowait(worker)
+
+    async def _write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        if self._tx_depth:
+            # This task holds the write lock for its transaction.
+            return await self._writer.run(fn)
+        held = await self._acquire_writer()
+        try:
+            return await self._writer.run(fn)
+        finally:
+            if held:
+                self._release_writer()
+
+    def _compile(self, query: Any, operation: str) -> Tuple[ast.Compiled, Optional[QueryEvent]]:
+        # The event is None while no hook is registered; call sites check it before reporting.
+        if not self.hooks.active:
+            return compile(query, dialect="sqlite"), None
+        event = self.hooks.event("sqlite", operation, query)
+        event.before_compile()
+        compiled = compile(query, dialect="sqlite")
+        event.after_compile(compiled)
+        return compiled, event
+
+    async def _read(
+        self,
+        compiled: ast.Compiled,
+        fetch: Callable[[sqlite3.Cursor], Sequence[Any]],
+        hydrate: Optional[Callable[[Sequence[Any]], Any]] = None,
+        event: Optional[QueryEvent] = None,
+    ) -> Any:
+        """Execute, ``fetch`` and optionally ``hydrate`` on a reader worker (hooks run there too)."""
+
+        def work(conn: sqlite3.Connection) -> Any:
+            cur = conn.cursor()
+            try:
+                if event is None:
+                    cur.execute(compiled.sql, compiled.params)
+                    rows = fetch(cur)
+                    return rows if hydrate is None else hydrate(rows)
+                event.before_execute()
+                cur.execute(compiled.sql, compiled.params)
+                event.after_execute(cur.rowcount)
+                rows = fetch(cur)
+                event.after_fetch(len(rows))
+                if hydrate is None:
+                    return rows
+                result = hydrate(rows)
+                event.after_hydrate()
+                return result
+            finally:
+                cur.close()
+
+        async with self._reader() as worker:
+            return await worker.run(work)
+
+    async def settings(self) -> Dict[str, Any]:
+        """Report the effective tuning PRAGMAs of the writer connection."""
+        return await self._write(sqlite_settings)
+
+    async def close(self) -> None:
+        """Close every connection and stop the worker threads."""
+        for worker in [self._writer] + self._readers:
+            await worker.stop()
+
+    async def exec_ddl(self, sql: str) -> None:
+        in_tx = bool(self._tx_depth)
+
+        def work(conn: sqlite3.Connection) -> None:
+            conn.execute(sql)
+            if not in_tx:
+                conn.commit()
+
+        await self._write(work)
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+    async def fetch_all(self, query: Any) -> list[Any]:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "fetch_all")
+        hydrator = get_hydrator(unwrapped_query.projections, unwrapped_query.hydration, by_index=True)
+        # Reads inside a transaction may see uncommitted writes, so they bypass the cache.
+        cache_key = None
+        if self.result_cache is not None and self._tx_depth == 0:
+            cache_key = self.result_cache.key("sqlite", compiled, self.database_id)
+        if cache_key is None:
+            return await self._read(compiled, _fetch_all, hydrator, event)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            rows = cached.rows
+        else:
+            tables = tables_read(unwrapped_query)
+            generation = self.result_cache.generation(tables)
+            rows = await self._read(compiled, _fetch_all, event=event)
+            self.result_cache.put(cache_key, rows, tables, generation=generation)
+        result = hydrator(rows)
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    async def fetch_columns(self, query: Any) -> Dict[str, ColumnValues]:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "fetch_columns")
+        return await self._read(
+            compiled,
+            _fetch_all,
+            lambda rows: build_columns(rows, unwrapped_query.projections),
+            event,
+        )
+
+    def stream(self, query: Any, *, batch_size: int = 1000) -> AsyncIterator[Any]:
+        """Asynchronously yield hydrated rows, fetching and hydrating each batch on the worker."""
+        _check_batch_size(batch_size)
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "stream")
+        return self._stream(unwrapped_query, compiled, batch_size, event)
+
+    async def _stream(
+        self,
+        query: ast.SelectQuery,
+        compiled: ast.Compiled,
+        batch_size: int,
+        event: Optional[QueryEvent],
+    ) -> AsyncIterator[Any]:
+        hydrator = get_hydrator(query.projections, query.hydration, by_index=True)
+
+        def start(conn: sqlite3.Connection) -> sqlite3.Cursor:
+            if event is not None:
+                event.before_execute()
+            cur = conn.execute(compiled.sql, compiled.params)
+            if event is not None:
+                event.after_execute(cur.rowcount)
+            return cur
+
+        # The worker stays reserved for this stream until the cursor is closed.
+        async with self._reader() as worker:
+            cur = await worker.run(start)
+            try:
+                while True:
+                    rows = await worker.run(lambda conn: hydrator(cur.fetchmany(batch_size)))
+                    if not rows:
+                        break
+                    for row in rows:
+                        yield row
+            finally:
+                await worker.run(lambda conn: cur.close())
+
+    async def fetch_one(self, query: Any) -> Optional[Any]:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        unwrapped_query = limit_one(unwrapped_query)
+        compiled, event = self._compile(unwrapped_query, "fetch_one")
+        hydrator = get_hydrator(unwrapped_query.projections, unwrapped_query.hydration, by_index=True)
+        rows = await self._read(compiled, _fetch_first, event=event)
+        if not rows:
+            return None
+        result = hydrator(rows)[0]
+        if event is not None:
+            event.after_hydrate()
+        return result
+
+    async def paginate(self, query: Any, page_size: int, *, after: Optional[str] = None) -> Page:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        page_query = prepare_page_query(unwrapped_query, page_size, after)
+        rows = await self.fetch_all(page_query)
+        return build_page(unwrapped_query, rows, page_size)
+
+    async def scalar(self, query: Any) -> Optional[Any]:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "scalar")
+        rows = await self._read(compiled, _fetch_first, event=event)
+        return rows[0][0] if rows else None
+
+    async def exists(self, query: Any) -> bool:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        return bool(await self.scalar(exists_query(unwrapped_query)))
+
+    async def count(self, query: Any) -> int:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        return int(await self.scalar(count_query(unwrapped_query)) or 0)
+
+    async def gather(self, *queries: Any, concurrency: int = 4) -> List[List[Any]]:
+        """Run independent SELECTs concurrently and return their hydrated rows in input order.
+
+        Queries overlap across reader workers; with ``readers=0`` they queue on the one worker.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be a positive integer")
+        limit = asyncio.Semaphore(concurrency)
+
+        async def fetch(query: Any) -> List[Any]:
+            async with limit:
+                return await self.fetch_all(query)
+
+        return list(await asyncio.gather(*(fetch(query) for query in queries)))
+
+    def loader(self, key_column: Any, base_query: Any, *, max_batch_size: int = 1000) -> AsyncLoader:
+        """Return a loader that coalesces concurrent ``key_column == key`` lookups.
+
+        Keys requested within one event-loop tick are fetched with a single
+        ``base_query.WHERE(key_column.in_(keys))``; create one loader per request.
+        """
+        unwrapped_query, _ = unwrap_query(base_query, "sqlite")
+        return AsyncLoader(self, key_column, unwrapped_query, max_batch_size=max_batch_size)
+
+    async def execute(self, query: Any) -> ast.ExecutionResult:
+        unwrapped_query, _ = unwrap_query(query, "sqlite")
+        compiled, event = self._compile(unwrapped_query, "execute")
+        in_tx = bool(self._tx_depth)
+
+        def work(conn: sqlite3.Connection) -> ast.ExecutionResult:
+            if event is not None:
+                event.before_execute()
+            cur = conn.execute(compiled.sql, compiled.params)
+            if event is not None:
+                event.after_execute(cur.rowcount)
+            if not in_tx:
+                conn.commit()
+            return ast.ExecutionResult(rowcount=cur.rowcount, lastrowid=cur.lastrowid)
+
+        result = await self._write(work)
+        self._invalidate_written(unwrapped_query)
+        return result
+
+    def _invalidate_written(self, query: Any) -> None:
+        table = table_written(query)
+        if self.result_cache is None or table is None:
+            return
+        self.result_cache.invalidate((table,))
+        if self._tx_depth:
+            # Invalidated again at commit, in case another runner sharing the cache re-read the
+            # old rows in between.
+            self._tx_written.add(table)
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Run the block on the writer, holding it for the current task until the block exits."""
+        tx = self._tx_var.get()
+        token = None
+        held = False
+        if tx is None:
+            held = await self._acquire_writer()
+            tx = _TxState()
+            token = self._tx_var.set(tx)
+        tx.depth += 1
+        try:
+            yield
+        except BaseException:
+            # Also on cancellation: an interrupted statement may leave the transaction open.
+            await self._writer.run(_rollback)
+            raise
+        else:
+            await self._writer.run(_commit)
+        finally:
+            tx.depth -= 1
+            if tx.written and self.result_cache is not None:
+                self.result_cache.invalidate(tx.written)
+            if token is not None:
+                self._tx_var.reset(token)
+            if held:
+                self._release_writer()
@@ -0,0 +1,216 @@
+"""Threshold-based slow query log with deferred, rate-limited plan capture."""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from .fingerprint import fingerprint
+from .hooks import QueryEvent, render_params
+
+_LOGGER = logging.getLogger("sqlstratum")
+# Operations whose statement time includes fetching the rows; the others report at execute.
+_FETCHING = {"fetch_all", "fetch_columns", "fetch_one", "scalar"}
+_EXPLAIN = {"sqlite": "EXPLAIN QUERY PLAN ", "mysql": "EXPLAIN FORMAT=JSON "}
+
+
+def redact_params(params: Dict[str, Any]) -> Dict[str, str]:
+    """Replace every param value with its type name, e.g. ``{"p0": "<str>"}``."""
+    return {key: f"<{type(value).__name__}>" for key, value in params.items()}
+
+
+@dataclass
+class SlowQuery:
+    dialect: str
+    operation: str
+    fingerprint: str
+    sql: str
+    params: Dict[str, Any]
+    duration_ms: float
+    # Wall-clock time (time.time()) at which the statement finished.
+    timestamp: float
+    # Filled in by the plan worker when a plan is captured for this entry.
+    plan: Optional[str] = field(default=None)
+
+
+def _sqlite_plan(rows: List[Any]) -> str:
+    # EXPLAIN QUERY PLAN rows are (id, parent, notused, detail); indent each node under its parent.
+    depth: Dict[Any, int] = {0: -1}
+    lines = []
+    for row in rows:
+        node, parent, detail = row[0], row[1], row[-1]
+        depth[node] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node] + str(detail))
+    return "\n".join(lines)
+
+
+class SlowQueryLog:
+    """Record statements slower than ``threshold_ms``; register it as a hook.
+
+    Each slow statement is logged at WARNING on the ``sqlstratum`` logger and kept in a ring of
+    the last ``max_entries`` entries, with params passed through ``redact`` (type names by
+    default; ``None`` keeps the values). Duration is statement time: execution plus fetching for
+    reads that fetch rows, execution alone for writes and streams.
+
+    With ``explain_connect`` (a factory for a DB-API connection to the same database), the plan
+    of a slow statement is captured on a background thread over that connection, at most once
+    per fingerprint every ``explain_interval`` seconds, so the hot path only enqueues.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: float = 100.0,
+        *,
+        max_entries: int = 100,
+        redact: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = redact_params,
+        explain_connect: Optional[Callable[[], Any]] = None,
+        explain_interval: float = 300.0,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        if threshold_ms < 0:
+            raise ValueError("threshold_ms must be zero or positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.threshold_ms = threshold_ms
+        self.redact = redact
+        self.explain_connect = explain_connect
+        self.explain_interval = explain_interval
+        self.logger = logger or _LOGGER
+        self._entries: "deque[SlowQuery]" = deque(maxlen=max_entries)
+        self._explained: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._jobs: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._worker: Optional[threading.Thread] = None
+
+    def after_execute(self, event: QueryEvent) -> None:
+        if event.operation not in _FETCHING:
+            self._check(event, event.execute_time or 0.0)
+
+    def after_fetch(self, event: QueryEvent) -> None:
+        self._check(event, (event.execute_time or 0.0) + (event.fetch_time or 0.0))
+
+    def _check(self, event: QueryEvent, seconds: float) -> None:
+        duration_ms = seconds * 1000
+        if duration_ms < self.threshold_ms or event.compiled is None:
+            return
+        compiled = event.compiled
+        params = dict(compiled.params)
+        entry = SlowQuery(
+            dialect=event.dialect,
+            operation=event.operation,
+            fingerprint=fingerprint(compiled.sql),
+            sql=compiled.sql,
+            params=params if self.redact is None else self.redact(params),
+            duration_ms=duration_ms,
+            timestamp=time.time(),
+        )
+        with self._lock:
+            self._entries.append(entry)
+            explain = self._should_explain(entry)
+        self.logger.warning(
+            "Slow query: %.3f ms | fingerprint=%s | SQL: %s | params=%s",
+            duration_ms,
+            entry.fingerprint,
+            entry.sql,
+            render_params(entry.params),
+        )
+        if explain:
+            self._submit((entry, compiled.params))
+
+    def _should_explain(self, entry: SlowQuery) -> bool:
+        if self.explain_connect is None or entry.dialect not in _EXPLAIN:
+            return False
+        now = time.monotonic()
+        last = self._explained.get(entry.fingerprint)
+        if last is not None and now - last < self.explain_interval:
+            return False
+        self._explained[entry.fingerprint] = now
+        return True
+
+    def _submit(self, job: Any) -> None:
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="sqlstratum-slowlog", daemon=True
+                )
+                self._worker.start()
+        self._jobs.put(job)
+
+    def _run(self) -> None:
+        connection = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            if isinstance(job, threading.Event):
+                job.set()
+                continue
+            entry, params = job
+            try:
+                if connection is None:
+                    connection = self.explain_connect()  # type: ignore[misc]
+                entry.plan = self._explain(connection, entry, params)
+            except Exception:
+                self.logger.warning(
+                    "Could not capture the plan of slow query %s", entry.fingerprint, exc_info=True
+                )
+                # Reconnect for the next capture.
+                _close_quietly(connection)
+                connection = None
+                continue
+            self.logger.warning("Plan of slow query %s:\n%s", entry.fingerprint, entry.plan)
+        _close_quietly(connection)
+
+    @staticmethod
+    def _explain(connection: Any, entry: SlowQuery, params: Dict[str, Any]) -> str:
+        cur = connection.cursor()
+        try:
+            cur.execute(_EXPLAIN[entry.dialect] + entry.sql, params)
+            rows = list(cur.fetchall())
+        finally:
+            cur.close()
+        if entry.dialect == "sqlite":
+            return _sqlite_plan(rows)
+        row = rows[0] if rows else None
+        if isinstance(row, dict):
+            return str(next(iter(row.values()), ""))
+        return "" if row is None else str(row[0])
+
+    def entries(self) -> List[SlowQuery]:
+        """The recorded slow statements, oldest first."""
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._explained.clear()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued plan captures are done; return False on timeout."""
+        with self._lock:
+            if self._worker is None:
+                return True
+        done = threading.Event()
+        self._jobs.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Stop the plan worker and close its connection."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            self._jobs.put(None)
+            worker.join()
+
+
+def _close_quietly(connection: Any) -> None:
+    if connection is not None:
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,110 @@
+"""Cursor reuse and statement-cache accounting for runners."""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict
+
+
+@dataclass(frozen=True)
+class StatementStats:
+    cursors_created: int
+    cursors_reused: int
+    statement_hits: int
+    statement_misses: int
+
+    @property
+    def cursor_reuse_ratio(self) -> float:
+        total = self.cursors_created + self.cursors_reused
+        return self.cursors_reused / total if total else 0.0
+
+    @property
+    def statement_hit_ratio(self) -> float:
+        lookups = self.statement_hits + self.statement_misses
+        return self.statement_hits / lookups if lookups else 0.0
+
+
+class StatementTracker:
+    """Keep one reusable cursor per connection and count statement-cache hits.
+
+    sqlite3 keeps an LRU cache of prepared statements per connection, keyed by SQL text, but does
+    not report on it. ``record`` mirrors that bookkeeping (same capacity, same keys) so hits and
+    misses can be counted; it is exact as long as every statement on the connection goes through
+    the runner. A ``statement_cache_size`` of 0 disables the mirror (MySQL drivers have no client
+    statement cache).
+    """
+
+    def __init__(self, statement_cache_size: int = 0) -> None:
+        if statement_cache_size < 0:
+            raise ValueError("statement_cache_size must be zero or a positive integer")
+        self.statement_cache_size = statement_cache_size
+        self._cursors: Dict[int, Any] = {}
+        self._statements: Dict[int, "OrderedDict[str, None]"] = {}
+        self._created = 0
+        self._reused = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def cursor(self, connection: Any, factory: Callable[[Any], Any], *, reuse: bool = True) -> Any:
+        """Return the reusable cursor of ``connection`` (or a new one the caller closes)."""
+        # Keyed by id(): the cached cursor references its connection, so the id stays unique.
+        key = id(connection)
+        with self._lock:
+            cur = self._cursors.get(key) if reuse else None
+            if cur is not None:
+                self._reused += 1
+                return cur
+            self._created += 1
+        cur = factory(connection)
+        if reuse:
+            with self._lock:
+                self._cursors[key] = cur
+        return cur
+
+    def record(self, connection: Any, sql: str) -> bool:
+        """Count a statement lookup; return whether the connection's cache already held it."""
+        if not self.statement_cache_size:
+            return False
+        with self._lock:
+            seen = self._statements.setdefault(id(connection), OrderedDict())
+            if sql in seen:
+                seen.move_to_end(sql)
+                self._hits += 1
+                return True
+            seen[sql] = None
+            if len(seen) > self.statement_cache_size:
+                seen.popitem(last=False)
+            self._misses += 1
+            return False
+
+    def discard(self, connection: Any) -> None:
+        """Close the reusable cursor of ``connection``; the next call creates a fresh one."""
+        with self._lock:
+            cur = self._cursors.pop(id(connection), None)
+        if cur is not None:
+            try:
+                cur.close()
+            except Exception:
+                pass
+
+    def clear(self) -> None:
+        """Close every reusable cursor and forget the statement mirrors."""
+        with self._lock:
+            cursors, self._cursors = list(self._cursors.values()), {}
+            self._statements.clear()
+        for cur in cursors:
+            try:
+                cur.close()
+            except Exception:
+                pass
+
+    def stats(self) -> StatementStats:
+        with self._lock:
+            return StatementStats(
+                cursors_created=self._created,
+                cursors_reused=self._reused,
+                statement_hits=self._hits,
+                statement_misses=self._misses,
+            )
@@ -4,7 +4,15 @@ from __future__ import annotations
 from typing import Any, Callable, Dict, Optional, Protocol, TYPE_CHECKING, runtime_checkable, TypeVar
 
 if TYPE_CHECKING:
-    from .expr import AliasExpr, BinaryPredicate, LogicalPredicate, NotPredicate, OrderSpec, UnaryPredicate
+    from .expr import (
+        AliasExpr,
+        BinaryPredicate,
+        InPredicate,
+        LogicalPredicate,
+        NotPredicate,
+        OrderSpec,
+        UnaryPredicate,
+    )
 
 
 @runtime_checkable
@@ -39,6 +47,6 @@ T = TypeVar("T")
 Hydrator = Callable[[RowMapping], T]
 HydrationTarget = Callable[[RowMapping], Any] | type[Any] | None
 if TYPE_CHECKING:
-    Predicate = BinaryPredicate | UnaryPredicate | LogicalPredicate | NotPredicate
+    Predicate = BinaryPredicate | UnaryPredicate | InPredicate | LogicalPredicate | NotPredicate
 else:  # pragma: no cover - typing only
     Predicate = Any
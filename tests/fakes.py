@@ -0,0 +1,151 @@
+"""Fake DB-API drivers (PyMySQL and asyncmy shaped) shared by the MySQL runner tests."""
+import asyncio
+import threading
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = (("id",),)
+        self.rowcount = 1
+        self.lastrowid = None
+        self.closed = False
+
+    def execute(self, sql, params=None):
+        self.connection.executed.append(sql)
+
+    def fetchall(self):
+        return self._rows()
+
+    def fetchone(self):
+        rows = self._rows()
+        return rows[0] if rows else None
+
+    def _rows(self):
+        return self.connection.result(self.connection.executed[-1])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    """Every query returns ``rows`` (default: one row holding the connection ``number``).
+
+    ``results`` maps a SQL prefix to the rows of the statements that start with it.
+    """
+
+    cursor_class = FakeCursor
+
+    def __init__(self, number=0, *, rows=None, results=None):
+        self.number = number
+        self.rows = rows
+        self.results = dict(results or {})
+        self.alive = True
+        self.closed = False
+        self.executed = []
+        self.cursors = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def result(self, sql):
+        for prefix, rows in self.results.items():
+            if sql.startswith(prefix):
+                return rows
+        return [(self.number,)] if self.rows is None else self.rows
+
+    def ping(self, reconnect=True):
+        if not self.alive:
+            raise OSError("gone away")
+
+    def cursor(self, cursor_class=None):
+        self.cursors.append(self.cursor_class(self))
+        return self.cursors[-1]
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeDriver:
+    """Stands in for the ``pymysql`` module: ``connect()`` numbers its connections."""
+
+    def __init__(self):
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def connect(self, **kwargs):
+        with self.lock:
+            conn = FakeConnection(len(self.connections))
+            self.connections.append(conn)
+            return conn
+
+
+class FakeAsyncCursor(FakeCursor):
+    async def execute(self, sql, params=None):
+        driver = self.connection.driver
+        self.connection.executed.append(sql)
+        if driver.fail_on is not None and driver.fail_on in sql:
+            raise RuntimeError("boom")
+        # Track overlapping statements so tests can assert how many ran at once.
+        driver.active += 1
+        driver.peak = max(driver.peak, driver.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            driver.active -= 1
+
+    async def fetchall(self):
+        return self._rows()
+
+    async def fetchone(self):
+        rows = self._rows()
+        return rows[0] if rows else None
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeAsyncConnection(FakeConnection):
+    cursor_class = FakeAsyncCursor
+
+    def __init__(self, number, driver):
+        super().__init__(number)
+        self.driver = driver
+
+    async def ping(self, reconnect=True):
+        super().ping(reconnect)
+
+    async def commit(self):
+        super().commit()
+
+    async def rollback(self):
+        super().rollback()
+
+    async def ensure_closed(self):
+        self.closed = True
+
+
+class FakeAsyncDriver:
+    """Stands in for the ``asyncmy`` module; statements containing ``fail_on`` raise."""
+
+    def __init__(self):
+        self.connections = []
+        self.active = 0
+        self.peak = 0
+        self.fail_on = None
+
+    async def connect(self, **kwargs):
+        conn = FakeAsyncConnection(len(self.connections), self)
+        self.connections.append(conn)
+        return conn
@@ -0,0 +1,156 @@
+import datetime
+import importlib
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlstratum import COUNT, SELECT, Table, col
+from sqlstratum import arrow as arrow_export
+from sqlstratum.runner import SQLiteRunner
+
+
+items = Table(
+    "items",
+    col("id", int),
+    col("price", float),
+    col("name", str),
+)
+
+events = Table(
+    "events",
+    col("id", int),
+    col("active", bool),
+    col("at", datetime.datetime),
+    col("day", datetime.date),
+    col("note", object),
+)
+
+
+class TestArrowExport(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl("CREATE TABLE items (id INTEGER PRIMARY KEY, price REAL, name TEXT)")
+        self.conn.executemany(
+            "INSERT INTO items (id, price, name) VALUES (?, ?, ?)",
+            [(1, 9.5, "a"), (2, 1.25, None), (3, 3.0, "c")],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _require_pyarrow(self):
+        try:
+            return importlib.import_module("pyarrow")
+        except Exception:
+            self.skipTest("pyarrow not installed")
+
+    def test_missing_pyarrow_raises(self):
+        q = SELECT(items.c.id).FROM(items)
+        with mock.patch("sqlstratum.arrow._import_pyarrow", side_effect=ImportError("no pyarrow")):
+            with self.assertRaises(RuntimeError) as cm:
+                self.runner.fetch_arrow(q)
+            self.assertFalse(arrow_export.is_pyarrow_available())
+        self.assertIn("pip install sqlstratum[arrow]", str(cm.exception))
+
+    def test_fetch_arrow_uses_declared_types(self):
+        pa = self._require_pyarrow()
+        q = (
+            SELECT(items.c.id, items.c.price, items.c.name, COUNT().AS("n"))
+            .FROM(items)
+            .GROUP_BY(items.c.id)
+            .ORDER_BY(items.c.id.ASC())
+        )
+        table = self.runner.fetch_arrow(q, batch_size=2)
+        self.assertEqual(table.column_names, ["id", "price", "name", "n"])
+        self.assertEqual(table.schema.field("id").type, pa.int64())
+        self.assertEqual(table.schema.field("price").type, pa.float64())
+        self.assertEqual(table.schema.field("name").type, pa.string())
+        self.assertEqual(table.column("name").to_pylist(), ["a", None, "c"])
+        self.assertEqual(table.column("n").to_pylist(), [1, 1, 1])
+
+    def test_fetch_arrow_empty_result(self):
+        self._require_pyarrow()
+        q = SELECT(items.c.id, items.c.name).FROM(items).WHERE(items.c.id == 99)
+        table = self.runner.fetch_arrow(q)
+        self.assertEqual(table.num_rows, 0)
+        self.assertEqual(table.column_names, ["id", "name"])
+
+    def test_export_parquet_in_batches(self):
+        self._require_pyarrow()
+        parquet = importlib.import_module("pyarrow.parquet")
+        q = SELECT(items.c.id, items.c.name).FROM(items).ORDER_BY(items.c.id.ASC())
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "items.parquet")
+            written = self.runner.export_parquet(q, path, batch_size=2)
+            self.assertEqual(written, 3)
+            table = parquet.read_table(path)
+        self.assertEqual(table.column("id").to_pylist(), [1, 2, 3])
+        self.assertEqual(table.column("name").to_pylist(), ["a", None, "c"])
+
+
+class TestArrowCoercion(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.pa = importlib.import_module("pyarrow")
+        except Exception:
+            self.skipTest("pyarrow not installed")
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl(
+            "CREATE TABLE events (id INTEGER PRIMARY KEY, active INTEGER, at TEXT, day TEXT, note)"
+        )
+        self.conn.executemany(
+            "INSERT INTO events (id, active, at, day, note) VALUES (?, ?, ?, ?, ?)",
+            [
+                (1, 1, "2024-05-01 10:30:00", "2024-05-01", None),
+                (2, 0, "2024-05-02 11:00:00.250000", "2024-05-02", None),
+                (3, None, None, None, "late"),
+            ],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_sqlite_bool_and_datetime_columns_are_cast(self):
+        q = SELECT(events.c.active, events.c.at, events.c.day).FROM(events).ORDER_BY(events.c.id.ASC())
+        table = self.runner.fetch_arrow(q, batch_size=2)
+
+        self.assertEqual(table.schema.field("active").type, self.pa.bool_())
+        self.assertEqual(table.schema.field("at").type, self.pa.timestamp("us"))
+        self.assertEqual(table.schema.field("day").type, self.pa.date32())
+        self.assertEqual(table.column("active").to_pylist(), [True, False, None])
+        self.assertEqual(
+            table.column("at").to_pylist(),
+            [datetime.datetime(2024, 5, 1, 10, 30), datetime.datetime(2024, 5, 2, 11, 0, 0, 250000), None],
+        )
+        self.assertEqual(table.column("day").to_pylist()[0], datetime.date(2024, 5, 1))
+
+    def test_all_null_first_batch_is_promoted(self):
+        q = SELECT(events.c.id, events.c.note).FROM(events).ORDER_BY(events.c.id.ASC())
+        table = self.runner.fetch_arrow(q, batch_size=2)
+        self.assertEqual(table.schema.field("note").type, self.pa.string())
+        self.assertEqual(table.column("note").to_pylist(), [None, None, "late"])
+
+        parquet = importlib.import_module("pyarrow.parquet")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "events.parquet")
+            self.assertEqual(self.runner.export_parquet(q, path, batch_size=2), 3)
+            written = parquet.read_table(path)
+        self.assertEqual(written.schema.field("note").type, self.pa.string())
+        self.assertEqual(written.column("note").to_pylist(), [None, None, "late"])
+
+    def test_parquet_rejects_types_that_change_after_writing(self):
+        q = SELECT(events.c.id, events.c.note).FROM(events).ORDER_BY(events.c.id.ASC())
+        with mock.patch("sqlstratum.arrow._MAX_HELD_BATCHES", 1):
+            with tempfile.TemporaryDirectory() as tmp:
+                with self.assertRaises(ValueError):
+                    self.runner.export_parquet(q, os.path.join(tmp, "events.parquet"), batch_size=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import sqlite3
+import unittest
+from array import array
+
+from sqlstratum import COUNT, SELECT, Table, col
+from sqlstratum.hydrate.columnar import build_columns
+from sqlstratum.runner import SQLiteRunner
+
+
+items = Table(
+    "items",
+    col("id", int),
+    col("price", float),
+    col("name", str),
+    col("stock", int),
+)
+
+
+class TestFetchColumns(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, price REAL, name TEXT, stock INTEGER)"
+        )
+        self.conn.executemany(
+            "INSERT INTO items (id, price, name, stock) VALUES (?, ?, ?, ?)",
+            [(1, 9.5, "a", 3), (2, 1.25, "b", None)],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_numeric_columns_become_arrays(self):
+        q = SELECT(items.c.id, items.c.price, items.c.name).FROM(items).ORDER_BY(items.c.id.ASC())
+        columns = self.runner.fetch_columns(q)
+        self.assertEqual(list(columns), ["id", "price", "name"])
+        self.assertEqual(columns["id"], array("q", [1, 2]))
+        self.assertEqual(columns["price"], array("d", [9.5, 1.25]))
+        self.assertEqual(columns["name"], ["a", "b"])
+
+    def test_nulls_and_untyped_expressions_stay_lists(self):
+        q = SELECT(items.c.stock.AS("qty")).FROM(items).ORDER_BY(items.c.id.ASC())
+        self.assertEqual(self.runner.fetch_columns(q), {"qty": [3, None]})
+
+        q = SELECT(COUNT().AS("n")).FROM(items)
+        self.assertEqual(self.runner.fetch_columns(q), {"n": [2]})
+
+    def test_empty_result_keeps_keys(self):
+        q = SELECT(items.c.id, items.c.name).FROM(items).WHERE(items.c.id == 99)
+        self.assertEqual(self.runner.fetch_columns(q), {"id": array("q"), "name": []})
+
+    def test_mapping_rows_are_read_by_key(self):
+        rows = [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}]
+        columns = build_columns(rows, (items.c.id, items.c.name))
+        self.assertEqual(columns, {"id": array("q", [1, 2]), "name": ["a", "b"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -64,6 +64,19 @@ class TestCompileSelect(unittest.TestCase):
         )
         self.assertEqual(compiled.params, {"p0": True, "p1": 50, "p2": 0})
 
+    def test_in_predicate(self):
+        q = SELECT(users.c.id).FROM(users).WHERE(users.c.role.in_(["admin", "owner"]))
+        compiled = compile(q)
+        self.assertEqual(
+            compiled.sql,
+            'SELECT "users"."id" FROM "users" WHERE "users"."role" IN (:p0, :p1)',
+        )
+        self.assertEqual(compiled.params, {"p0": "admin", "p1": "owner"})
+
+    def test_empty_in_predicate_matches_nothing(self):
+        compiled = compile(SELECT(users.c.id).FROM(users).WHERE(users.c.id.in_([])))
+        self.assertEqual(compiled.sql, 'SELECT "users"."id" FROM "users" WHERE 1 = 0')
+
 
 if __name__ == "__main__":
     unittest.main()
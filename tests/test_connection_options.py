@@ -1,10 +1,23 @@
+import os
+import sqlite3
+import tempfile
 import unittest
 from unittest import mock
 
-from sqlstratum import AsyncMySQLRunner, MySQLRunner, Runner, SQLiteRunner
+from sqlstratum import AsyncMySQLRunner, AsyncSQLiteRunner, MySQLRunner, Runner, SQLiteRunner
+from sqlstratum.connection_options import SQLITE_PROFILES, sqlite_options
+
+
+class FakeCursors:
+    Cursor = object()
+    SSCursor = object()
+    DictCursor = object()
+    SSDictCursor = object()
 
 
 class FakePyMySQLModule:
+    cursors = FakeCursors
+
     def __init__(self):
         self.calls = []
 
@@ -14,6 +27,8 @@ class FakePyMySQLModule:
 
 
 class FakeAsyncMySQLModule:
+    cursors = FakeCursors
+
     def __init__(self):
         self.calls = []
 
@@ -29,7 +44,7 @@ class TestConnectionOptions(unittest.TestCase):
     def test_sqlite_connect_url(self):
         with mock.patch("sqlite3.connect") as m:
             SQLiteRunner.connect(url="sqlite:///:memory:")
-        m.assert_called_once_with(":memory:")
+        m.assert_called_once_with(":memory:", cached_statements=512)
 
     def test_sqlite_connect_rejects_mixed(self):
         with self.assertRaises(ValueError):
@@ -46,12 +61,102 @@ class TestConnectionOptions(unittest.TestCase):
         self.assertEqual(call["database"], "db")
         self.assertEqual(call["port"], 3307)
 
+    def test_mysql_url_options_map_to_pymysql_kwargs(self):
+        fake = FakePyMySQLModule()
+        url = (
+            "mysql://u:p@127.0.0.1/db?read_timeout=5&write_timeout=2.5&connect_timeout=3"
+            "&charset=utf8mb4&cursor=ss&init_command=SET%20SESSION%20sql_mode%3D%27STRICT_ALL_TABLES%27"
+        )
+        with mock.patch("sqlstratum.runner_mysql._import_pymysql", return_value=fake):
+            MySQLRunner.connect(url=url, read_timeout=30)
+        call = fake.calls[0]
+        self.assertEqual(call["read_timeout"], 30)
+        self.assertEqual(call["write_timeout"], 2.5)
+        self.assertEqual(call["connect_timeout"], 3)
+        self.assertEqual(call["charset"], "utf8mb4")
+        self.assertIs(call["cursorclass"], FakeCursors.SSCursor)
+        self.assertEqual(call["init_command"], "SET SESSION sql_mode='STRICT_ALL_TABLES'")
+
     def test_mysql_connect_rejects_mixed(self):
         with self.assertRaises(ValueError):
             MySQLRunner.connect(url="mysql://u:p@127.0.0.1/db", host="127.0.0.1")
 
 
+class TestSQLiteTuningOptions(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "app.db")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_url_options_are_applied_and_reported(self):
+        runner = SQLiteRunner.connect(
+            url=f"sqlite:///{self.path}?journal_mode=wal&synchronous=normal&cache_size=-4096"
+            "&temp_store=memory&busy_timeout=2500&cached_statements=256"
+        )
+        settings = runner.settings()
+        runner.close()
+
+        self.assertEqual(settings["journal_mode"], "wal")
+        self.assertEqual(settings["synchronous"], "normal")
+        self.assertEqual(settings["cache_size"], -4096)
+        self.assertEqual(settings["temp_store"], "memory")
+        self.assertEqual(settings["busy_timeout"], 2500)
+
+    def test_profile_with_keyword_override(self):
+        runner = SQLiteRunner.connect(self.path, profile="read_heavy", busy_timeout=100)
+        settings = runner.settings()
+        runner.close()
+
+        profile = SQLITE_PROFILES["read_heavy"]
+        self.assertEqual(settings["journal_mode"], profile.journal_mode)
+        self.assertEqual(settings["cache_size"], profile.cache_size)
+        self.assertEqual(settings["busy_timeout"], 100)
+
+    def test_read_only_uri_mode(self):
+        SQLiteRunner.connect(self.path).exec_ddl("CREATE TABLE t (id INTEGER)")
+        runner = SQLiteRunner.connect(url=f"sqlite:///{self.path}?mode=ro")
+        with self.assertRaises(sqlite3.OperationalError):
+            runner.exec_ddl("INSERT INTO t VALUES (1)")
+        runner.close()
+
+    def test_shared_cache_memory_database(self):
+        first = SQLiteRunner.connect(url="sqlite:///:memory:?cache=shared")
+        second = SQLiteRunner.connect(":memory:", cache="shared")
+        first.exec_ddl("CREATE TABLE t (id INTEGER)")
+        tables = second.connection.execute("SELECT name FROM sqlite_master").fetchall()
+        self.assertEqual([tuple(row) for row in tables], [("t",)])
+        first.close()
+        second.close()
+
+    def test_rejects_invalid_options(self):
+        with self.assertRaises(ValueError):
+            sqlite_options({"synchronous": "sometimes"})
+        with self.assertRaises(ValueError):
+            sqlite_options({"mmap_size": "-1"})
+        with self.assertRaises(ValueError):
+            sqlite_options({"profile": "fastest"})
+        with self.assertRaises(ValueError):
+            SQLiteRunner.connect(self.path, page_size=4096)
+
+    def test_pool_applies_options_and_keeps_wal(self):
+        runner = SQLiteRunner.pool(self.path, readers=1, profile="bulk_write")
+        self.assertEqual(runner.settings()["cache_size"], SQLITE_PROFILES["bulk_write"].cache_size)
+        with runner.connection_pool.connection() as reader:
+            self.assertEqual(reader.execute("PRAGMA busy_timeout").fetchone()[0], 30000)
+        runner.close()
+        with self.assertRaises(ValueError):
+            SQLiteRunner.pool(self.path, journal_mode="delete")
+
+
 class TestAsyncConnectionOptions(unittest.IsolatedAsyncioTestCase):
+    async def test_async_sqlite_connect_options(self):
+        runner = await AsyncSQLiteRunner.connect(url="sqlite:///:memory:?temp_store=memory&cache_size=-2048")
+        settings = await runner.settings()
+        await runner.close()
+        self.assertEqual((settings["temp_store"], settings["cache_size"]), ("memory", -2048))
+
     async def test_async_mysql_connect_url(self):
         fake = FakeAsyncMySQLModule()
         with mock.patch("sqlstratum.runner_mysql_async._import_asyncmy", return_value=fake):
@@ -63,6 +168,17 @@ class TestAsyncConnectionOptions(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(call["database"], "db")
         self.assertEqual(call["port"], 3307)
 
+    async def test_async_mysql_url_options_map_to_asyncmy_kwargs(self):
+        fake = FakeAsyncMySQLModule()
+        with mock.patch("sqlstratum.runner_mysql_async._import_asyncmy", return_value=fake):
+            await AsyncMySQLRunner.connect(url="mysql+asyncmy://u:p@127.0.0.1/db?cursor=dict&read_timeout=5")
+        call = fake.calls[0]
+        self.assertIs(call["cursor_cls"], FakeCursors.DictCursor)
+        self.assertEqual(call["read_timeout"], 5)
+        with mock.patch("sqlstratum.runner_mysql_async._import_asyncmy", return_value=fake):
+            with self.assertRaises(ValueError):
+                await AsyncMySQLRunner.connect(url="mysql://u:p@127.0.0.1/db?write_timeout=5")
+
     async def test_async_mysql_connect_rejects_mixed(self):
         with self.assertRaises(ValueError):
             await AsyncMySQLRunner.connect(url="mysql://u:p@127.0.0.1/db", host="127.0.0.1")
@@ -1,6 +1,6 @@
 import unittest
 
-from sqlstratum.connection_url import parse_mysql_url, parse_sqlite_url
+from sqlstratum.connection_url import parse_mysql_url, parse_sqlite_url, split_mysql_url, split_sqlite_url
 
 
 class TestSQLiteUrlParsing(unittest.TestCase):
@@ -13,9 +13,20 @@ class TestSQLiteUrlParsing(unittest.TestCase):
     def test_absolute_path_url(self):
         self.assertEqual(parse_sqlite_url("sqlite:////var/lib/app.db"), "/var/lib/app.db")
 
-    def test_rejects_query(self):
+    def test_rejects_unknown_query_option(self):
         with self.assertRaises(ValueError):
-            parse_sqlite_url("sqlite:///data/app.db?mode=ro")
+            parse_sqlite_url("sqlite:///data/app.db?fast=1")
+
+    def test_rejects_invalid_query_value(self):
+        with self.assertRaises(ValueError):
+            parse_sqlite_url("sqlite:///data/app.db?journal_mode=turbo")
+
+    def test_splits_query_options(self):
+        self.assertEqual(
+            split_sqlite_url("sqlite:///data/app.db?journal_mode=wal&mmap_size=1048576"),
+            ("data/app.db", {"journal_mode": "wal", "mmap_size": "1048576"}),
+        )
+        self.assertEqual(split_sqlite_url("sqlite:///:memory:?cache=shared"), (":memory:", {"cache": "shared"}))
 
     def test_rejects_wrong_scheme(self):
         with self.assertRaises(ValueError):
@@ -46,9 +57,21 @@ class TestMySQLUrlParsing(unittest.TestCase):
         self.assertEqual(parsed["password"], "p#s")
         self.assertEqual(parsed["database"], "my-db")
 
-    def test_rejects_query(self):
-        with self.assertRaises(ValueError):
-            parse_mysql_url("mysql://u:p@localhost/db?charset=utf8mb4", async_mode=False)
+    def test_rejects_unknown_or_invalid_query_options(self):
+        for query in ("sslmode=require", "read_timeout=0", "cursor=fast", "compress=true", "charset=a;b"):
+            with self.subTest(query=query), self.assertRaises(ValueError):
+                parse_mysql_url(f"mysql://u:p@localhost/db?{query}", async_mode=False)
+
+    def test_splits_query_options(self):
+        args, options = split_mysql_url(
+            "mysql://u:p@localhost/db?charset=utf8mb4&read_timeout=5&compress=false&cursor=ss",
+            async_mode=False,
+        )
+        self.assertEqual(args["database"], "db")
+        self.assertEqual(
+            (options.charset, options.read_timeout, options.cursor), ("utf8mb4", 5, "ss")
+        )
+        self.assertIsNone(split_mysql_url("mysql://u:p@localhost/db", async_mode=True)[1])
 
     def test_rejects_invalid_scheme_for_mode(self):
         with self.assertRaises(ValueError):
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from sqlstratum import INSERT, SELECT, AsyncSQLiteRunner, SQLiteRunner, Table, col
+from sqlstratum.hooks import EVENTS, GLOBAL_HOOKS, Hooks
+from sqlstratum.runner_mysql import MySQLRunner
+from tests.fakes import FakeConnection
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        if name not in EVENTS:
+            raise AttributeError(name)
+        return lambda event: self.calls.append((name, event))
+
+    @property
+    def names(self):
+        return [name for name, _ in self.calls]
+
+
+def _listen(hooks):
+    recorder = Recorder()
+    for name in EVENTS:
+        hooks.register(name, getattr(recorder, name))
+    return recorder
+
+
+class TestHooksRegistry(unittest.TestCase):
+    def test_active_follows_registration_through_parent(self):
+        parent = Hooks()
+        child = Hooks(parent)
+        self.assertFalse(child.active)
+
+        def hook(event):
+            pass
+
+        parent.register("after_execute", hook)
+        self.assertTrue(child.active)
+        parent.unregister("after_execute", hook)
+        self.assertFalse(child.active)
+
+    def test_rejects_unknown_events(self):
+        with self.assertRaises(ValueError):
+            Hooks().register("after_commit", lambda event: None)
+        with self.assertRaises(ValueError):
+            Hooks().add(object())
+
+
+class TestSQLiteRunnerHooks(unittest.TestCase):
+    def setUp(self):
+        self.runner = SQLiteRunner.connect(":memory:")
+        self.runner.hooks = Hooks()
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    def test_read_reports_every_phase(self):
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        recorder = _listen(self.runner.hooks)
+        rows = self.runner.fetch_all(SELECT(users.c.id, users.c.email).FROM(users))
+
+        self.assertEqual(rows, [{"id": 1, "email": "a@b.com"}])
+        self.assertEqual(recorder.names, list(EVENTS))
+        event = recorder.calls[-1][1]
+        self.assertEqual((event.dialect, event.operation, event.rows), ("sqlite", "fetch_all", 1))
+        self.assertTrue(event.sql.startswith("SELECT"))
+        for duration in (event.compile_time, event.execute_time, event.fetch_time, event.hydrate_time):
+            self.assertGreaterEqual(duration, 0.0)
+
+    def test_write_reports_rowcount(self):
+        recorder = _listen(self.runner.hooks)
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        self.assertEqual(recorder.names, ["before_compile", "after_compile", "before_execute", "after_execute"])
+        self.assertEqual(recorder.calls[-1][1].rowcount, 1)
+
+    def test_global_hooks_reach_existing_runners(self):
+        runner = SQLiteRunner.connect(":memory:")
+        seen = []
+        GLOBAL_HOOKS.register("after_execute", seen.append)
+        self.addCleanup(GLOBAL_HOOKS.unregister, "after_execute", seen.append)
+        runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        runner.count(SELECT(users.c.id).FROM(users))
+        self.assertEqual([event.operation for event in seen], ["scalar"])
+
+
+class TestMySQLRunnerHooks(unittest.TestCase):
+    def test_read_reports_every_phase(self):
+        runner = MySQLRunner(FakeConnection(rows=[(1,), (2,)]))
+        runner.hooks = Hooks()
+        recorder = _listen(runner.hooks)
+        self.assertEqual(runner.fetch_all(SELECT(users.c.id).FROM(users)), [{"id": 1}, {"id": 2}])
+        self.assertEqual(recorder.names, list(EVENTS))
+        self.assertEqual(recorder.calls[-1][1].dialect, "mysql")
+        self.assertEqual(recorder.calls[-1][1].rows, 2)
+
+
+class TestAsyncSQLiteRunnerHooks(unittest.TestCase):
+    def test_fetch_one_reports_every_phase(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = Recorder()
+
+            async def run():
+                runner = await AsyncSQLiteRunner.connect(os.path.join(tmp, "app.db"))
+                runner.hooks = Hooks()
+                try:
+                    await runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+                    await runner.execute(INSERT(users).VALUES(email="a@b.com"))
+                    runner.hooks.add(recorder)
+                    return await runner.fetch_one(SELECT(users.c.email).FROM(users))
+                finally:
+                    await runner.close()
+
+            self.assertEqual(asyncio.run(run()), {"email": "a@b.com"})
+        self.assertEqual(recorder.names, list(EVENTS))
+        self.assertEqual(recorder.calls[-1][1].rows, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
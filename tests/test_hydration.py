@@ -1,10 +1,11 @@
 import json
 import sqlite3
 import unittest
+from collections import namedtuple
 from dataclasses import dataclass
 
 from sqlstratum import SELECT, Table, col
-from sqlstratum.hydrate import HydrationError
+from sqlstratum.hydrate import HydrationError, Record, get_hydrator, hydrate_rows, record_type
 from sqlstratum.runner import Runner
 
 
@@ -52,6 +53,29 @@ class TestHydration(unittest.TestCase):
         row = self.runner.fetch_one(q)
         self.assertEqual(row, "1:a@b.com")
 
+    def test_tuple(self):
+        q = SELECT(users.c.id, users.c.email).FROM(users).hydrate(tuple)
+        self.assertEqual(self.runner.fetch_all(q), [(1, "a@b.com")])
+
+    def test_namedtuple(self):
+        UserRow = namedtuple("UserRow", ["id", "email"])
+        q = SELECT(users.c.id, users.c.email).FROM(users).hydrate(UserRow)
+        self.assertEqual(self.runner.fetch_one(q), UserRow(id=1, email="a@b.com"))
+
+        Mismatch = namedtuple("Mismatch", ["email", "id"])
+        with self.assertRaises(HydrationError):
+            self.runner.fetch_all(q.hydrate(Mismatch))
+
+    def test_record(self):
+        q = SELECT(users.c.id, users.c.full_name.AS("name")).FROM(users).hydrate(Record)
+        row = self.runner.fetch_one(q)
+        self.assertIsInstance(row, Record)
+        self.assertEqual((row.id, row.name), (1, "A"))
+        self.assertEqual(row._asdict(), {"id": 1, "name": "A"})
+        self.assertFalse(hasattr(row, "__dict__"))
+        self.assertIs(type(row), record_type(q.projections))
+        self.assertEqual(type(row).__annotations__, {"id": int, "name": str})
+
     def test_duplicate_keys(self):
         orgs = Table("orgs", col("id", int), col("name", str))
         self.runner.exec_ddl("CREATE TABLE orgs (id INTEGER PRIMARY KEY, name TEXT)")
@@ -66,5 +90,37 @@ class TestHydration(unittest.TestCase):
             self.runner.fetch_all(q)
 
 
+class TestGeneratedHydrators(unittest.TestCase):
+    def test_hydrator_is_cached_per_shape_and_target(self):
+        projections = (users.c.id, users.c.email)
+        first = get_hydrator(projections, dict, by_index=True)
+        self.assertIs(get_hydrator(list(projections), dict, by_index=True), first)
+        self.assertIsNot(get_hydrator(projections, dict), first)
+
+    def test_index_and_key_access(self):
+        projections = (users.c.id, users.c.email.AS("mail"))
+        by_index = get_hydrator(projections, None, by_index=True)
+        self.assertEqual(by_index([(1, "a@b.com")]), [{"id": 1, "mail": "a@b.com"}])
+        self.assertEqual(
+            hydrate_rows([{"id": 1, "mail": "a@b.com", "extra": 0}], projections, dict),
+            [{"id": 1, "mail": "a@b.com"}],
+        )
+
+    def test_dataclass_with_non_identifier_keys(self):
+        @dataclass
+        class Row:
+            id: int
+
+        hydrator = get_hydrator((users.c.id,), Row, by_index=True)
+        self.assertEqual(hydrator([(3,)]), [Row(id=3)])
+
+        odd = get_hydrator((users.c.email.AS("e-mail"),), lambda m: m["e-mail"], by_index=True)
+        self.assertEqual(odd([("x",)]), ["x"])
+
+    def test_unsupported_target(self):
+        with self.assertRaises(HydrationError):
+            get_hydrator((users.c.id,), 42)
+
+
 if __name__ == "__main__":
     unittest.main()
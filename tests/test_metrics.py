@@ -0,0 +1,106 @@
+import threading
+import unittest
+
+from sqlstratum import INSERT, SELECT, QueryMetrics, SQLiteRunner, Table, col, compile
+from sqlstratum.fingerprint import fingerprint, normalize_sql
+from sqlstratum.hooks import Hooks
+from sqlstratum.metrics import render_prometheus
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+
+class TestFingerprint(unittest.TestCase):
+    def test_in_list_length_and_values_do_not_change_fingerprint(self):
+        short = compile(SELECT(users.c.id).FROM(users).WHERE(users.c.id.in_([1]), users.c.email == "a"))
+        long = compile(SELECT(users.c.id).FROM(users).WHERE(users.c.id.in_([1, 2, 3]), users.c.email == "b"))
+        self.assertEqual(fingerprint(short.sql), fingerprint(long.sql))
+        self.assertEqual(
+            normalize_sql(long.sql),
+            'SELECT "users"."id" FROM "users" WHERE "users"."id" IN (?...) AND "users"."email" = ?',
+        )
+
+    def test_mysql_placeholders(self):
+        sql = compile(SELECT(users.c.id).FROM(users).WHERE(users.c.id.in_([1, 2])), dialect="mysql").sql
+        self.assertEqual(normalize_sql(sql), "SELECT `users`.`id` FROM `users` WHERE `users`.`id` IN (?...)")
+
+
+class TestQueryMetrics(unittest.TestCase):
+    def setUp(self):
+        self.metrics = QueryMetrics()
+        self.runner = SQLiteRunner.connect(":memory:")
+        self.runner.hooks = Hooks()
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        self.runner.hooks.add(self.metrics)
+
+    def test_records_calls_rows_and_phases(self):
+        for email in ("a@b.com", "c@d.com"):
+            self.runner.execute(INSERT(users).VALUES(email=email))
+        for key in (1, 2, 3):
+            self.runner.fetch_all(SELECT(users.c.email).FROM(users).WHERE(users.c.id == key))
+
+        select, insert = self.metrics.snapshot()
+        self.assertEqual((select.dialect, select.calls, select.rows_returned), ("sqlite", 3, 2))
+        self.assertEqual(select.sql, 'SELECT "users"."email" FROM "users" WHERE "users"."id" = ?')
+        for phase in (select.compile, select.execute, select.fetch, select.hydrate):
+            self.assertEqual(phase.count, 3)
+            self.assertEqual(sum(phase.counts), 3)
+        self.assertEqual((insert.calls, insert.rows_affected, insert.rows_returned), (2, 2, 0))
+        self.assertEqual(insert.execute.count, 2)
+        self.assertEqual(insert.fetch.count, 0)
+
+        self.metrics.reset()
+        self.assertEqual(self.metrics.snapshot(), [])
+
+    def test_threads_record_into_merged_shards(self):
+        hooks = Hooks()
+        hooks.add(self.metrics)
+        query = SELECT(users.c.id).FROM(users)
+        compiled = compile(query)
+
+        def work():
+            for _ in range(100):
+                event = hooks.event("sqlite", "fetch_all", query)
+                event.before_compile()
+                event.after_compile(compiled)
+                event.before_execute()
+                event.after_execute()
+                event.after_fetch(2)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        (stats,) = self.metrics.snapshot()
+        self.assertEqual((stats.calls, stats.rows_returned, stats.fetch.count), (400, 800, 400))
+        # Finished threads are folded in once and still counted afterwards.
+        self.assertEqual(self.metrics.snapshot()[0].calls, 400)
+
+    def test_prometheus_text(self):
+        self.runner.fetch_all(SELECT(users.c.id).FROM(users))
+        self.runner.fetch_all(SELECT(users.c.id).FROM(users))
+        text = self.metrics.render_prometheus()
+        fp = self.metrics.snapshot()[0].fingerprint
+        labels = f'dialect="sqlite",fingerprint="{fp}"'
+
+        self.assertIn("# TYPE sqlstratum_queries_total counter", text)
+        self.assertIn(f"sqlstratum_queries_total{{{labels}}} 2", text)
+        self.assertIn(f'sqlstratum_query_info{{{labels},sql="SELECT \\"users\\".\\"id\\" FROM \\"users\\""}} 1', text)
+        self.assertIn(f'sqlstratum_query_duration_seconds_bucket{{{labels},phase="execute",le="+Inf"}} 2', text)
+        self.assertIn(f'sqlstratum_query_duration_seconds_count{{{labels},phase="hydrate"}} 2', text)
+        self.assertEqual(render_prometheus([], prefix="app").count("# TYPE app_"), 5)
+
+    def test_rejects_invalid_buckets(self):
+        for buckets in ((), (0.5, 0.1), (0.0, 1.0)):
+            with self.subTest(buckets=buckets), self.assertRaises(ValueError):
+                QueryMetrics(buckets)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import datetime
+import decimal
+import sqlite3
+import unittest
+
+from sqlstratum import SELECT, Table, col, compile
+from sqlstratum.pagination import PaginationError, decode_token, encode_token
+from sqlstratum.runner import SQLiteRunner
+
+
+posts = Table(
+    "posts",
+    col("id", int),
+    col("score", int),
+    col("title", str),
+)
+
+
+class TestKeysetCompile(unittest.TestCase):
+    def test_page_after_single_key(self):
+        q = SELECT(posts.c.id).FROM(posts).ORDER_BY(posts.c.id.ASC()).PAGE_AFTER([10])
+        compiled = compile(q)
+        self.assertEqual(
+            compiled.sql,
+            'SELECT "posts"."id" FROM "posts" WHERE "posts"."id" > :p0 ORDER BY "posts"."id" ASC',
+        )
+        self.assertEqual(compiled.params, {"p0": 10})
+
+    def test_page_after_mixed_directions(self):
+        q = (
+            SELECT(posts.c.id, posts.c.score)
+            .FROM(posts)
+            .ORDER_BY(posts.c.score.DESC(), posts.c.id.ASC())
+            .PAGE_AFTER([5, 3])
+        )
+        compiled = compile(q, dialect="mysql")
+        self.assertEqual(
+            compiled.sql,
+            "SELECT `posts`.`id`, `posts`.`score` FROM `posts` "
+            "WHERE (`posts`.`score` < %(p0)s OR (`posts`.`score` = %(p1)s AND `posts`.`id` > %(p2)s)) "
+            "ORDER BY `posts`.`score` DESC, `posts`.`id` ASC",
+        )
+        self.assertEqual(compiled.params, {"p0": 5, "p1": 5, "p2": 3})
+
+    def test_page_after_requires_order_by(self):
+        with self.assertRaises(PaginationError):
+            SELECT(posts.c.id).FROM(posts).PAGE_AFTER([1])
+
+    def test_page_after_checks_value_count(self):
+        with self.assertRaises(PaginationError):
+            SELECT(posts.c.id).FROM(posts).ORDER_BY(posts.c.id.ASC()).PAGE_AFTER([1, 2])
+
+    def test_token_round_trip(self):
+        token = encode_token([5, "x"])
+        self.assertEqual(decode_token(token), [5, "x"])
+        with self.assertRaises(PaginationError):
+            decode_token("not a token!")
+
+    def test_token_round_trips_typed_values(self):
+        values = [
+            datetime.datetime(2024, 5, 1, 12, 30, 15, 250000),
+            datetime.date(2024, 5, 1),
+            decimal.Decimal("10.50"),
+            b"\x00\xff",
+            7,
+        ]
+        decoded = decode_token(encode_token(values))
+        self.assertEqual(decoded, values)
+        self.assertIsInstance(decoded[0], datetime.datetime)
+        self.assertNotIsInstance(decoded[1], datetime.datetime)
+        with self.assertRaises(PaginationError):
+            decode_token(encode_token([{"t": "datetime", "v": "yesterday"}]))
+
+
+class TestRunnerPaginate(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl("CREATE TABLE posts (id INTEGER PRIMARY KEY, score INTEGER, title TEXT)")
+        self.conn.executemany(
+            "INSERT INTO posts (id, score, title) VALUES (?, ?, ?)",
+            [(1, 5, "a"), (2, 7, "b"), (3, 5, "c"), (4, 9, "d"), (5, 7, "e")],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_walks_all_pages_in_order(self):
+        q = (
+            SELECT(posts.c.id, posts.c.score)
+            .FROM(posts)
+            .ORDER_BY(posts.c.score.DESC(), posts.c.id.ASC())
+        )
+        seen = []
+        token = None
+        pages = 0
+        while True:
+            page = self.runner.paginate(q, 2, after=token)
+            pages += 1
+            seen.extend(row["id"] for row in page.rows)
+            if not page.has_more:
+                break
+            token = page.next_token
+        self.assertEqual(seen, [4, 2, 5, 1, 3])
+        self.assertEqual(pages, 3)
+
+    def test_applies_hydration_target(self):
+        q = (
+            SELECT(posts.c.id, posts.c.title)
+            .FROM(posts)
+            .ORDER_BY(posts.c.id.ASC())
+            .hydrate(lambda m: m["title"])
+        )
+        page = self.runner.paginate(q, 3)
+        self.assertEqual(page.rows, ["a", "b", "c"])
+        page = self.runner.paginate(q, 3, after=page.next_token)
+        self.assertEqual(page.rows, ["d", "e"])
+        self.assertIsNone(page.next_token)
+
+    def test_walks_pages_by_datetime_key(self):
+        conn = sqlite3.connect(":memory:", detect_types=sqlite3.PARSE_DECLTYPES)
+        self.addCleanup(conn.close)
+        events = Table("events", col("id", int), col("at", datetime.datetime))
+        conn.execute("CREATE TABLE events (id INTEGER PRIMARY KEY, at TIMESTAMP)")
+        start = datetime.datetime(2024, 1, 1, 9, 0)
+        conn.executemany(
+            "INSERT INTO events (id, at) VALUES (?, ?)",
+            [(i, (start + datetime.timedelta(hours=i)).isoformat(" ")) for i in range(1, 6)],
+        )
+        runner = SQLiteRunner(conn)
+        q = SELECT(events.c.id, events.c.at).FROM(events).ORDER_BY(events.c.at.ASC(), events.c.id.ASC())
+
+        page = runner.paginate(q, 2)
+        self.assertEqual(decode_token(page.next_token), [start + datetime.timedelta(hours=2), 2])
+        seen = [row["id"] for row in page.rows]
+        while page.has_more:
+            page = runner.paginate(q, 2, after=page.next_token)
+            seen.extend(row["id"] for row in page.rows)
+        self.assertEqual(seen, [1, 2, 3, 4, 5])
+
+    def test_null_key_stops_with_error(self):
+        self.conn.execute("UPDATE posts SET score = NULL WHERE id = 2")
+        q = SELECT(posts.c.id, posts.c.score).FROM(posts).ORDER_BY(posts.c.score.ASC(), posts.c.id.ASC())
+        # SQLite sorts NULL first, so the first page ends on the NULL score.
+        with self.assertRaises(PaginationError):
+            self.runner.paginate(q, 1)
+
+    def test_order_key_must_be_projected(self):
+        q = SELECT(posts.c.title).FROM(posts).ORDER_BY(posts.c.id.ASC())
+        with self.assertRaises(PaginationError):
+            self.runner.paginate(q, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from sqlstratum import INSERT, SELECT, Table, col
+from sqlstratum.pool import AsyncConnectionPool, ConnectionPool, PoolClosed, PoolTimeout
+from sqlstratum.runner_mysql import MySQLRunner
+from sqlstratum.runner_mysql_async import AsyncMySQLRunner
+from tests.fakes import FakeAsyncDriver, FakeDriver
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+
+class TestConnectionPool(unittest.TestCase):
+    def test_reuses_returned_connections(self):
+        driver = FakeDriver()
+        pool = ConnectionPool(driver.connect, min_size=1, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+
+        stats = pool.stats()
+        self.assertEqual((stats.size, stats.in_use, stats.idle, stats.created), (1, 1, 0, 1))
+        self.assertEqual(stats.checkouts, 2)
+        self.assertEqual(first.rollbacks, 1)
+
+    def test_acquire_times_out_when_exhausted(self):
+        pool = ConnectionPool(FakeDriver().connect, min_size=0, max_size=1, timeout=0.01)
+        pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        self.assertEqual(pool.stats().timeouts, 1)
+
+    def test_waiters_get_released_connections(self):
+        pool = ConnectionPool(FakeDriver().connect, min_size=1, max_size=1, timeout=5)
+        held = pool.acquire()
+        got = []
+        waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertEqual(pool.stats().waiting, 1)
+        pool.release(held)
+        waiter.join()
+
+        self.assertIs(got[0], held)
+        self.assertGreater(pool.stats().wait_time_max, 0.0)
+
+    def test_dead_connections_are_replaced_on_checkout(self):
+        driver = FakeDriver()
+        pool = ConnectionPool(driver.connect, min_size=1, max_size=1)
+        driver.connections[0].alive = False
+
+        conn = pool.acquire()
+        self.assertIs(conn, driver.connections[1])
+        self.assertTrue(driver.connections[0].closed)
+        self.assertEqual(pool.stats().discarded, 1)
+
+    def test_connections_past_max_lifetime_are_recycled(self):
+        driver = FakeDriver()
+        with mock.patch("sqlstratum.pool.time.monotonic", return_value=0.0):
+            pool = ConnectionPool(driver.connect, min_size=1, max_size=1, max_lifetime=60)
+        with mock.patch("sqlstratum.pool.time.monotonic", return_value=61.0):
+            conn = pool.acquire()
+        self.assertIs(conn, driver.connections[1])
+
+    def test_reset_after_fork_forgets_parent_connections(self):
+        driver = FakeDriver()
+        pool = ConnectionPool(driver.connect, min_size=2, max_size=2)
+        inherited = pool.acquire()
+        pool._reset_after_fork()
+
+        pool.release(inherited)
+        self.assertEqual(pool.stats().size, 0)
+        self.assertFalse(any(conn.closed for conn in driver.connections))
+        self.assertIs(pool.acquire(), driver.connections[2])
+
+    def test_closed_pool_rejects_acquire(self):
+        driver = FakeDriver()
+        pool = ConnectionPool(driver.connect, min_size=1)
+        pool.close()
+        self.assertTrue(driver.connections[0].closed)
+        with self.assertRaises(PoolClosed):
+            pool.acquire()
+
+
+class TestMySQLRunnerPool(unittest.TestCase):
+    def make_runner(self, **kwargs):
+        self.driver = FakeDriver()
+        with mock.patch("sqlstratum.runner_mysql._import_pymysql", return_value=self.driver):
+            return MySQLRunner.pool(
+                host="127.0.0.1", user="u", password="p", database="db", **kwargs
+            )
+
+    def test_calls_borrow_and_return_connections(self):
+        runner = self.make_runner(min_size=1, max_size=4)
+        self.assertEqual(runner.fetch_all(SELECT(users.c.id).FROM(users)), [{"id": 0}])
+        runner.execute(INSERT(users).VALUES(email="x@y.com"))
+
+        stats = runner.connection_pool.stats()
+        self.assertEqual((stats.in_use, stats.idle, stats.checkouts), (0, 1, 2))
+        self.assertEqual(self.driver.connections[0].commits, 1)
+
+    def test_transaction_pins_one_connection_per_thread(self):
+        runner = self.make_runner(min_size=0, max_size=4)
+        barrier = threading.Barrier(2)
+        seen = {}
+
+        def work(name):
+            with runner.transaction():
+                barrier.wait()
+                runner.execute(INSERT(users).VALUES(email=name))
+                seen[name] = runner.fetch_one(SELECT(users.c.id).FROM(users))["id"]
+                self.assertEqual(runner._tx_depth, 1)
+
+        threads = [threading.Thread(target=work, args=(name,)) for name in ("a", "b")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(seen.values()), [0, 1])
+        for conn in self.driver.connections:
+            self.assertEqual(len(conn.executed), 2)
+            self.assertEqual(conn.commits, 1)
+        self.assertEqual(runner._tx_depth, 0)
+        self.assertEqual(runner.connection_pool.stats().in_use, 0)
+
+
+class TestAsyncConnectionPool(unittest.IsolatedAsyncioTestCase):
+    async def test_acquire_context_and_await_forms(self):
+        driver = FakeAsyncDriver()
+        pool = await AsyncConnectionPool(driver.connect, min_size=1, max_size=2).open()
+        async with pool.acquire() as conn:
+            self.assertIs(conn, driver.connections[0])
+            self.assertEqual(pool.stats().in_use, 1)
+        second = await pool.acquire()
+        self.assertIs(second, conn)
+        await pool.release(second)
+
+        stats = pool.stats()
+        self.assertEqual((stats.in_use, stats.idle, stats.checkouts), (0, 1, 2))
+        self.assertEqual(conn.rollbacks, 2)
+
+    async def test_acquire_timeout(self):
+        pool = await AsyncConnectionPool(FakeAsyncDriver().connect, max_size=1, timeout=0.01).open()
+        await pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            await pool.acquire()
+        self.assertEqual(pool.stats().timeouts, 1)
+
+    async def test_stale_and_dead_connections_are_recycled(self):
+        driver = FakeAsyncDriver()
+        pool = await AsyncConnectionPool(driver.connect, min_size=1, max_idle=60).open()
+        with mock.patch("sqlstratum.pool.time.monotonic", return_value=time.monotonic() + 61):
+            async with pool.acquire() as conn:
+                self.assertIs(conn, driver.connections[1])
+        conn.alive = False
+        async with pool.acquire() as conn:
+            self.assertIs(conn, driver.connections[2])
+        self.assertEqual(pool.stats().discarded, 2)
+
+
+class TestAsyncMySQLRunnerPool(unittest.IsolatedAsyncioTestCase):
+    async def make_runner(self, **kwargs):
+        self.driver = FakeAsyncDriver()
+        with mock.patch("sqlstratum.runner_mysql_async._import_asyncmy", return_value=self.driver):
+            return await AsyncMySQLRunner.create_pool(
+                host="127.0.0.1", user="u", password="p", database="db", **kwargs
+            )
+
+    async def test_concurrent_calls_borrow_separate_connections(self):
+        runner = await self.make_runner(min_size=1, max_size=4)
+        q = SELECT(users.c.id).FROM(users)
+        results = await asyncio.gather(*(runner.fetch_all(q) for _ in range(4)))
+
+        self.assertEqual(sorted(rows[0]["id"] for rows in results), [0, 1, 2, 3])
+        self.assertEqual(self.driver.peak, 4)
+        self.assertEqual(runner.connection_pool.stats().idle, 4)
+
+    async def test_gather_is_bounded_by_concurrency(self):
+        runner = await self.make_runner(min_size=0, max_size=8)
+        q = SELECT(users.c.id).FROM(users)
+        results = await runner.gather(*[q] * 6, concurrency=2)
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(self.driver.peak, 2)
+
+    async def test_gather_failure_cancels_the_other_fetches(self):
+        runner = await self.make_runner(min_size=0, max_size=4)
+        self.driver.fail_on = "broken"
+        broken = Table("broken", col("id", int))
+        q = SELECT(users.c.id).FROM(users)
+        with self.assertRaises(RuntimeError):
+            await runner.gather(q, SELECT(broken.c.id).FROM(broken), q, q)
+
+        self.assertEqual(self.driver.active, 0)
+        self.assertEqual(runner.connection_pool.stats().in_use, 0)
+        await runner.close()
+
+    async def test_transaction_pins_connection_per_task(self):
+        runner = await self.make_runner(min_size=0, max_size=4)
+
+        async def work(email):
+            async with runner.transaction():
+                await runner.execute(INSERT(users).VALUES(email=email))
+                row = await runner.fetch_one(SELECT(users.c.id).FROM(users))
+                self.assertEqual(runner._tx_depth, 1)
+                return row["id"]
+
+        ids = await asyncio.gather(work("a"), work("b"))
+        self.assertEqual(sorted(ids), [0, 1])
+        for conn in self.driver.connections:
+            self.assertEqual((len(conn.executed), conn.commits), (2, 1))
+        self.assertEqual(runner._tx_depth, 0)
+        await runner.close()
+        self.assertTrue(all(conn.closed for conn in self.driver.connections))
+
+
+if __name__ == "__main__":
+    unittest.main()
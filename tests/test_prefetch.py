@@ -0,0 +1,97 @@
+import sqlite3
+import unittest
+from dataclasses import dataclass, field
+from typing import Any, List
+
+from sqlstratum import SELECT, Table, col
+from sqlstratum.hydrate import Record
+from sqlstratum.runner import SQLiteRunner
+
+
+authors = Table(
+    "authors",
+    col("id", int),
+    col("name", str),
+)
+
+books = Table(
+    "books",
+    col("id", int),
+    col("author_id", int),
+    col("title", str),
+)
+
+
+@dataclass
+class Author:
+    id: int
+    name: str
+    books: List[Any] = field(default_factory=list)
+
+
+class TestPrefetch(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl("CREATE TABLE authors (id INTEGER PRIMARY KEY, name TEXT)")
+        self.runner.exec_ddl("CREATE TABLE books (id INTEGER PRIMARY KEY, author_id INTEGER, title TEXT)")
+        self.conn.executemany("INSERT INTO authors VALUES (?, ?)", [(1, "Ann"), (2, "Bo"), (3, "Cy")])
+        self.conn.executemany(
+            "INSERT INTO books VALUES (?, ?, ?)",
+            [(10, 1, "A1"), (11, 2, "B1"), (12, 1, "A2")],
+        )
+        self.conn.commit()
+        self.statements = []
+        self.conn.set_trace_callback(self.statements.append)
+        self.child_query = (
+            SELECT(books.c.author_id, books.c.title).FROM(books).ORDER_BY(books.c.id.ASC())
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_attaches_grouped_children_to_dict_parents(self):
+        parents = self.runner.fetch_all(SELECT(authors.c.id, authors.c.name).FROM(authors))
+        result = self.runner.prefetch(
+            parents, self.child_query, parent_key="id", child_fk=books.c.author_id
+        )
+
+        self.assertIs(result, parents)
+        self.assertEqual(
+            [(p["name"], [b["title"] for b in p["books"]]) for p in parents],
+            [("Ann", ["A1", "A2"]), ("Bo", ["B1"]), ("Cy", [])],
+        )
+        self.assertEqual(len(self.statements), 2)
+        self.assertIn("IN (1, 2, 3)", self.statements[-1])
+
+    def test_chunks_keys_and_sets_attributes(self):
+        parents = self.runner.fetch_all(
+            SELECT(authors.c.id, authors.c.name).FROM(authors).hydrate(Author)
+        )
+        self.runner.prefetch(
+            parents,
+            self.child_query.hydrate(tuple),
+            parent_key="id",
+            child_fk=books.c.author_id,
+            attach="books",
+            chunk_size=2,
+        )
+
+        self.assertEqual(parents[0].books, [(1, "A1"), (1, "A2")])
+        self.assertEqual(parents[2].books, [])
+        self.assertEqual(len(self.statements), 3)
+
+    def test_immutable_parents_are_rejected(self):
+        parents = self.runner.fetch_all(SELECT(authors.c.id).FROM(authors).hydrate(Record))
+        with self.assertRaises(ValueError):
+            self.runner.prefetch(parents, self.child_query, parent_key="id", child_fk=books.c.author_id)
+
+    def test_child_fk_must_be_projected(self):
+        with self.assertRaises(ValueError):
+            self.runner.prefetch(
+                [], SELECT(books.c.title).FROM(books), parent_key="id", child_fk=books.c.author_id
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,21 @@
+import datetime
 import importlib
+import sqlite3
 import unittest
+from typing import Optional
 from unittest import mock
 
+from sqlstratum import SELECT, Table, col
 from sqlstratum.hydrate import pydantic as pydantic_hydrate
+from sqlstratum.runner import SQLiteRunner
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+    col("score", str),
+)
 
 
 class TestPydanticHydration(unittest.TestCase):
@@ -12,6 +25,7 @@ class TestPydanticHydration(unittest.TestCase):
             def model_validate(cls, obj):
                 return obj
 
+        pydantic_hydrate._require_pydantic.cache_clear()
         with mock.patch(
             "sqlstratum.hydrate.pydantic._import_pydantic",
             side_effect=ImportError("no pydantic"),
@@ -20,6 +34,23 @@ class TestPydanticHydration(unittest.TestCase):
                 pydantic_hydrate.hydrate_model(DummyModel, {"id": 1})
         self.assertIn("pip install sqlstratum[pydantic]", str(cm.exception))
 
+    def test_pydantic_is_imported_once(self):
+        try:
+            pydantic = importlib.import_module("pydantic")
+        except Exception:
+            self.skipTest("Pydantic not installed")
+
+        class User(pydantic.BaseModel):
+            id: int
+
+        pydantic_hydrate.hydrate_model(User, {"id": 1})
+        with mock.patch(
+            "sqlstratum.hydrate.pydantic._import_pydantic", wraps=pydantic_hydrate._import_pydantic
+        ) as imported:
+            for i in range(3):
+                pydantic_hydrate.hydrate_model(User, {"id": i})
+        imported.assert_not_called()
+
     def test_is_pydantic_available_false_when_missing(self):
         with mock.patch(
             "sqlstratum.hydrate.pydantic._import_pydantic",
@@ -75,5 +106,100 @@ class TestPydanticHydration(unittest.TestCase):
         self.assertEqual(hydrated.email, "b@c.com")
 
 
+class TestPydanticBatchHydration(unittest.TestCase):
+    def setUp(self):
+        try:
+            self.pydantic = importlib.import_module("pydantic")
+        except Exception:
+            self.skipTest("Pydantic not installed")
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, score TEXT)")
+        self.conn.executemany(
+            "INSERT INTO users (id, email, score) VALUES (?, ?, ?)",
+            [(1, "a@b.com", "10"), (2, None, "20")],
+        )
+        self.conn.commit()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def _model(self):
+        class User(self.pydantic.BaseModel):
+            id: int
+            email: Optional[str]
+            score: int
+
+        return User
+
+    def test_batch_validation_uses_cached_adapter(self):
+        User = self._model()
+        q = pydantic_hydrate.using_pydantic(
+            SELECT(users.c.id, users.c.email, users.c.score).FROM(users).ORDER_BY(users.c.id.ASC())
+        ).hydrate(User)
+        with mock.patch.object(
+            pydantic_hydrate, "hydrate_models", wraps=pydantic_hydrate.hydrate_models
+        ) as batch:
+            rows = self.runner.fetch_all(q)
+        batch.assert_called_once()
+        self.assertEqual(rows, [User(id=1, email="a@b.com", score=10), User(id=2, email=None, score=20)])
+        self.assertIs(pydantic_hydrate._list_adapter(User), pydantic_hydrate._list_adapter(User))
+
+    def test_batch_validation_errors_surface(self):
+        class Strict(self.pydantic.BaseModel):
+            id: int
+            email: int
+
+        q = pydantic_hydrate.using_pydantic(SELECT(users.c.id, users.c.email).FROM(users)).hydrate(Strict)
+        with self.assertRaises(self.pydantic.ValidationError):
+            self.runner.fetch_all(q)
+
+    def test_trusted_mode_constructs_and_validates_mismatched_columns(self):
+        User = self._model()
+        q = pydantic_hydrate.using_pydantic(
+            SELECT(users.c.id, users.c.email, users.c.score).FROM(users).ORDER_BY(users.c.id.ASC())
+        ).hydrate(User, trusted=True)
+        self.assertEqual([key for key, _ in q.hydration._checked], ["score"])
+        with mock.patch.object(User, "model_validate") as validate:
+            rows = self.runner.fetch_all(q)
+        validate.assert_not_called()
+        self.assertEqual(rows[0].score, 10)
+        self.assertEqual(rows[1].email, None)
+
+    def test_trusted_mode_validates_sqlite_bool_and_datetime(self):
+        events = Table(
+            "events",
+            col("id", int),
+            col("active", bool),
+            col("at", datetime.datetime),
+        )
+
+        class Event(self.pydantic.BaseModel):
+            id: int
+            active: bool
+            at: datetime.datetime
+
+        self.runner.exec_ddl("CREATE TABLE events (id INTEGER PRIMARY KEY, active INTEGER, at TEXT)")
+        self.conn.execute("INSERT INTO events VALUES (1, 1, '2024-05-01 10:30:00')")
+        q = pydantic_hydrate.using_pydantic(
+            SELECT(events.c.id, events.c.active, events.c.at).FROM(events)
+        ).hydrate(Event, trusted=True)
+        self.assertEqual([key for key, _ in q.hydration._checked], ["active", "at"])
+
+        (event,) = self.runner.fetch_all(q)
+        self.assertIs(event.active, True)
+        self.assertEqual(event.at, datetime.datetime(2024, 5, 1, 10, 30))
+
+    def test_equal_targets_share_hydrator(self):
+        User = self._model()
+        first = pydantic_hydrate.PydanticTarget(User)
+        self.assertEqual(first, pydantic_hydrate.PydanticTarget(User))
+        self.assertEqual(hash(first), hash(pydantic_hydrate.PydanticTarget(User)))
+        self.assertNotEqual(
+            first,
+            pydantic_hydrate.PydanticTarget(User, trusted=True, projections=(users.c.id,)),
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
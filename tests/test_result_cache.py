@@ -0,0 +1,222 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from sqlstratum import COUNT, DELETE, EXISTS, INSERT, SELECT, UPDATE, Table, col
+from sqlstratum.ast import Compiled
+from sqlstratum.expr import OrderSpec
+from sqlstratum.cache import ResultCache, tables_read
+from sqlstratum.runner import SQLiteRunner
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+    col("org_id", int),
+)
+
+orgs = Table(
+    "orgs",
+    col("id", int),
+    col("name", str),
+)
+
+orders = Table(
+    "orders",
+    col("id", int),
+    col("user_id", int),
+)
+
+
+class TestTablesRead(unittest.TestCase):
+    def test_collects_from_joins_and_subqueries(self):
+        buyers = SELECT(orders.c.user_id).FROM(orders).AS("buyers")
+        q = (
+            SELECT(users.c.id)
+            .FROM(users)
+            .JOIN(buyers, ON=buyers.c.user_id == users.c.id)
+            .WHERE(EXISTS(SELECT(orgs.c.id).FROM(orgs).WHERE(orgs.c.id == users.c.org_id)))
+        )
+        self.assertEqual(tables_read(q), frozenset({"users", "orders", "orgs"}))
+
+    def test_collects_from_order_by_and_group_by(self):
+        order_count = SELECT(COUNT(orders.c.id)).FROM(orders).WHERE(orders.c.user_id == users.c.id)
+        q = SELECT(users.c.id).FROM(users).ORDER_BY(OrderSpec(order_count.AS("n"), "DESC"))
+        self.assertEqual(tables_read(q), frozenset({"users", "orders"}))
+
+        org_name = SELECT(orgs.c.name).FROM(orgs).WHERE(orgs.c.id == users.c.org_id)
+        q = SELECT(COUNT(users.c.id)).FROM(users).GROUP_BY(org_name.AS("org"))
+        self.assertEqual(tables_read(q), frozenset({"users", "orgs"}))
+
+
+class TestResultCache(unittest.TestCase):
+    def test_lru_eviction_by_entry_count(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", [(1,)], ("users",))
+        cache.put("b", [(2,)], ("users",))
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", [(3,)], ("users",))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        stats = cache.stats()
+        self.assertEqual((stats.entries, stats.evictions), (2, 1))
+
+    def test_byte_bound(self):
+        cache = ResultCache(max_bytes=1000)
+        cache.put("big", [("x" * 2000,)], ())
+        self.assertEqual(cache.stats().entries, 0)
+        cache.put("a", [("x" * 400,)], ())
+        cache.put("b", [("x" * 400,)], ())
+        self.assertIsNone(cache.get("a"))
+        self.assertLessEqual(cache.stats().bytes, 1000)
+
+    def test_ttl_expiry(self):
+        cache = ResultCache(ttl=10)
+        with mock.patch("sqlstratum.cache.time.monotonic", return_value=100.0):
+            cache.put("a", [(1,)], ())
+        with mock.patch("sqlstratum.cache.time.monotonic", return_value=105.0):
+            self.assertIsNotNone(cache.get("a"))
+        with mock.patch("sqlstratum.cache.time.monotonic", return_value=111.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats().entries, 0)
+
+    def test_invalidate_by_table_and_stats(self):
+        cache = ResultCache()
+        cache.put("a", [(1,)], ("users", "orgs"))
+        cache.put("b", [(1,)], ("orders",))
+        cache.invalidate(["orgs"])
+
+        self.assertIsNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("b"))
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+        self.assertEqual(stats.hit_ratio, 0.5)
+
+    def test_put_skips_rows_read_before_an_invalidation(self):
+        cache = ResultCache()
+        generation = cache.generation({"users"})
+        cache.invalidate(["users"])
+        cache.put("a", [(1,)], ("users",), generation=generation)
+        self.assertEqual(cache.stats().entries, 0)
+
+        generation = cache.generation({"users"})
+        cache.invalidate(["orgs"])
+        cache.put("a", [(1,)], ("users",), generation=generation)
+        self.assertEqual(cache.stats().entries, 1)
+
+        generation = cache.generation({"users"})
+        cache.clear()
+        cache.put("b", [(1,)], ("users",), generation=generation)
+        self.assertEqual(cache.stats().entries, 0)
+
+    def test_unhashable_params_are_not_cached(self):
+        self.assertIsNone(ResultCache.key("sqlite", Compiled("SELECT :p0", {"p0": [1]})))
+
+
+class TestRunnerResultCache(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.cache = ResultCache()
+        self.runner = SQLiteRunner(self.conn, result_cache=self.cache)
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, org_id INTEGER)")
+        self.runner.exec_ddl("CREATE TABLE orgs (id INTEGER PRIMARY KEY, name TEXT)")
+        self.runner.execute(INSERT(users).VALUES(id=1, email="a@b.com", org_id=1))
+        self.runner.execute(INSERT(orgs).VALUES(id=1, name="acme"))
+        self.statements = []
+        self.conn.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_hits_skip_the_database_and_rehydrate(self):
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        self.assertEqual(self.runner.fetch_all(q), [{"id": 1, "email": "a@b.com"}])
+        self.assertEqual(self.runner.fetch_all(q.hydrate(tuple)), [(1, "a@b.com")])
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(self.cache.stats().hits, 1)
+
+    def test_writes_invalidate_tables_read(self):
+        users_q = SELECT(users.c.email).FROM(users)
+        orgs_q = SELECT(orgs.c.name).FROM(orgs)
+        self.runner.fetch_all(users_q)
+        self.runner.fetch_all(orgs_q)
+
+        self.runner.execute(UPDATE(users).SET(email="new@b.com").WHERE(users.c.id == 1))
+        self.assertEqual(self.runner.fetch_all(users_q), [{"email": "new@b.com"}])
+        self.assertEqual(self.runner.fetch_all(orgs_q), [{"name": "acme"}])
+        self.assertEqual(self.cache.stats().hits, 1)
+
+        self.runner.execute(DELETE(orgs).WHERE(orgs.c.id == 1))
+        self.assertEqual(self.runner.fetch_all(orgs_q), [])
+
+    def test_reads_inside_transaction_bypass_cache(self):
+        q = SELECT(users.c.email).FROM(users)
+        with self.assertRaises(RuntimeError):
+            with self.runner.transaction():
+                self.runner.execute(UPDATE(users).SET(email="tx@b.com").WHERE(users.c.id == 1))
+                self.assertEqual(self.runner.fetch_all(q), [{"email": "tx@b.com"}])
+                raise RuntimeError("boom")
+        self.assertEqual(self.runner.fetch_all(q), [{"email": "a@b.com"}])
+
+    def test_write_during_read_keeps_stale_rows_out(self):
+        real_generation = self.cache.generation
+
+        def generation_then_write(tables):
+            token = real_generation(tables)
+            # Another runner writes after this read began.
+            self.cache.invalidate(["users"])
+            return token
+
+        q = SELECT(users.c.email).FROM(users)
+        with mock.patch.object(self.cache, "generation", side_effect=generation_then_write):
+            self.runner.fetch_all(q)
+        self.assertEqual(self.cache.stats().entries, 0)
+        self.runner.fetch_all(q)
+        self.assertEqual(self.cache.stats().entries, 1)
+
+    def test_entries_are_keyed_by_database(self):
+        other = SQLiteRunner(sqlite3.connect(":memory:"), result_cache=self.cache)
+        other.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, org_id INTEGER)")
+        other.execute(INSERT(users).VALUES(id=1, email="other@b.com", org_id=1))
+        q = SELECT(users.c.email).FROM(users)
+
+        self.assertEqual(self.runner.fetch_all(q), [{"email": "a@b.com"}])
+        self.assertEqual(other.fetch_all(q), [{"email": "other@b.com"}])
+        other.close()
+
+    def test_runners_on_one_file_share_entries(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "app.db")
+            first = SQLiteRunner.connect(path, result_cache=self.cache)
+            second = SQLiteRunner.connect(path, result_cache=self.cache)
+            first.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, org_id INTEGER)")
+            q = SELECT(users.c.email).FROM(users)
+            first.fetch_all(q)
+            second.fetch_all(q)
+            self.assertEqual(self.cache.stats().hits, 1)
+            first.close()
+            second.close()
+
+    def test_database_id_is_looked_up_only_when_used(self):
+        conn = sqlite3.connect(":memory:")
+        self.addCleanup(conn.close)
+        traced = []
+        conn.set_trace_callback(traced.append)
+        runner = SQLiteRunner(conn)
+        runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, org_id INTEGER)")
+        runner.fetch_all(SELECT(users.c.email).FROM(users))
+        self.assertFalse(any("database_list" in sql for sql in traced))
+        self.assertTrue(runner.database_id.startswith("sqlite:private-"))
+
+    def test_ddl_clears_cache(self):
+        self.runner.fetch_all(SELECT(users.c.email).FROM(users))
+        self.runner.exec_ddl("CREATE TABLE t (x INTEGER)")
+        self.assertEqual(self.cache.stats().entries, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
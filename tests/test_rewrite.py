@@ -0,0 +1,138 @@
+import sqlite3
+import unittest
+
+from sqlstratum import COUNT, EXISTS, NOT, SELECT, Table, col, compile
+from sqlstratum.rewrite import count_query, exists_query, limit_one
+from sqlstratum.runner import SQLiteRunner
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+    col("org_id", int),
+)
+
+orgs = Table(
+    "orgs",
+    col("id", int),
+    col("name", str),
+)
+
+
+class TestRewrites(unittest.TestCase):
+    def test_limit_one_only_when_unlimited(self):
+        q = SELECT(users.c.id).FROM(users)
+        self.assertEqual(limit_one(q).limit, 1)
+        self.assertEqual(limit_one(q.LIMIT(5)).limit, 5)
+
+    def test_exists_query_strips_projection_and_order(self):
+        q = (
+            SELECT(users.c.id, users.c.email)
+            .DISTINCT()
+            .FROM(users)
+            .WHERE(users.c.org_id == 3)
+            .ORDER_BY(users.c.email.ASC())
+        )
+        compiled = compile(exists_query(q))
+        self.assertEqual(
+            compiled.sql,
+            'SELECT EXISTS (SELECT :p0 FROM "users" WHERE "users"."org_id" = :p1) AS "exists"',
+        )
+        self.assertEqual(compiled.params, {"p0": 1, "p1": 3})
+
+    def test_exists_predicate_in_where(self):
+        has_users = SELECT(users.c.id).FROM(users).WHERE(users.c.org_id == orgs.c.id)
+        q = SELECT(orgs.c.name).FROM(orgs).WHERE(NOT(EXISTS(has_users)))
+        compiled = compile(q, dialect="mysql")
+        self.assertEqual(
+            compiled.sql,
+            "SELECT `orgs`.`name` FROM `orgs` WHERE NOT (EXISTS (SELECT `users`.`id` FROM `users` "
+            "WHERE `users`.`org_id` = `orgs`.`id`))",
+        )
+
+    def test_count_query_strips_order_and_paging(self):
+        q = (
+            SELECT(users.c.id, users.c.email)
+            .FROM(users)
+            .WHERE(users.c.org_id == 3)
+            .ORDER_BY(users.c.id.ASC())
+            .LIMIT(10)
+            .OFFSET(20)
+        )
+        compiled = compile(count_query(q))
+        self.assertEqual(
+            compiled.sql,
+            'SELECT COUNT(*) AS "n" FROM "users" WHERE "users"."org_id" = :p0',
+        )
+        self.assertEqual(compiled.params, {"p0": 3})
+
+    def test_count_query_wraps_distinct(self):
+        q = SELECT(users.c.org_id).DISTINCT().FROM(users).WHERE(users.c.id > 1)
+        compiled = compile(count_query(q))
+        self.assertEqual(
+            compiled.sql,
+            'SELECT COUNT(*) AS "n" FROM (SELECT DISTINCT "users"."org_id" FROM "users" '
+            'WHERE "users"."id" > :p0) AS "counted"',
+        )
+
+    def test_count_query_wraps_group_by(self):
+        q = (
+            SELECT(users.c.org_id, COUNT(users.c.id).AS("members"))
+            .FROM(users)
+            .GROUP_BY(users.c.org_id)
+            .ORDER_BY(users.c.org_id.ASC())
+        )
+        compiled = compile(count_query(q), dialect="mysql")
+        self.assertEqual(
+            compiled.sql,
+            "SELECT COUNT(*) AS `n` FROM (SELECT %(p0)s FROM `users` GROUP BY `users`.`org_id`) "
+            "AS `counted`",
+        )
+        self.assertEqual(compiled.params, {"p0": 1})
+
+    def test_count_query_of_whole_table_uses_sqlite_count_opcode(self):
+        compiled = compile(count_query(SELECT(users.c.id).FROM(users)))
+        self.assertEqual(compiled.sql, 'SELECT COUNT(*) AS "n" FROM "users"')
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, org_id INTEGER)")
+        opcodes = [row[1] for row in conn.execute("EXPLAIN " + compiled.sql, compiled.params)]
+        conn.close()
+        self.assertIn("Count", opcodes)
+
+
+class TestRunnerFetchOneAndExists(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.runner = SQLiteRunner(self.conn)
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT, org_id INTEGER)")
+        self.conn.executemany(
+            "INSERT INTO users (id, email, org_id) VALUES (?, ?, ?)",
+            [(1, "a@b.com", 1), (2, "b@c.com", 1)],
+        )
+        self.conn.commit()
+        self.statements = []
+        self.conn.set_trace_callback(self.statements.append)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_fetch_one_adds_limit(self):
+        q = SELECT(users.c.id).FROM(users).ORDER_BY(users.c.id.DESC())
+        self.assertEqual(self.runner.fetch_one(q), {"id": 2})
+        self.assertIn("LIMIT", self.statements[-1])
+
+    def test_exists(self):
+        self.assertTrue(self.runner.exists(SELECT(users.c.id).FROM(users).WHERE(users.c.org_id == 1)))
+        self.assertFalse(self.runner.exists(SELECT(users.c.id).FROM(users).WHERE(users.c.org_id == 2)))
+        self.assertFalse(self.runner.exists(SELECT(users.c.id).FROM(users).LIMIT(1).OFFSET(5)))
+
+    def test_count(self):
+        self.assertEqual(self.runner.count(SELECT(users.c.id).FROM(users).LIMIT(1)), 2)
+        self.assertEqual(self.runner.count(SELECT(users.c.org_id).DISTINCT().FROM(users)), 1)
+        grouped = SELECT(users.c.org_id).FROM(users).GROUP_BY(users.c.org_id)
+        self.assertEqual(self.runner.count(grouped.WHERE(users.c.id > 5)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,10 @@ import logging
 import os
 import sqlite3
 import unittest
+from unittest import mock
 
 from sqlstratum import SELECT, Table, col
+from sqlstratum.hooks import DebugLogHook, Hooks, _debug_hook_from_env, render_params
 from sqlstratum.runner import Runner
 
 
@@ -18,6 +20,8 @@ class TestRunnerDebugLogging(unittest.TestCase):
     def setUp(self):
         self.conn = sqlite3.connect(":memory:")
         self.runner = Runner(self.conn)
+        # Isolate from a debug hook installed globally by SQLSTRATUM_DEBUG.
+        self.runner.hooks = Hooks()
         self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
         self.conn.execute("INSERT INTO users (id, email) VALUES (?, ?)", (1, "a@b.com"))
         self.conn.commit()
@@ -25,36 +29,39 @@ class TestRunnerDebugLogging(unittest.TestCase):
     def tearDown(self):
         self.conn.close()
 
-    def _set_env(self, value):
-        old = os.environ.get("SQLSTRATUM_DEBUG")
-        if value is None:
-            os.environ.pop("SQLSTRATUM_DEBUG", None)
-        else:
-            os.environ["SQLSTRATUM_DEBUG"] = value
-
-        def restore():
-            if old is None:
-                os.environ.pop("SQLSTRATUM_DEBUG", None)
-            else:
-                os.environ["SQLSTRATUM_DEBUG"] = old
-
-        self.addCleanup(restore)
-
-    def test_debug_logs_emitted_when_enabled(self):
-        self._set_env("1")
+    def test_debug_logs_emitted_when_hook_registered(self):
+        self.runner.hooks.add(DebugLogHook())
         q = SELECT(users.c.id, users.c.email).FROM(users).WHERE(users.c.id == 1)
         with self.assertLogs("sqlstratum", level="DEBUG") as cm:
             self.runner.fetch_one(q)
         self.assertTrue(any("SELECT" in line for line in cm.output))
         self.assertTrue(any("p0" in line for line in cm.output))
 
-    def test_debug_logs_suppressed_when_disabled(self):
-        self._set_env("0")
+    def test_debug_logs_suppressed_without_hook(self):
         q = SELECT(users.c.id).FROM(users).WHERE(users.c.id == 1)
         with self.assertRaises(AssertionError):
             with self.assertLogs("sqlstratum", level="DEBUG"):
                 self.runner.fetch_one(q)
 
+    def test_debug_hook_checks_logger_level(self):
+        logger = mock.Mock()
+        logger.isEnabledFor.return_value = False
+        self.runner.hooks.add(DebugLogHook(logger))
+        self.runner.fetch_one(SELECT(users.c.id).FROM(users))
+        logger.isEnabledFor.assert_called_with(logging.DEBUG)
+        logger.debug.assert_not_called()
+
+    def test_env_gate(self):
+        for value, enabled in (("1", True), ("TRUE", True), ("yes", True), ("0", False), ("", False)):
+            with self.subTest(value=value), mock.patch.dict(os.environ, {"SQLSTRATUM_DEBUG": value}):
+                self.assertEqual(isinstance(_debug_hook_from_env(), DebugLogHook), enabled)
+
+    def test_blob_params_are_previewed(self):
+        rendered = render_params({"p0": memoryview(b"x" * 1000), "p1": bytearray(b"ab"), "p2": "y" * 500})
+        self.assertIn("p0=b'" + "x" * 64 + "'...<936 more bytes>", rendered)
+        self.assertIn("p1=b'ab'", rendered)
+        self.assertIn("...<302 more>", rendered)
+
 
 if __name__ == "__main__":
     logging.basicConfig(level=logging.DEBUG)
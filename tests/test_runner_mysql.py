@@ -1,7 +1,11 @@
 import unittest
+from collections import namedtuple
+from array import array
 from unittest import mock
 
 from sqlstratum import INSERT, SELECT, Table, col
+from sqlstratum.cache import ResultCache
+from sqlstratum.hydrate import HydrationError
 from sqlstratum.runner_mysql import MySQLRunner
 
 
@@ -20,6 +24,7 @@ class FakeSyncCursor:
         self.rowcount = 0
         self.lastrowid = None
         self.executed = []
+        self.closed = False
 
     def execute(self, sql, params=None):
         self.executed.append((sql, params))
@@ -30,14 +35,23 @@ class FakeSyncCursor:
     def fetchone(self):
         return self.fetchone_row
 
+    def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def close(self):
+        self.closed = True
+
 
 class FakeSyncConnection:
     def __init__(self):
         self.cursor_obj = FakeSyncCursor()
         self.commit_calls = 0
         self.rollback_calls = 0
+        self.cursor_classes = []
 
-    def cursor(self):
+    def cursor(self, cursor_class=None):
+        self.cursor_classes.append(cursor_class)
         return self.cursor_obj
 
     def commit(self):
@@ -47,7 +61,14 @@ class FakeSyncConnection:
         self.rollback_calls += 1
 
 
+class FakeSSCursor:
+    pass
+
+
 class FakePyMySQLModule:
+    class cursors:
+        SSCursor = FakeSSCursor
+
     def __init__(self):
         self.calls = []
         self.connection = FakeSyncConnection()
@@ -81,6 +102,88 @@ class TestMySQLRunner(unittest.TestCase):
         self.assertEqual(rows, [{"id": 1, "email": "a@b.com"}, {"id": 2, "email": "b@c.com"}])
         self.assertEqual(conn.commit_calls, 0)
 
+    def test_fetch_all_positional_target_skips_mapping(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com")]
+        UserRow = namedtuple("UserRow", ["id", "email"])
+
+        runner = MySQLRunner(conn)
+        rows = runner.fetch_all(SELECT(users.c.id, users.c.email).FROM(users).hydrate(UserRow))
+
+        self.assertEqual(rows, [UserRow(1, "a@b.com")])
+
+    def test_fetch_all_maps_tuple_rows_through_description(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("email",), ("id",))
+        conn.cursor_obj.rows = [("a@b.com", 1)]
+
+        runner = MySQLRunner(conn)
+        rows = runner.fetch_all(SELECT(users.c.id, users.c.email).FROM(users).hydrate(tuple))
+
+        self.assertEqual(rows, [(1, "a@b.com")])
+
+    def test_fetch_all_accepts_mapping_rows(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.rows = [{"id": 1, "email": "a@b.com"}]
+
+        runner = MySQLRunner(conn)
+        rows = runner.fetch_all(SELECT(users.c.id, users.c.email).FROM(users))
+
+        self.assertEqual(rows, [{"id": 1, "email": "a@b.com"}])
+
+    def test_fetch_all_reports_missing_result_column(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("id",),)
+        conn.cursor_obj.rows = [(1,)]
+
+        runner = MySQLRunner(conn)
+        with self.assertRaises(HydrationError):
+            runner.fetch_all(SELECT(users.c.id, users.c.email).FROM(users))
+
+    def test_fetch_columns_from_tuple_rows(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com"), (2, "b@c.com")]
+
+        runner = MySQLRunner(conn)
+        columns = runner.fetch_columns(SELECT(users.c.id, users.c.email).FROM(users))
+
+        self.assertEqual(columns, {"id": array("q", [1, 2]), "email": ["a@b.com", "b@c.com"]})
+
+    def test_stream_uses_unbuffered_cursor_in_batches(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com"), (2, "b@c.com"), (3, "c@d.com")]
+
+        runner = MySQLRunner(conn)
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        with mock.patch("sqlstratum.runner_mysql._import_pymysql", return_value=FakePyMySQLModule()):
+            rows = list(runner.stream(q, batch_size=2))
+
+        self.assertEqual([r["id"] for r in rows], [1, 2, 3])
+        self.assertEqual(conn.cursor_classes, [FakeSSCursor])
+        self.assertTrue(conn.cursor_obj.closed)
+
+    def test_stream_closes_cursor_when_consumer_stops_early(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com"), (2, "b@c.com"), (3, "c@d.com")]
+
+        runner = MySQLRunner(conn)
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        with mock.patch("sqlstratum.runner_mysql._import_pymysql", return_value=FakePyMySQLModule()):
+            stream = runner.stream(q, batch_size=2)
+            self.assertEqual(next(stream), {"id": 1, "email": "a@b.com"})
+            stream.close()
+
+        self.assertTrue(conn.cursor_obj.closed)
+
+    def test_stream_rejects_invalid_batch_size(self):
+        runner = MySQLRunner(FakeSyncConnection())
+        with self.assertRaises(ValueError):
+            runner.stream(SELECT(users.c.id).FROM(users), batch_size=0)
+
     def test_connect_uses_pymysql_module(self):
         fake = FakePyMySQLModule()
         with mock.patch("sqlstratum.runner_mysql._import_pymysql", return_value=fake):
@@ -118,6 +221,22 @@ class TestMySQLRunner(unittest.TestCase):
 
         self.assertEqual(conn.rollback_calls, 1)
 
+    def test_result_cache_hydrates_hits_from_cached_columns(self):
+        conn = FakeSyncConnection()
+        conn.cursor_obj.description = (("email",), ("id",))
+        conn.cursor_obj.rows = [("a@b.com", 1)]
+        cache = ResultCache()
+        runner = MySQLRunner(conn, result_cache=cache)
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+
+        self.assertEqual(runner.fetch_all(q), [{"id": 1, "email": "a@b.com"}])
+        conn.cursor_obj.description = None
+        self.assertEqual(runner.fetch_all(q.hydrate(tuple)), [(1, "a@b.com")])
+        self.assertEqual(len(conn.cursor_obj.executed), 1)
+
+        runner.execute(INSERT(users).VALUES(email="x@y.com"))
+        self.assertEqual(cache.stats().entries, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
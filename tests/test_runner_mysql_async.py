@@ -1,4 +1,10 @@
+import asyncio
+import importlib
+import os
+import tempfile
+import time
 import unittest
+from array import array
 from unittest import mock
 
 from sqlstratum import INSERT, SELECT, Table, col
@@ -20,6 +26,7 @@ class FakeAsyncCursor:
         self.rowcount = 0
         self.lastrowid = None
         self.executed = []
+        self.closed = False
 
     async def execute(self, sql, params=None):
         self.executed.append((sql, params))
@@ -30,26 +37,38 @@ class FakeAsyncCursor:
     async def fetchone(self):
         return self.fetchone_row
 
+    async def fetchmany(self, size):
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
 
-class FakeAsyncCursorContext:
-    def __init__(self, cursor):
-        self._cursor = cursor
+    async def close(self):
+        self.closed = True
 
     async def __aenter__(self):
-        return self._cursor
+        return self
 
     async def __aexit__(self, exc_type, exc, tb):
         return False
 
 
+class ClosingAsyncCursor(FakeAsyncCursor):
+    # Like asyncmy, leaving the cursor block closes it and drops its result description.
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+        self.description = None
+        return False
+
+
 class FakeAsyncConnection:
     def __init__(self):
         self.cursor_obj = FakeAsyncCursor()
         self.commit_calls = 0
         self.rollback_calls = 0
+        self.cursor_classes = []
 
-    def cursor(self):
-        return FakeAsyncCursorContext(self.cursor_obj)
+    def cursor(self, cursor_class=None):
+        self.cursor_classes.append(cursor_class)
+        return self.cursor_obj
 
     async def commit(self):
         self.commit_calls += 1
@@ -58,7 +77,28 @@ class FakeAsyncConnection:
         self.rollback_calls += 1
 
 
+class ClosableConnection(FakeAsyncConnection):
+    def __init__(self):
+        super().__init__()
+        self.alive = True
+        self.closed = False
+
+    async def ping(self, reconnect=False):
+        if not self.alive:
+            raise ConnectionError("gone")
+
+    async def ensure_closed(self):
+        self.closed = True
+
+
+class FakeSSCursor:
+    pass
+
+
 class FakeAsyncMySQLModule:
+    class cursors:
+        SSCursor = FakeSSCursor
+
     def __init__(self):
         self.calls = []
         self.connection = FakeAsyncConnection()
@@ -92,6 +132,60 @@ class TestAsyncMySQLRunner(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(rows, [{"id": 1, "email": "a@b.com"}])
         self.assertEqual(conn.commit_calls, 0)
 
+    async def test_fetch_columns_from_tuple_rows(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com")]
+
+        runner = AsyncMySQLRunner(conn)
+        columns = await runner.fetch_columns(SELECT(users.c.id, users.c.email).FROM(users))
+
+        self.assertEqual(columns, {"id": array("q", [1]), "email": ["a@b.com"]})
+
+    async def test_fetch_one_reads_columns_before_the_cursor_closes(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj = ClosingAsyncCursor()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.fetchone_row = (1, "a@b.com")
+
+        runner = AsyncMySQLRunner(conn)
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        self.assertEqual(await runner.fetch_one(q), {"id": 1, "email": "a@b.com"})
+        self.assertTrue(conn.cursor_obj.closed)
+
+    async def test_stream_uses_unbuffered_cursor_in_batches(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com"), (2, "b@c.com"), (3, "c@d.com")]
+
+        runner = AsyncMySQLRunner(conn)
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        with mock.patch(
+            "sqlstratum.runner_mysql_async._import_asyncmy", return_value=FakeAsyncMySQLModule()
+        ):
+            rows = [row async for row in runner.stream(q, batch_size=2)]
+
+        self.assertEqual([r["id"] for r in rows], [1, 2, 3])
+        self.assertEqual(conn.cursor_classes, [FakeSSCursor])
+        self.assertTrue(conn.cursor_obj.closed)
+
+    async def test_stream_closes_cursor_on_aclose(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(1, "a@b.com"), (2, "b@c.com"), (3, "c@d.com")]
+
+        runner = AsyncMySQLRunner(conn)
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        with mock.patch(
+            "sqlstratum.runner_mysql_async._import_asyncmy", return_value=FakeAsyncMySQLModule()
+        ):
+            stream = runner.stream(q, batch_size=2)
+            first = await stream.__anext__()
+            await stream.aclose()
+
+        self.assertEqual(first, {"id": 1, "email": "a@b.com"})
+        self.assertTrue(conn.cursor_obj.closed)
+
     async def test_connect_uses_asyncmy_module(self):
         fake = FakeAsyncMySQLModule()
         with mock.patch("sqlstratum.runner_mysql_async._import_asyncmy", return_value=fake):
@@ -129,6 +223,215 @@ class TestAsyncMySQLRunner(unittest.IsolatedAsyncioTestCase):
 
         self.assertEqual(conn.rollback_calls, 1)
 
+    async def test_loader_coalesces_keys_into_one_in_query(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",), ("email",))
+        conn.cursor_obj.rows = [(3, "c@d.com"), (1, "a@b.com")]
+
+        runner = AsyncMySQLRunner(conn)
+        loader = runner.loader(users.c.id, SELECT(users.c.id, users.c.email).FROM(users))
+        rows = await asyncio.gather(loader.load(1), loader.load(2), loader.load(3), loader.load(1))
+
+        self.assertEqual(
+            rows,
+            [{"id": 1, "email": "a@b.com"}, None, {"id": 3, "email": "c@d.com"}, {"id": 1, "email": "a@b.com"}],
+        )
+        self.assertEqual(
+            conn.cursor_obj.executed,
+            [
+                (
+                    "SELECT `users`.`id`, `users`.`email` FROM `users` "
+                    "WHERE `users`.`id` IN (%(p0)s, %(p1)s, %(p2)s)",
+                    {"p0": 1, "p1": 2, "p2": 3},
+                )
+            ],
+        )
+
+        self.assertEqual(await loader.load_many([3, 1]), [rows[2], rows[0]])
+        self.assertEqual(len(conn.cursor_obj.executed), 1)
+
+    async def test_loader_propagates_errors_without_memoizing(self):
+        conn = FakeAsyncConnection()
+        runner = AsyncMySQLRunner(conn)
+        loader = runner.loader(users.c.id, SELECT(users.c.id).FROM(users))
+
+        with mock.patch.object(runner, "fetch_all", side_effect=RuntimeError("down")):
+            with self.assertRaises(RuntimeError):
+                await loader.load(1)
+        conn.cursor_obj.description = (("id",),)
+        conn.cursor_obj.rows = [(1,)]
+        self.assertEqual(await loader.load(1), {"id": 1})
+
+    async def test_loader_cancelled_caller_does_not_cancel_shared_load(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",),)
+        conn.cursor_obj.rows = [(1,)]
+        runner = AsyncMySQLRunner(conn)
+        loader = runner.loader(users.c.id, SELECT(users.c.id).FROM(users))
+
+        first = asyncio.ensure_future(loader.load(1))
+        second = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, {"id": 1})
+        self.assertTrue(first.cancelled())
+        self.assertEqual(loader._tasks, set())
+        self.assertEqual(len(conn.cursor_obj.executed), 1)
+
+    async def test_loader_forgets_keys_of_cancelled_batch(self):
+        conn = FakeAsyncConnection()
+        runner = AsyncMySQLRunner(conn)
+        loader = runner.loader(users.c.id, SELECT(users.c.id).FROM(users))
+
+        started = asyncio.Event()
+
+        async def hang(query):
+            started.set()
+            await asyncio.Event().wait()
+
+        with mock.patch.object(runner, "fetch_all", side_effect=hang):
+            waiting = asyncio.ensure_future(loader.load(1))
+            await started.wait()
+            self.assertEqual(len(loader._tasks), 1)
+            for task in list(loader._tasks):
+                task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiting
+        conn.cursor_obj.description = (("id",),)
+        conn.cursor_obj.rows = [(1,)]
+        self.assertEqual(await loader.load(1), {"id": 1})
+
+    async def test_gather_overlaps_queries_across_connections(self):
+        state = {"active": 0, "peak": 0}
+
+        class SlowCursor(FakeAsyncCursor):
+            async def execute(self, sql, params=None):
+                await super().execute(sql, params)
+                self.rows = [(params["p0"],)]
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                await asyncio.sleep(0.01)
+                state["active"] -= 1
+
+        opened = []
+
+        def slow_connection():
+            conn = FakeAsyncConnection()
+            conn.cursor_obj = SlowCursor()
+            conn.cursor_obj.description = (("id",),)
+            return conn
+
+        async def factory():
+            conn = slow_connection()
+            opened.append(conn)
+            return conn
+
+        runner = AsyncMySQLRunner(slow_connection(), connection_factory=factory)
+        queries = [SELECT(users.c.id).FROM(users).WHERE(users.c.id == n) for n in range(6)]
+        results = await runner.gather(*queries, concurrency=3)
+
+        self.assertEqual(results, [[{"id": n}] for n in range(6)])
+        self.assertEqual(state["peak"], 3)
+        self.assertEqual(len(opened), 3)
+        self.assertEqual(runner.connection.cursor_obj.executed, [])
+        self.assertEqual([conn.rollback_calls for conn in opened], [1, 1, 1])
+
+        await runner.gather(*queries[:2], concurrency=3)
+        self.assertEqual(len(opened), 3)
+
+    async def test_gather_failure_closes_spares_and_leaves_primary(self):
+        class FailingCursor(FakeAsyncCursor):
+            async def execute(self, sql, params=None):
+                await super().execute(sql, params)
+                if params["p0"] == 0:
+                    raise RuntimeError("boom")
+                await asyncio.sleep(1)
+
+        opened = []
+
+        async def factory():
+            conn = ClosableConnection()
+            conn.cursor_obj = FailingCursor()
+            opened.append(conn)
+            return conn
+
+        primary = ClosableConnection()
+        runner = AsyncMySQLRunner(primary, connection_factory=factory)
+        queries = [SELECT(users.c.id).FROM(users).WHERE(users.c.id == n) for n in range(3)]
+        with self.assertRaises(RuntimeError):
+            await runner.gather(*queries, concurrency=3)
+
+        self.assertEqual([conn.closed for conn in opened], [True, True, True])
+        self.assertEqual(runner._spare_connections, [])
+        self.assertFalse(primary.closed)
+        self.assertEqual(primary.cursor_obj.executed, [])
+
+    async def test_gather_replaces_dead_and_idle_spares(self):
+        opened = []
+
+        async def factory():
+            conn = ClosableConnection()
+            conn.cursor_obj.description = (("id",),)
+            opened.append(conn)
+            return conn
+
+        runner = AsyncMySQLRunner(FakeAsyncConnection(), connection_factory=factory)
+        q = SELECT(users.c.id).FROM(users)
+        await runner.gather(q, q)
+        self.assertEqual(len(opened), 2)
+
+        opened[0].alive = False
+        await runner.gather(q, q)
+        self.assertEqual(len(opened), 3)
+        self.assertTrue(opened[0].closed)
+
+        later = time.monotonic() + 301
+        with mock.patch("sqlstratum.runner_mysql_async.time.monotonic", return_value=later):
+            await runner.gather(q, q)
+        self.assertEqual(len(opened), 5)
+        self.assertTrue(all(conn.closed for conn in opened[:3]))
+
+    async def test_gather_without_factory_runs_sequentially(self):
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",),)
+        conn.cursor_obj.rows = [(1,)]
+        runner = AsyncMySQLRunner(conn)
+        q = SELECT(users.c.id).FROM(users)
+
+        self.assertEqual(await runner.gather(q, q), [[{"id": 1}], [{"id": 1}]])
+        self.assertEqual(len(conn.cursor_obj.executed), 2)
+
+    async def test_export_parquet_promotes_leading_null_column(self):
+        try:
+            pa = importlib.import_module("pyarrow")
+            parquet = importlib.import_module("pyarrow.parquet")
+        except Exception:
+            self.skipTest("pyarrow not installed")
+        notes = Table("notes", col("id", int), col("body", object))
+        conn = FakeAsyncConnection()
+        conn.cursor_obj.description = (("id",), ("body",))
+        conn.cursor_obj.rows = [(1, None), (2, None), (3, "late")]
+
+        runner = AsyncMySQLRunner(conn)
+        q = SELECT(notes.c.id, notes.c.body).FROM(notes)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "notes.parquet")
+            with mock.patch(
+                "sqlstratum.runner_mysql_async._import_asyncmy", return_value=FakeAsyncMySQLModule()
+            ):
+                self.assertEqual(await runner.export_parquet(q, path, batch_size=2), 3)
+            written = parquet.read_table(path)
+
+        self.assertEqual(written.schema.field("body").type, pa.string())
+        self.assertEqual(written.column("body").to_pylist(), [None, None, "late"])
+        self.assertTrue(conn.cursor_obj.closed)
+
+    def test_loader_requires_projected_key(self):
+        runner = AsyncMySQLRunner(FakeAsyncConnection())
+        with self.assertRaises(ValueError):
+            runner.loader(users.c.id, SELECT(users.c.email).FROM(users))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,161 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+
+from sqlstratum import COUNT, INSERT, SELECT, Table, col
+from sqlstratum.runner_sqlite_async import AsyncSQLiteRunner
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+_ENDLESS = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT count(*) FROM c"
+
+
+class TestAsyncSQLiteRunner(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.runner = await AsyncSQLiteRunner.connect(url="sqlite:///:memory:")
+        await self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    async def asyncTearDown(self):
+        await self.runner.close()
+
+    async def test_round_trip_runs_on_worker_thread(self):
+        result = await self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        self.assertEqual((result.rowcount, result.lastrowid), (1, 1))
+
+        q = SELECT(users.c.id, users.c.email).FROM(users)
+        self.assertEqual(await self.runner.fetch_all(q), [{"id": 1, "email": "a@b.com"}])
+        self.assertEqual(await self.runner.fetch_one(q), {"id": 1, "email": "a@b.com"})
+        self.assertEqual(await self.runner.scalar(SELECT(COUNT(users.c.id)).FROM(users)), 1)
+        self.assertEqual(await self.runner.count(q), 1)
+        self.assertTrue(await self.runner.exists(q))
+
+        thread_name = await self.runner._writer.run(lambda conn: threading.current_thread().name)
+        self.assertEqual(thread_name, "sqlstratum-sqlite")
+
+    async def test_transaction_commit_and_rollback(self):
+        async with self.runner.transaction():
+            await self.runner.execute(INSERT(users).VALUES(email="kept"))
+        with self.assertRaises(RuntimeError):
+            async with self.runner.transaction():
+                await self.runner.execute(INSERT(users).VALUES(email="dropped"))
+                self.assertEqual(self.runner._tx_depth, 1)
+                raise RuntimeError("boom")
+
+        rows = await self.runner.fetch_all(SELECT(users.c.email).FROM(users))
+        self.assertEqual(rows, [{"email": "kept"}])
+        self.assertEqual(self.runner._tx_depth, 0)
+
+    async def test_stream_yields_hydrated_rows(self):
+        for i in range(5):
+            await self.runner.execute(INSERT(users).VALUES(email=f"u{i}"))
+        q = SELECT(users.c.id).FROM(users).ORDER_BY(users.c.id.ASC())
+
+        ids = [row["id"] async for row in self.runner.stream(q, batch_size=2)]
+        self.assertEqual(ids, [1, 2, 3, 4, 5])
+
+    async def test_other_task_does_not_see_uncommitted_insert(self):
+        inserted = asyncio.Event()
+        release = asyncio.Event()
+
+        async def writer():
+            with self.assertRaises(RuntimeError):
+                async with self.runner.transaction():
+                    await self.runner.execute(INSERT(users).VALUES(email="pending"))
+                    inserted.set()
+                    await release.wait()
+                    raise RuntimeError("rollback")
+
+        task = asyncio.ensure_future(writer())
+        await inserted.wait()
+        read = asyncio.ensure_future(self.runner.fetch_all(SELECT(users.c.email).FROM(users)))
+        await asyncio.sleep(0.05)
+        try:
+            self.assertFalse(read.done())
+        finally:
+            release.set()
+            await task
+
+        self.assertEqual(await asyncio.wait_for(read, 5), [])
+
+    async def test_write_while_streaming_from_writer(self):
+        audit = Table("audit", col("user_id", int))
+        await self.runner.exec_ddl("CREATE TABLE audit (user_id INTEGER)")
+        for i in range(3):
+            await self.runner.execute(INSERT(users).VALUES(email=f"u{i}"))
+        q = SELECT(users.c.id).FROM(users).ORDER_BY(users.c.id.ASC())
+
+        async def consume():
+            async for row in self.runner.stream(q, batch_size=1):
+                await self.runner.execute(INSERT(audit).VALUES(user_id=row["id"]))
+                async with self.runner.transaction():
+                    await self.runner.execute(INSERT(audit).VALUES(user_id=row["id"]))
+
+        await asyncio.wait_for(consume(), 5)
+        self.assertEqual(await self.runner.count(SELECT(audit.c.user_id).FROM(audit)), 6)
+
+    async def test_cancel_interrupts_running_statement(self):
+        endless = self.runner._writer.run(lambda conn: conn.execute(_ENDLESS).fetchone())
+        task = asyncio.ensure_future(endless)
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(task, 5)
+
+        self.assertEqual(await self.runner.count(SELECT(users.c.id).FROM(users)), 0)
+
+    async def test_cancel_queued_call_leaves_running_statement_alone(self):
+        slow = _ENDLESS.replace("FROM c)", "FROM c WHERE x < 300000)")
+        running = asyncio.ensure_future(
+            self.runner._writer.run(lambda conn: conn.execute(slow).fetchone()[0])
+        )
+        ran = []
+        queued = asyncio.ensure_future(self.runner._writer.run(ran.append))
+        await asyncio.sleep(0.01)
+        queued.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+
+        self.assertEqual(await asyncio.wait_for(running, 5), 300000)
+        self.assertEqual(ran, [])
+
+
+class TestAsyncSQLiteReaders(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, "app.db")
+        self.runner = await AsyncSQLiteRunner.connect(path, readers=2)
+        await self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    async def asyncTearDown(self):
+        await self.runner.close()
+        self.tmpdir.cleanup()
+
+    async def test_reads_do_not_see_open_transaction(self):
+        q = SELECT(users.c.id).FROM(users)
+        async with self.runner.transaction():
+            await self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+            self.assertEqual(await self.runner.count(q), 1)
+            outside = await asyncio.ensure_future(self._count_in_fresh_context(q))
+            self.assertEqual(outside, 0)
+        results = await self.runner.gather(q, q, q)
+        self.assertEqual(results, [[{"id": 1}]] * 3)
+
+    async def _count_in_fresh_context(self, q):
+        # Tasks copy the current context; drop the transaction state to read as another task would.
+        self.runner._tx_var.set(None)
+        return await self.runner.count(q)
+
+    async def test_rejects_memory_with_readers(self):
+        with self.assertRaises(ValueError):
+            await AsyncSQLiteRunner.connect(url="sqlite:///:memory:", readers=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlstratum import INSERT, SELECT, SQLiteRunner, Table, col
+from sqlstratum.hooks import Hooks
+from sqlstratum.runner_mysql import MySQLRunner
+from sqlstratum.slowlog import SlowQueryLog
+from tests.fakes import FakeConnection
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+
+class TestSQLiteSlowQueryLog(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "app.db")
+        self.runner = SQLiteRunner.connect(self.path)
+        self.addCleanup(self.runner.close)
+        self.runner.hooks = Hooks()
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    def _log(self, **options):
+        slowlog = SlowQueryLog(**options)
+        self.addCleanup(slowlog.close)
+        self.runner.hooks.add(slowlog)
+        return slowlog
+
+    def test_records_slow_statements_with_redacted_params(self):
+        slowlog = self._log(threshold_ms=0)
+        with self.assertLogs("sqlstratum", level="WARNING") as cm:
+            self.runner.execute(INSERT(users).VALUES(email="secret@example.com"))
+            self.runner.fetch_one(SELECT(users.c.email).FROM(users).WHERE(users.c.id == 1))
+
+        write, read = slowlog.entries()
+        self.assertEqual((write.operation, read.operation), ("execute", "fetch_one"))
+        self.assertEqual(write.params, {"p0": "<str>"})
+        self.assertEqual(read.params, {"p0": "<int>", "p1": "<int>"})
+        self.assertGreaterEqual(read.duration_ms, 0.0)
+        self.assertIsNone(read.plan)
+        self.assertNotIn("secret", "".join(cm.output))
+        self.assertTrue(all("Slow query" in line for line in cm.output))
+
+    def test_ignores_statements_under_threshold(self):
+        slowlog = self._log(threshold_ms=60_000)
+        self.runner.fetch_all(SELECT(users.c.id).FROM(users))
+        self.assertEqual(slowlog.entries(), [])
+
+    def test_captures_plan_once_per_fingerprint(self):
+        connections = []
+
+        def connect():
+            connections.append(sqlite3.connect(self.path))
+            return connections[-1]
+
+        slowlog = self._log(threshold_ms=0, redact=None, explain_connect=connect)
+        with self.assertLogs("sqlstratum", level="WARNING"):
+            for key in (1, 2):
+                self.runner.fetch_all(SELECT(users.c.email).FROM(users).WHERE(users.c.id == key))
+            self.assertTrue(slowlog.flush(timeout=5))
+
+        first, second = slowlog.entries()
+        self.assertEqual(first.params, {"p0": 1})
+        self.assertEqual(first.fingerprint, second.fingerprint)
+        self.assertIn("users", first.plan)
+        self.assertIsNone(second.plan)
+        self.assertEqual(len(connections), 1)
+
+    def test_rejects_invalid_options(self):
+        with self.assertRaises(ValueError):
+            SlowQueryLog(threshold_ms=-1)
+        with self.assertRaises(ValueError):
+            SlowQueryLog(max_entries=0)
+
+
+class TestMySQLSlowQueryLog(unittest.TestCase):
+    def test_captures_json_plan_on_separate_connection(self):
+        plan = [('{"query_block": {"select_id": 1}}',)]
+        runner_conn, explain_conn = FakeConnection(), FakeConnection(results={"EXPLAIN": plan})
+        runner = MySQLRunner(runner_conn)
+        runner.hooks = Hooks()
+        slowlog = SlowQueryLog(threshold_ms=0, explain_connect=lambda: explain_conn)
+        self.addCleanup(slowlog.close)
+        runner.hooks.add(slowlog)
+
+        with self.assertLogs("sqlstratum", level="WARNING"):
+            runner.fetch_all(SELECT(users.c.id).FROM(users))
+            self.assertTrue(slowlog.flush(timeout=5))
+
+        (entry,) = slowlog.entries()
+        self.assertEqual(entry.plan, '{"query_block": {"select_id": 1}}')
+        self.assertEqual(explain_conn.executed, ["EXPLAIN FORMAT=JSON " + entry.sql])
+        self.assertFalse(any(sql.startswith("EXPLAIN") for sql in runner_conn.executed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from sqlstratum import COUNT, INSERT, SELECT, Table, col
+from sqlstratum.runner import SQLiteRunner
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+
+class TestSQLitePool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "app.db")
+        self.runner = SQLiteRunner.pool(self.path, readers=2, timeout=5)
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    def tearDown(self):
+        self.runner.close()
+        self.tmpdir.cleanup()
+
+    def count(self):
+        return self.runner.scalar(SELECT(COUNT(users.c.id)).FROM(users))
+
+    def test_opens_wal_with_read_only_readers(self):
+        mode = self.runner.connection.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+        self.assertEqual(self.runner.connection_pool.stats().idle, 2)
+        with self.runner.connection_pool.connection() as reader:
+            with self.assertRaises(sqlite3.OperationalError):
+                reader.execute("INSERT INTO users (email) VALUES ('x')")
+
+    def test_reads_use_readers_and_see_committed_writes(self):
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        rows = self.runner.fetch_all(SELECT(users.c.id, users.c.email).FROM(users))
+
+        self.assertEqual(rows, [{"id": 1, "email": "a@b.com"}])
+        self.assertEqual(self.runner.connection_pool.stats().checkouts, 1)
+
+    def test_transaction_reads_own_writes_on_writer(self):
+        seen_elsewhere = []
+        with self.runner.transaction():
+            self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+            self.assertEqual(self.count(), 1)
+            thread = threading.Thread(target=lambda: seen_elsewhere.append(self.count()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual(seen_elsewhere, [0])
+        self.assertEqual(self.count(), 1)
+        self.assertEqual(self.runner._tx_depth, 0)
+
+    def test_snapshot_pins_one_read_snapshot(self):
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        with self.runner.snapshot():
+            self.assertEqual(self.count(), 1)
+            self.runner.execute(INSERT(users).VALUES(email="c@d.com"))
+            self.assertEqual(self.count(), 1)
+        self.assertEqual(self.count(), 2)
+
+    def test_concurrent_readers(self):
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        results = []
+
+        def read():
+            for _ in range(50):
+                results.append(self.count())
+
+        threads = [threading.Thread(target=read) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [1] * 200)
+        self.assertEqual(self.runner.connection_pool.stats().size, 2)
+
+    def test_concurrent_writes_report_their_own_lastrowid(self):
+        ids = []
+
+        def write():
+            for _ in range(50):
+                ids.append(self.runner.execute(INSERT(users).VALUES(email="a@b.com")).lastrowid)
+
+        threads = [threading.Thread(target=write) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(ids), list(range(1, 201)))
+
+    def test_rejects_memory_and_bad_reader_count(self):
+        with self.assertRaises(ValueError):
+            SQLiteRunner.pool(url="sqlite:///:memory:")
+        with self.assertRaises(ValueError):
+            SQLiteRunner.pool(self.path, readers=0)
+
+    def test_snapshot_requires_pool(self):
+        runner = SQLiteRunner(sqlite3.connect(":memory:"))
+        with self.assertRaises(ValueError):
+            with runner.snapshot():
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
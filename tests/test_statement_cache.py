@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from sqlstratum import INSERT, SELECT, Table, col
+from sqlstratum.runner import SQLiteRunner
+from sqlstratum.runner_mysql import MySQLRunner
+from tests.fakes import FakeConnection
+
+
+users = Table(
+    "users",
+    col("id", int),
+    col("email", str),
+)
+
+
+class TestSQLiteStatementCache(unittest.TestCase):
+    def setUp(self):
+        self.runner = SQLiteRunner.connect(":memory:")
+        self.runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+
+    def test_cursor_is_reused_and_statement_hits_counted(self):
+        q = SELECT(users.c.id).FROM(users).WHERE(users.c.id == 1)
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        for _ in range(3):
+            self.assertEqual(self.runner.fetch_all(q), [{"id": 1}])
+        self.assertEqual(self.runner.fetch_one(q), {"id": 1})
+
+        stats = self.runner.statement_stats()
+        self.assertEqual(stats.cursors_created, 1)
+        self.assertEqual(stats.cursors_reused, 5)
+        # DDL, INSERT and the SELECT miss once; the SELECT then hits three times (fetch_one
+        # adds LIMIT 1, a new statement).
+        self.assertEqual((stats.statement_hits, stats.statement_misses), (2, 4))
+        self.assertAlmostEqual(stats.statement_hit_ratio, 2 / 6)
+
+    def test_statement_mirror_evicts_like_an_lru(self):
+        runner = SQLiteRunner(sqlite3.connect(":memory:", cached_statements=1), statement_cache_size=1)
+        runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+        first = SELECT(users.c.id).FROM(users)
+        second = SELECT(users.c.email).FROM(users)
+        for q in (first, second, first):
+            runner.fetch_all(q)
+        self.assertEqual(runner.statement_stats().statement_hits, 0)
+
+    def test_partial_fetch_releases_read_lock(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "app.db")
+            runner = SQLiteRunner(sqlite3.connect(path, cached_statements=128))
+            runner.exec_ddl("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+            for i in range(10):
+                runner.execute(INSERT(users).VALUES(email=f"u{i}@b.com"))
+            q = SELECT(users.c.id).FROM(users).ORDER_BY(users.c.id.ASC()).LIMIT(5)
+            self.assertEqual(runner.fetch_one(q), {"id": 1})
+            self.assertEqual(runner.scalar(q), 1)
+
+            other = sqlite3.connect(path, timeout=0)
+            try:
+                other.execute("INSERT INTO users (email) VALUES ('other@b.com')")
+                other.commit()
+            finally:
+                other.close()
+            self.assertEqual(runner.count(SELECT(users.c.id).FROM(users)), 11)
+            runner.close()
+
+    def test_drained_single_row_keeps_the_cursor(self):
+        self.runner.execute(INSERT(users).VALUES(email="a@b.com"))
+        self.runner.fetch_one(SELECT(users.c.id).FROM(users))
+        self.runner.scalar(SELECT(users.c.email).FROM(users))
+        self.assertEqual(self.runner.statement_stats().cursors_created, 1)
+
+
+class TestMySQLCursorReuse(unittest.TestCase):
+    def test_dedicated_connection_reuses_one_cursor(self):
+        conn = FakeConnection()
+        runner = MySQLRunner(conn)
+        q = SELECT(users.c.id).FROM(users)
+        runner.fetch_all(q)
+        runner.fetch_one(q)
+        runner.execute(INSERT(users).VALUES(email="a@b.com"))
+
+        self.assertEqual(len(conn.cursors), 1)
+        stats = runner.statement_stats()
+        self.assertEqual((stats.cursors_created, stats.cursors_reused), (1, 2))
+        runner.close()
+        self.assertTrue(conn.cursors[0].closed)
+
+
+if __name__ == "__main__":
+    unittest.main()